@@ -0,0 +1,81 @@
+"""Payload size and round-trip cost of JSON, MessagePack and CBOR responses.
+
+Serves the same list of orders through one FlaskNova route and asks for
+each format with the `Accept` header, reporting the body size and the
+per-request cost. Codecs that are not installed are skipped.
+
+    pip install "flasknova[msgpack,cbor]"
+    python benchmarks/bench_codecs.py [iterations]
+"""
+
+import sys
+import timeit
+
+from pydantic import BaseModel
+from werkzeug.test import EnvironBuilder
+
+from flask_nova import FlaskNova
+from flask_nova.media import binary_media_types
+
+
+class Line(BaseModel):
+    sku: str
+    quantity: int
+    price: float
+
+
+class Order(BaseModel):
+    id: int
+    customer: str
+    paid: bool
+    lines: list[Line]
+
+
+ORDERS = [
+    Order(
+        id=i,
+        customer=f"customer-{i}",
+        paid=i % 2 == 0,
+        lines=[Line(sku=f"sku-{j}", quantity=j, price=j * 1.25) for j in range(5)],
+    )
+    for i in range(100)
+]
+
+
+def nova_app() -> FlaskNova:
+    app = FlaskNova(__name__)
+
+    @app.get("/orders")
+    def orders() -> list[Order]:
+        return ORDERS
+
+    return app
+
+
+def _start_response(status, headers, exc_info=None) -> None:
+    pass
+
+
+def run(app, accept: str, number: int) -> tuple[int, float]:
+    environ = EnvironBuilder(path="/orders", headers={"Accept": accept}).get_environ()
+    size = 0
+
+    def call() -> None:
+        nonlocal size
+        size = sum(len(chunk) for chunk in app.wsgi_app(dict(environ), _start_response))
+
+    call()
+    return size, min(timeit.repeat(call, number=number, repeat=5)) / number
+
+
+def main(number: int = 500) -> None:
+    app = nova_app()
+    mimetypes = ["application/json", *binary_media_types()]
+    print(f"{'format':<22}{'bytes':>10}{'us/request':>14}")
+    for mimetype in mimetypes:
+        size, cost = run(app, mimetype, number)
+        print(f"{mimetype:<22}{size:>10}{cost * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
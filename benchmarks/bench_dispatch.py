@@ -0,0 +1,103 @@
+"""Dispatch overhead of FlaskNova compared with plain Flask.
+
+Runs the same three routes (path, query and JSON body) through the WSGI
+callable of both apps and reports the per-request cost and the overhead
+FlaskNova adds on top of Flask.
+
+    python benchmarks/bench_dispatch.py [iterations]
+"""
+
+import sys
+import timeit
+from io import BytesIO
+
+from flask import Flask, request
+from pydantic import BaseModel
+from werkzeug.test import EnvironBuilder
+
+from flask_nova import FlaskNova
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+def nova_app() -> FlaskNova:
+    app = FlaskNova(__name__)
+
+    @app.get("/items/<int:item_id>")
+    def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.get("/search")
+    def search(q: str):
+        return {"q": q}
+
+    @app.post("/items")
+    def create_item(item: Item):
+        return item.model_dump()
+
+    return app
+
+
+def flask_app() -> Flask:
+    app = Flask(__name__)
+
+    @app.get("/items/<int:item_id>")
+    def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.get("/search")
+    def search():
+        return {"q": request.args.get("q")}
+
+    @app.post("/items")
+    def create_item():
+        return Item(**request.get_json(force=True)).model_dump()
+
+    return app
+
+
+CASES: dict[str, dict] = {
+    "path": {"path": "/items/42", "method": "GET"},
+    "query": {"path": "/search", "method": "GET", "query_string": "q=nova"},
+    "json": {
+        "path": "/items",
+        "method": "POST",
+        "json": {"name": "nova", "price": 1.5},
+    },
+}
+
+
+def _start_response(status, headers, exc_info=None) -> None:
+    pass
+
+
+def run(app, case: dict, number: int) -> float:
+    builder = EnvironBuilder(**case)
+    environ = builder.get_environ()
+    body: bytes = builder.input_stream.read() if builder.input_stream else b""
+
+    def call() -> None:
+        env = dict(environ)
+        if body:
+            env["wsgi.input"] = BytesIO(body)
+        for _ in app.wsgi_app(env, _start_response):
+            pass
+
+    call()
+    return min(timeit.repeat(call, number=number, repeat=5)) / number
+
+
+def main(number: int = 2000) -> None:
+    nova, flask = nova_app(), flask_app()
+    print(f"{'case':<8}{'flask (us)':>12}{'nova (us)':>12}{'overhead':>12}")
+    for name, case in CASES.items():
+        f = run(flask, case, number) * 1e6
+        n = run(nova, case, number) * 1e6
+        print(f"{name:<8}{f:>12.1f}{n:>12.1f}{(n - f):>+12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,60 @@
+"""Route registration time and first OpenAPI assembly at growing route counts.
+
+Registers N routes with a path parameter, a query parameter and a body
+model, then times the first `app.openapi` access (assembly) and a second
+one (memoized).
+
+    python benchmarks/bench_registration.py [10 100 1000 10000]
+"""
+
+import sys
+import time
+
+from pydantic import BaseModel
+
+from flask_nova import FlaskNova
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+def build(count: int) -> FlaskNova:
+    app = FlaskNova(__name__)
+    for i in range(count):
+
+        def create(item_id: int, item: Item, q: str = "") -> Item:
+            return item
+
+        create.__name__ = f"create_{i}"
+        app.post(f"/items{i}/<int:item_id>", tags=[f"group-{i % 10}"])(create)
+    return app
+
+
+def main(counts: list[int]) -> None:
+    print(
+        f"{'routes':>8}{'register (ms)':>16}{'per route (us)':>16}"
+        f"{'openapi (ms)':>14}{'memoized (us)':>15}"
+    )
+    for count in counts:
+        start = time.perf_counter()
+        app = build(count)
+        registered = time.perf_counter() - start
+
+        start = time.perf_counter()
+        app.openapi
+        assembled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        app.openapi
+        memoized = time.perf_counter() - start
+
+        print(
+            f"{count:>8}{registered * 1e3:>16.1f}{registered / count * 1e6:>16.1f}"
+            f"{assembled * 1e3:>14.1f}{memoized * 1e6:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [10, 100, 1000, 10000])
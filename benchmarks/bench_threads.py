@@ -0,0 +1,63 @@
+"""Multi-thread throughput of FlaskNova's dispatch.
+
+Runs the same requests from 1, 2, 4 and 8 threads against one app and prints
+requests per second. Run it on a free-threaded build (`python3.13t`) to see
+the routes scale past one core; with the GIL the numbers stay flat.
+
+    python benchmarks/bench_threads.py [requests_per_thread]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+from werkzeug.test import EnvironBuilder
+
+from flask_nova import FlaskNova
+from flask_nova._task import gil_enabled
+
+
+class User(BaseModel):
+    id: int
+    name: str
+
+
+def nova_app() -> FlaskNova:
+    app = FlaskNova(__name__)
+
+    @app.get("/users/<int:user_id>", response_model=User)
+    def read_user(user_id: int):
+        return {"id": user_id, "name": "nova", "password": "secret"}
+
+    return app
+
+
+def _start_response(status, headers, exc_info=None) -> None:
+    pass
+
+
+def worker(app: FlaskNova, environ: dict, number: int) -> None:
+    for _ in range(number):
+        for _ in app.wsgi_app(dict(environ), _start_response):
+            pass
+
+
+def main(number: int = 2000) -> None:
+    app = nova_app()
+    environ = EnvironBuilder(path="/users/7").get_environ()
+    worker(app, environ, 10)
+
+    print(f"python {sys.version.split()[0]}, GIL {'on' if gil_enabled else 'off'}")
+    print(f"{'threads':<10}{'req/s':>12}")
+    for threads in (1, 2, 4, 8):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for _ in range(threads):
+                pool.submit(worker, app, environ, number)
+        elapsed = time.perf_counter() - start
+        print(f"{threads:<10}{threads * number / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
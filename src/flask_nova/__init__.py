@@ -1,12 +1,40 @@
-from werkzeug.datastructures import FileStorage, Headers
-from .exceptions import HTTPException
-from .logger import get_flasknova_logger
-from ._task import to_process, to_thread
-from .multi_part import File, Form
-from .router import NovaBlueprint
-from .core import FlaskNova
 from .status import status
-from .di import Depend
+
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from werkzeug.datastructures import FileStorage, Headers
+    from .exceptions import HTTPException
+    from .logger import get_flasknova_logger
+    from ._task import to_process, to_thread
+    from .multi_part import File, Form, Header, guard
+    from .router import NovaBlueprint
+    from .core import FlaskNova
+    from .cache import CachePolicy
+    from .di import Depend
+
+# public name -> (module, attribute), imported on first access (PEP 562) so
+# `import flask_nova` stays cheap and pydantic loads with the first `FlaskNova`;
+# `status` is imported above: its module has the same name and would shadow it
+_LAZY: dict[str, tuple[str, str]] = {
+    "FlaskNova": ("flask_nova.core", "FlaskNova"),
+    "to_process": ("flask_nova._task", "to_process"),
+    "to_thread": ("flask_nova._task", "to_thread"),
+    "NovaBlueprint": ("flask_nova.router", "NovaBlueprint"),
+    "File": ("flask_nova.multi_part", "File"),
+    "Form": ("flask_nova.multi_part", "Form"),
+    "Header": ("flask_nova.multi_part", "Header"),
+    "guard": ("flask_nova.multi_part", "guard"),
+    "HTTPException": ("flask_nova.exceptions", "HTTPException"),
+    "Depend": ("flask_nova.di", "Depend"),
+    "CachePolicy": ("flask_nova.cache", "CachePolicy"),
+    "get_flasknova_logger": ("flask_nova.logger", "get_flasknova_logger"),
+    "FileStorage": ("werkzeug.datastructures", "FileStorage"),
+    "Headers": ("werkzeug.datastructures", "Headers"),
+    # console script of `pyproject.toml`, shadows the `flask_nova.cli` module
+    "cli": ("flask_nova.cli", "cli"),
+}
 
 __all__: list[str] = [
     "FlaskNova",
@@ -15,10 +43,27 @@ __all__: list[str] = [
     "NovaBlueprint",
     "File",
     "Form",
+    "Header",
+    "guard",
     "HTTPException",
     "status",
     "Depend",
+    "CachePolicy",
     "get_flasknova_logger",
     "FileStorage",
     "Headers",
 ]
+
+
+def __getattr__(name: str) -> t.Any:
+    try:
+        module, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY})
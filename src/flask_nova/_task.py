@@ -6,7 +6,9 @@ import concurrent.futures as cf
 import functools as ft
 import inspect as ip
 import typing as t
+import threading
 import asyncio
+import weakref
 import sys
 
 try:
@@ -16,7 +18,12 @@ except AttributeError:
     gil_enabled = True
 
 
-_THREAD_POOL_GUARD: dict[int, t.Any] = {}
+# one semaphore per running event loop; weak keys so closed loops drop out and a
+# reused `id()` can never hand a new loop the semaphore of a dead one
+_THREAD_POOL_GUARD: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Semaphore
+] = weakref.WeakKeyDictionary()
+_THREAD_POOL_GUARD_LOCK = threading.Lock()
 
 T = t.TypeVar("T")
 
@@ -100,16 +107,16 @@ async def to_thread(
         ```
 
     Note:
-        The semaphore is keyed by event loop ID, so each event loop maintains
+        The semaphore is keyed by event loop, so each event loop maintains
         its own concurrency limit. This prevents deadlocks in multi-loop scenarios.
     """
-    key = id(asyncio.get_event_loop())
-    if key not in _THREAD_POOL_GUARD:
-        _THREAD_POOL_GUARD[key] = asyncio.Semaphore(max_concurrent_threads)
+    loop = asyncio.get_running_loop()
+    with _THREAD_POOL_GUARD_LOCK:
+        guard = _THREAD_POOL_GUARD.get(loop)
+        if guard is None:
+            guard = _THREAD_POOL_GUARD[loop] = asyncio.Semaphore(max_concurrent_threads)
     app = current_app
 
-    guard = _THREAD_POOL_GUARD[key]
-
     async def runner():
         with app.app_context():
             if not ip.iscoroutinefunction(func):
@@ -203,7 +210,7 @@ async def to_process(
         - Do not rely on module-level state; it may not be shared with workers.
         - For I/O-bound work, prefer `to_thread()` or native async I/O.
     """
-    if sys.version_info >= (3.13) and not gil_enabled:  # type: ignore
+    if sys.version_info >= (3, 13) and not gil_enabled:
 
         _pool = cf.ThreadPoolExecutor(
             max_workers=max_workers,
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import sys
+import typing as t
+from io import BytesIO
+
+from flask import request_started
+from flask.globals import request_ctx
+from werkzeug.wrappers import Response
+
+from .di import app_scope
+from .exceptions import HTTPException
+from .status import status
+
+if t.TYPE_CHECKING:
+    from .core import FlaskNova
+
+Scope = t.MutableMapping[str, t.Any]
+Message = t.MutableMapping[str, t.Any]
+Receive = t.Callable[[], t.Awaitable[Message]]
+Send = t.Callable[[Message], t.Awaitable[None]]
+
+_STREAM_END = object()
+
+
+class NovaASGI:
+    """ASGI 3 application serving a :class:`FlaskNova` app on one event loop.
+
+    Request bodies are read asynchronously, coroutine views are awaited
+    directly and sync views run in worker threads. The route table, compiled
+    binders, serializers and the RFC 7807 error handler are the same ones the
+    WSGI entry point uses.
+    ```
+    app = FlaskNova(__name__)
+    asgi = app.asgi  # uvicorn main:asgi
+    ```
+    """
+
+    def __init__(self, app: FlaskNova) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        match scope["type"]:
+            case "http":
+                await self._http(scope, receive, send)
+            case "lifespan":
+                await self._lifespan(receive, send)
+            case "websocket":
+                # reject before accepting, the server answers `403`
+                await receive()
+                await send({"type": "websocket.close", "code": 1003})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                # tear down `Depend(..., scope="app")` generators
+                await asyncio.to_thread(app_scope(self.app).close)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        app = self.app
+        if not app._setup_finished:
+            app._finish_setup()
+        body: bytes | None = await self._read_body(receive)
+        environ = self._environ(scope, body or b"")
+        ctx = app.request_context(environ)
+        error: BaseException | None = None
+        try:
+            try:
+                ctx.push()
+                response = await self._full_dispatch_request(too_large=body is None)
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            await self._send_response(response, scope, send)
+        finally:
+            if error is not None and app.should_ignore_error(error):
+                error = None
+            ctx.pop(error)  # type: ignore[arg-type]
+
+    async def _full_dispatch_request(self, too_large: bool = False) -> Response:
+        """:meth:`Flask.full_dispatch_request` with an awaited dispatch step"""
+        app = self.app
+        app._got_first_request = True
+        # profiles the event loop thread: awaited code, not `to_thread` views
+        with app.profiler.profile(request_ctx.request):
+            try:
+                request_started.send(app, _async_wrapper=app.ensure_sync)
+                rv = app.preprocess_request()
+                if rv is None and too_large:
+                    raise HTTPException(
+                        status_code=status.PAYLOAD_TOO_LARGE,
+                        detail="The request body exceeds MAX_CONTENT_LENGTH.",
+                    )
+                if rv is None:
+                    rv = await app.async_dispatch_request()
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            return app.finalize_request(rv)
+
+    async def _read_body(self, receive: Receive) -> bytes | None:
+        """the whole request body, or `None` once it crosses MAX_CONTENT_LENGTH"""
+        limit: int | None = self.app.config.get("MAX_CONTENT_LENGTH")
+        chunks: list[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk: bytes = message.get("body", b"")
+            size += len(chunk)
+            if limit is not None and size > limit:
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    def _environ(self, scope: Scope, body: bytes) -> dict[str, t.Any]:
+        """translate an ASGI HTTP scope into the WSGI environ Flask expects"""
+        root_path: str = scope.get("root_path", "")
+        path: str = scope["path"]
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+
+        environ: dict[str, t.Any] = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": root_path.encode().decode("latin1"),
+            "PATH_INFO": path.encode().decode("latin1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": client[0],
+            "REMOTE_PORT": str(client[1]),
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+            "asgi.scope": scope,
+        }
+        for raw_name, raw_value in scope.get("headers", ()):
+            name: str = raw_name.decode("latin1").upper().replace("-", "_")
+            value: str = raw_value.decode("latin1")
+            if name == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = value
+                continue
+            if name == "CONTENT_LENGTH":
+                continue
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    async def _send_response(
+        self, response: Response, scope: Scope, send: Send
+    ) -> None:
+        headers = [
+            (name.lower().encode("latin1"), value.encode("latin1"))
+            for name, value in response.headers.items()
+        ]
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": headers,
+            }
+        )
+        try:
+            if scope["method"] == "HEAD":
+                await send({"type": "http.response.body", "body": b""})
+            elif response.is_streamed:
+                await self._send_stream(response, send)
+            else:
+                body = b"".join(response.iter_encoded())
+                await send({"type": "http.response.body", "body": body})
+        finally:
+            response.close()
+
+    async def _send_stream(self, response: Response, send: Send) -> None:
+        """pull streamed chunks in a worker thread so generators never block the loop"""
+        loop = asyncio.get_running_loop()
+        chunks = iter(response.iter_encoded())
+        # one context for the whole stream: `stream_with_context` pushes and
+        # pops the request context across separate `next` calls
+        context = contextvars.copy_context()
+        while True:
+            chunk = await loop.run_in_executor(
+                None, context.run, next, chunks, _STREAM_END
+            )
+            if chunk is _STREAM_END:
+                break
+            if chunk:
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        await send({"type": "http.response.body", "body": b""})
@@ -1,102 +1,187 @@
 from __future__ import annotations
 
-from functools import wraps
-import inspect as ip
+import functools as ft
 import typing as t
+import json
 
 from .exceptions import HTTPException
+from .media import binary_codecs
 from .status import status
-from .di import Depend
 
-from werkzeug.exceptions import UnsupportedMediaType, BadRequest
 from werkzeug.datastructures import FileStorage
-from pydantic import ValidationError
+from pydantic import ConfigDict, TypeAdapter, ValidationError, with_config
 from flask import Request
 
 
+Extractor = t.Callable[[Request], t.Any]
+Constructor = t.Callable[[dict[str, t.Any]], t.Any]
+
+
+@ft.cache
+def compile_constructor(cls: type) -> tuple[TypeAdapter, Constructor]:
+    """
+    compile a :attr:`to_dict` class into a `TypeAdapter` coercing its annotated
+    fields and a constructor filling a new instance without calling `__init__`.
+    fields with a class-level default are optional
+    """
+    try:
+        hints: dict[str, t.Any] = t.get_type_hints(cls)
+    except NameError:
+        hints = dict(getattr(cls, "__annotations__", {}))
+    fields: dict[str, t.Any] = {}
+    for name, annotation in hints.items():
+        if t.get_origin(annotation) is t.ClassVar:
+            continue
+        fields[name] = t.NotRequired[annotation] if hasattr(cls, name) else annotation
+
+    schema = with_config(ConfigDict(arbitrary_types_allowed=True))(
+        t.TypedDict(cls.__name__, fields)  # type: ignore[operator]
+    )
+    new = cls.__new__
+
+    if cls.__dictoffset__:
+
+        def construct(values: dict[str, t.Any]) -> t.Any:
+            instance = new(cls)
+            instance.__dict__.update(values)
+            return instance
+
+    else:
+        # classes declaring `__slots__` have no `__dict__` to fill
+        set_attr = object.__setattr__
+
+        def construct(values: dict[str, t.Any]) -> t.Any:
+            instance = new(cls)
+            for name, value in values.items():
+                set_attr(instance, name, value)
+            return instance
+
+    return TypeAdapter(schema), construct
+
+
 class Binder:
-    def __init__(
-        self, field_name: str, field_obj: dict[str, t.Any], request: Request
-    ) -> None:
+    """Compile the binding metadata of one view parameter into an extractor.
+
+    The `match kind` ladder runs once, when the route is registered, and
+    returns a callable that only pulls the value out of the request.
+    """
+
+    def __init__(self, field_name: str, field_obj: dict[str, t.Any]) -> None:
         self.field_name = field_name
         self.field_obj = field_obj
-        self.request = request
 
-    def make_request(
-        self,
-    ):
+    def compile(self) -> Extractor:
+        if not self.field_obj:
+            return lambda req: None
+
         kind: str = self.field_obj["type"]
-        obj: type = self.field_obj["object"]
-        default: type | None = self.field_obj.get("default")
-
-        try:
-            match kind:
-                case "dataclass":
-                    return obj(**self._json_request())
-                case "customclass":
-                    return self.__make_attr(self._json_request())
-                case "basemodel":
-                    return obj(self._json_request())
-                case "query":
-                    return self._query_request()
-                case "path":
-                    return self._path_request()
-                case "dataclassform":
-                    return obj(**self._form_request())
-                case "basemodelform":
-                    return obj.model_validate(self._form_request())
-                case "customclassform":
-                    return self.__make_attr(self._form_request())
-                case "file":
-                    return self._file_request()
-                case "form":
-                    return self._form_request()
-                case "dependency":
-                    return self.resolve_dependencies(default)
-                case _:
-                    return None
-        except TypeError as e:
-            raise HTTPException(
+        obj: type = self.field_obj.get("object")  # type: ignore[assignment]
+
+        match kind:
+            case "dataclass" | "basemodel" | "generic":
+                return self._body_request(self.field_obj["validator"])
+            case "customclass":
+                adapter, construct = compile_constructor(obj)
+                validate = self._body_request(adapter)
+                return lambda req: construct(validate(req))
+            case "dataclassform":
+                validate_python = self.field_obj["validator"].validate_python
+                return lambda req: validate_python(self._form_request(req))
+            case "basemodelform":
+                return lambda req: obj.model_validate(self._form_request(req))  # type: ignore[attr-defined]
+            case "customclassform":
+                adapter, construct = compile_constructor(obj)
+                validate_python = adapter.validate_python
+                return lambda req: construct(validate_python(self._form_request(req)))
+            case "file":
+                return self._file_request
+            case "form":
+                return self._form_request
+            case _:
+                return lambda req: None
+
+    @staticmethod
+    def translate_error(
+        e: TypeError | ValidationError, sources: t.Mapping[str, str] | None = None
+    ) -> HTTPException:
+        """
+        map a binding failure to a `422` problem detail summing up every error
+        in `detail` and listing them in `errors`, whose `loc` starts with
+        `path`, `query` or `header` for route parameters
+        """
+        if not isinstance(e, ValidationError):
+            return HTTPException(
                 status_code=status.UNPROCESSABLE_ENTITY,
                 detail=f"Binding failed: {e}",
                 title="Form Validation Error",
             )
-        except ValidationError as e:
-            raise HTTPException(
-                status_code=status.UNPROCESSABLE_ENTITY,
-                detail=f"Binding failed: {e.errors(include_url=False)}",
-                title="Form Validation Error",
-            )
-
-    def _query_request(self) -> str | None:
-        return self.request.args.get(self.field_name)
-
-    def _path_request(self):
-        return self.request.view_args.get(self.field_name)
-
-    def _json_request(self) -> dict[t.Any, t.Any]:
-        # ! `force=True` handle content type validation
-        json_data: dict[t.Any, t.Any] = {}
-        try:
-            json_data = self.request.get_json(force=True)
-        except UnsupportedMediaType:
-            raise HTTPException(
-                status_code=status.UNSUPPORTED_MEDIA_TYPE,
-                title="UNSUPPORTED_MEDIA_TYPE",
-                detail="Expected JSON for this model, but received unsupported content type.",
-            )
-        except BadRequest as e:
-            raise HTTPException(
-                status_code=status.BAD_REQUEST,
-                title="Cannot handle Request",
-                detail=str(e),
-            )
+        # through `e.json()` so `ctx` and `input` are JSON safe
+        errors: list[dict[str, t.Any]] = json.loads(e.json(include_url=False))
+        for error in errors if sources else ():
+            if error["loc"] and error["loc"][0] in sources:  # type: ignore[operator]
+                error["loc"] = [sources[error["loc"][0]], *error["loc"]]  # type: ignore[index]
+        summary: str = "; ".join(
+            ".".join(map(str, error["loc"])) + ": " + error["msg"]
+            if error["loc"]
+            else error["msg"]
+            for error in errors
+        )
+        return HTTPException(
+            status_code=status.UNPROCESSABLE_ENTITY,
+            detail=f"Binding failed: {summary}",
+            title="Form Validation Error",
+            errors=errors,  # type: ignore[arg-type]
+        )
+
+    def _raw_request(self, request: Request) -> bytes:
+        """request body bytes, validated by pydantic-core in one pass"""
+        return request.get_data(cache=True)
+
+    def _body_request(self, adapter: TypeAdapter) -> Extractor:
+        """
+        JSON bodies go straight to `validate_json`; a body sent as one of the
+        installed binary codecs (msgpack, cbor) is decoded, then validated
+        """
+        validate_json = adapter.validate_json
+
+        def extract_json(request: Request) -> t.Any:
+            try:
+                return validate_json(self._raw_request(request))
+            except ValidationError as e:
+                # a body that is not JSON at all is a bad request, not `422`
+                error = e.errors(include_url=False)[0]
+                if error["type"] != "json_invalid":
+                    raise
+                raise HTTPException(
+                    status_code=status.BAD_REQUEST,
+                    detail=f"Invalid JSON body: {error['msg']}",
+                    title="Cannot handle Request",
+                ) from None
+
+        codecs = binary_codecs()
+        if not codecs:
+            return extract_json
+        validate_python = adapter.validate_python
+
+        def extract(request: Request) -> t.Any:
+            codec = codecs.get(request.mimetype)
+            if codec is None:
+                return extract_json(request)
+            try:
+                data = codec.decode(self._raw_request(request))
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.UNPROCESSABLE_ENTITY,
+                    detail=f"Invalid {codec.name} body: {e}",
+                    title="Form Validation Error",
+                )
+            return validate_python(data)
 
-        return json_data
+        return extract
 
-    def _form_request(self) -> dict[str, str]:
-        if not self.request.content_type or not any(
-            self.request.content_type.startswith(t)
+    def _form_request(self, request: Request) -> dict[str, str]:
+        if not request.content_type or not any(
+            request.content_type.startswith(t)
             for t in [
                 "multipart/form-data",
                 "application/x-www-form-urlencoded",
@@ -106,7 +191,7 @@ class Binder:
                 status_code=status.UNSUPPORTED_MEDIA_TYPE,
                 detail="The endpoint expects form data, but the request has an incorrect content type.",
             )
-        form_data = self.request.form.to_dict(flat=True)
+        form_data = request.form.to_dict(flat=True)
         if not form_data:
             raise HTTPException(
                 status_code=status.UNPROCESSABLE_ENTITY,
@@ -117,34 +202,10 @@ class Binder:
 
     def _file_request(
         self,
+        request: Request,
     ) -> list[FileStorage] | FileStorage | None:
         if self.field_obj["default"].multiple:
-            file_obj = self.request.files.getlist(self.field_obj["default"].name)
+            file_obj = request.files.getlist(self.field_obj["default"].name)
         else:
-            file_obj = self.request.files.get(self.field_obj["default"].name)  # type: ignore[assignment]
+            file_obj = request.files.get(self.field_obj["default"].name)  # type: ignore[assignment]
         return file_obj
-
-    def __make_attr(self, obj_dict: dict) -> type:
-        def app_int(*args, **kwags): ...
-
-        _items = {}
-        self.field_obj["object"].__init__ = app_int  # type: ignore[misc]
-        fields = tuple(self.field_obj["object"].__annotations__.keys())
-        for f in fields:
-            _items[f] = obj_dict[f]
-            setattr(self.field_obj["object"], f, obj_dict[f])
-        self.field_obj["object"].__result_values__ = _items
-        return self.field_obj["object"]
-
-    def resolve_dependencies(self, dependency: Depend):
-        dep_func = dependency.dependency
-
-        @wraps(dep_func)
-        def resolver():
-            if ip.iscoroutinefunction(dep_func):
-                raise AttributeError(
-                    f"Depend: cannot execute awaitable function `{dep_func.__name__}`"
-                )
-            return dep_func()
-
-        return resolver()
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import typing as t
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable
+from io import BytesIO
+from string import Formatter
+
+from flask import Flask, Request, Response
+
+if t.TYPE_CHECKING:
+    from .plan import RoutePlan
+
+#: responses kept by the default in-process backend, across all shards
+DEFAULT_MAX_ENTRIES: int = 1024
+DEFAULT_SHARDS: int = 16
+
+# responses that must not be shared between clients
+_PRIVATE_DIRECTIVES: tuple[str, ...] = ("no-store", "private")
+
+
+class CachePolicy:
+    """How the responses of a `GET` route are cached.
+
+    The key is built from the route, its validated path, query and header
+    parameters and the request headers named in `vary`. `tags` may use the
+    parameters of the route (`"item:{item_id}"`) and are used to drop entries
+    with :meth:`ResponseCache.invalidate`. Within `stale_while_revalidate`
+    seconds after `ttl`, the stale response is served while one background
+    request refreshes it.
+    ```
+    @app.get("/items/<int:item_id>", cache=CachePolicy(ttl=60, tags=["item:{item_id}"]))
+    def read_item(item_id: int) -> Item: ...
+
+    app.cache.invalidate(tag="item:42")
+    ```
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        vary: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        stale_while_revalidate: float = 0,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError("CachePolicy ttl must be greater than 0")
+        if stale_while_revalidate < 0:
+            raise ValueError("CachePolicy stale_while_revalidate must not be negative")
+        self.ttl = ttl
+        self.vary: tuple[str, ...] = tuple(vary)
+        self.tags: tuple[str, ...] = tuple(tags)
+        self.stale_while_revalidate = stale_while_revalidate
+
+    def check(self, rule: str, params: Iterable[str]) -> None:
+        """raise `ValueError` at registration when a tag names an unknown parameter"""
+        known = set(params)
+        for tag in self.tags:
+            for _, field, _, _ in Formatter().parse(tag):
+                if field is not None and field not in known:
+                    raise ValueError(
+                        f"cache tag {tag!r} of {rule!r} uses unknown parameter "
+                        f"{field!r}"
+                    )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(ttl={self.ttl!r}, tags={list(self.tags)!r})"
+
+
+class CacheEntry:
+    """One encoded response, picklable so shared backends can store it."""
+
+    __slots__ = ("body", "status", "headers", "tags", "created", "expires", "stale")
+
+    def __init__(
+        self,
+        body: bytes,
+        status: int,
+        headers: list[tuple[str, str]],
+        tags: tuple[str, ...],
+        ttl: float,
+        stale_while_revalidate: float,
+    ) -> None:
+        self.body = body
+        self.status = status
+        self.headers = headers
+        self.tags = tags
+        self.created: float = time.time()
+        self.expires: float = self.created + ttl
+        #: served (and refreshed in the background) until this time
+        self.stale: float = self.expires + stale_while_revalidate
+
+    def __getstate__(self) -> tuple[t.Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple[t.Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class CacheBackend(ABC):
+    """Storage behind :class:`ResponseCache`.
+
+    Subclass it to share the cache between processes (Redis, memcached...);
+    entries past `CacheEntry.stale` may be dropped at any time.
+    ```
+    app.config["CACHE_BACKEND"] = RedisCache(client)
+    ```
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """drop every entry carrying one of `tags`, return how many were dropped"""
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class _Shard:
+    __slots__ = ("entries", "tags", "lock", "max_entries")
+
+    def __init__(self, max_entries: int) -> None:
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.tags: dict[str, set[str]] = {}
+        self.lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def drop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU split into shards, each behind its own lock.
+
+    Requests for different keys rarely wait for each other; each shard
+    evicts its least recently used entry once it holds
+    `max_entries / shards` responses.
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, shards: int = DEFAULT_SHARDS
+    ) -> None:
+        shards = max(1, min(shards, max_entries))
+        per_shard: int = -(-max_entries // shards)
+        self._shards: tuple[_Shard, ...] = tuple(
+            _Shard(per_shard) for _ in range(shards)
+        )
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get(self, key: str) -> CacheEntry | None:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return None
+            if entry.stale <= time.time():
+                shard.drop(key)
+                return None
+            shard.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        shard = self._shard(key)
+        with shard.lock:
+            shard.drop(key)
+            shard.entries[key] = entry
+            for tag in entry.tags:
+                shard.tags.setdefault(tag, set()).add(key)
+            while len(shard.entries) > shard.max_entries:
+                shard.drop(next(iter(shard.entries)))
+
+    def delete(self, key: str) -> None:
+        shard = self._shard(key)
+        with shard.lock:
+            shard.drop(key)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags = tuple(tags)
+        dropped = 0
+        for shard in self._shards:
+            with shard.lock:
+                keys = {key for tag in tags for key in shard.tags.get(tag, ())}
+                for key in keys:
+                    shard.drop(key)
+                dropped += len(keys)
+        return dropped
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.tags.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+
+class ResponseCache:
+    """Response cache of a :class:`FlaskNova` app, available as `app.cache`.
+
+    A hit is answered from the stored bytes before the body, dependencies
+    and handler are bound or called; only the route parameters are validated
+    to build the key.
+    ```
+    app.config["CACHE_BACKEND"] = MemoryCache(max_entries=10_000)  # the default
+    app.cache.invalidate(tag="items")
+    app.cache.clear()
+    ```
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._backend: CacheBackend | None = None
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> CacheBackend:
+        """`CACHE_BACKEND`, or a :class:`MemoryCache` sized by `CACHE_MAX_ENTRIES`"""
+        if self._backend is None:
+            config = self.app.config
+            self._backend = config.get("CACHE_BACKEND") or MemoryCache(
+                config.get("CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                config.get("CACHE_SHARDS", DEFAULT_SHARDS),
+            )
+        return self._backend
+
+    def invalidate(self, tag: str | None = None, *, tags: Iterable[str] = ()) -> int:
+        """drop the responses stored with `tag` (or any of `tags`)"""
+        tags = (tag, *tags) if tag is not None else tuple(tags)
+        return self.backend.invalidate(tags)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    @staticmethod
+    def key(
+        request: Request,
+        plan: RoutePlan,
+        params: t.Mapping[str, t.Any],
+        variant: str | None = None,
+    ) -> str:
+        """route, validated parameters, `vary` headers and the negotiated body format"""
+        policy = t.cast(CachePolicy, plan.cache)
+        parts = (
+            sorted(params.items()),
+            [request.headers.get(name) for name in policy.vary],
+            variant,
+        )
+        digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+        return f"{plan.rule}:{digest}"
+
+    def lookup(
+        self,
+        request: Request,
+        plan: RoutePlan,
+        params: t.Mapping[str, t.Any],
+        variant: str | None = None,
+    ) -> Response | None:
+        """the stored response for `request`, or `None` after marking it to be stored"""
+        policy = t.cast(CachePolicy, plan.cache)
+        key = self.key(request, plan, params, variant)
+        refresh: bool = request.environ.get("nova.cache.refresh", False)
+        entry = None if refresh else self.backend.get(key)
+        now = time.time()
+        if entry is None or entry.stale <= now:
+            request.cache_key = key  # type: ignore[attr-defined]
+            request.cache_tags = tuple(  # type: ignore[attr-defined]
+                tag.format_map(params) for tag in policy.tags
+            )
+            return None
+
+        if entry.expires <= now:
+            self._revalidate(request, key)
+        response = self.app.response_class(
+            entry.body, status=entry.status, headers=entry.headers
+        )
+        response.headers["Age"] = str(int(now - entry.created))
+        return response
+
+    def store(self, request: Request, response: Response) -> None:
+        """keep a `200` response of a missed lookup, unless it is private"""
+        plan: RoutePlan | None = request.route_plan  # type: ignore[attr-defined]
+        if plan is None or plan.cache is None or response.status_code != 200:
+            return
+        if response.is_streamed or response.direct_passthrough:
+            return
+        if "Set-Cookie" in response.headers:
+            return
+        cache_control: str = response.headers.get("Cache-Control", "")
+        if any(directive in cache_control for directive in _PRIVATE_DIRECTIVES):
+            return
+        entry = CacheEntry(
+            response.get_data(),
+            response.status_code,
+            list(response.headers.items()),
+            request.cache_tags,  # type: ignore[attr-defined]
+            plan.cache.ttl,
+            plan.cache.stale_while_revalidate,
+        )
+        self.backend.set(request.cache_key, entry)  # type: ignore[attr-defined]
+
+    def _revalidate(self, request: Request, key: str) -> None:
+        """re-run the request once in a background thread to refresh `key`"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        environ = {
+            **request.environ,
+            "nova.cache.refresh": True,
+            "wsgi.input": BytesIO(),
+        }
+        environ.pop("werkzeug.request", None)
+
+        def refresh() -> None:
+            try:
+                with self.app.request_context(environ):
+                    self.app.full_dispatch_request().close()
+            except Exception:
+                self.app.logger.exception("cache revalidation of %s failed", key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="nova-cache", daemon=True).start()
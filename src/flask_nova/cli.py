@@ -190,13 +190,8 @@ def _generate_py_file(app: Flask, output: Path, base_url: str, app_name: str)->
     click.echo(f"Generated Python requests in {py_file}")
 
 
-@cli.command()
-@click.option("--app", required=True, help="Your Flask app import path, e.g. 'examples.form_ex:app'.")
-@click.option("--base-url", default="http://127.0.0.1:5000", help="Base URL for requests.")
-@click.option("--output", default=".", type=click.Path(path_type=Path), help="Output directory.")
-@click.option("--format", type=click.Choice(["http", "py", "all"]), default="all")
-def gen(app, base_url, output, format)-> None:
-    """Generate .http and/or .py files for testing routes."""
+def _load_app(app: str) -> Flask:
+    """import `module:app`, calling it when it is an app factory"""
     module_name, app_name = app.split(":")
     mod = importlib.import_module(module_name)
     app_obj = getattr(mod, app_name)
@@ -206,6 +201,18 @@ def gen(app, base_url, output, format)-> None:
 
     if not isinstance(app_obj, Flask):
         raise click.ClickException("The provided app is not a Flask instance.")
+    return app_obj
+
+
+@cli.command()
+@click.option("--app", required=True, help="Your Flask app import path, e.g. 'examples.form_ex:app'.")
+@click.option("--base-url", default="http://127.0.0.1:5000", help="Base URL for requests.")
+@click.option("--output", default=".", type=click.Path(path_type=Path), help="Output directory.")
+@click.option("--format", type=click.Choice(["http", "py", "all"]), default="all")
+def gen(app, base_url, output, format)-> None:
+    """Generate .http and/or .py files for testing routes."""
+    app_name = app.split(":")[1]
+    app_obj = _load_app(app)
 
     output_path = Path(output)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -217,5 +224,54 @@ def gen(app, base_url, output, format)-> None:
         _generate_py_file(app_obj, output_path, base_url, app_name)
 
 
+@cli.command()
+@click.option(
+    "--app", required=True, help="Your Flask app import path, e.g. 'main:app'."
+)
+@click.option(
+    "--output",
+    default=None,
+    type=click.Path(path_type=Path),
+    help="Snapshot file, defaults to the app's `snapshot` path.",
+)
+def build(app, output)-> None:
+    """Write the route schemas and OpenAPI document of the app to a snapshot."""
+    from .core import FlaskNova
+    from .snapshot import DEFAULT_SNAPSHOT, Snapshot
+
+    app_obj = _load_app(app)
+    if not isinstance(app_obj, FlaskNova):
+        raise click.ClickException("The provided app is not a FlaskNova instance.")
+
+    path = output or app_obj.snapshot_path or Path(app_obj.root_path) / DEFAULT_SNAPSHOT
+    snapshot = Snapshot.build(app_obj)
+    snapshot.dump(path)
+    stored = sum(data is not None for data in snapshot.schemas.values())
+    click.echo(
+        f"Wrote {stored}/{len(snapshot.schemas)} routes and "
+        f"{len(snapshot.files)} source hashes to {path}"
+    )
+
+
+@cli.command("profile-token")
+@click.option(
+    "--app", required=True, help="Your Flask app import path, e.g. 'main:app'."
+)
+@click.option(
+    "--path", required=True, help="Request path the token is for, e.g. '/items/3'."
+)
+@click.option(
+    "--ttl", default=300.0, show_default=True, help="Seconds the token is accepted for."
+)
+def profile_token(app, path, ttl)-> None:
+    """Print an X-Nova-Profile header value signed with the app's PROFILE_SECRET."""
+    from .profiling import profile_token as sign
+
+    secret = _load_app(app).config.get("PROFILE_SECRET")
+    if not secret:
+        raise click.ClickException("PROFILE_SECRET is not set on the app.")
+    click.echo(sign(secret, path, ttl))
+
+
 if __name__ == "__main__":
     cli()
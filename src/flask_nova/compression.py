@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import functools as ft
+import typing as t
+import zlib
+from collections.abc import Iterable, Iterator
+
+from flask import Request, Response
+
+if t.TYPE_CHECKING:
+    from .plan import RoutePlan
+
+#: encodings tried in this order when the client accepts several with the same `q`
+DEFAULT_ENCODINGS: tuple[str, ...] = ("zstd", "br", "gzip", "deflate")
+#: bodies smaller than this many bytes are sent as they are
+DEFAULT_MIN_SIZE: int = 500
+
+# formats that are compressed already, a second pass only costs CPU
+_COMPRESSED_PREFIXES: tuple[str, ...] = ("image/", "video/", "audio/", "font/woff")
+_COMPRESSED_TYPES: frozenset[str] = frozenset(
+    {
+        "application/gzip",
+        "application/zip",
+        "application/zstd",
+        "application/x-7z-compressed",
+        "application/x-bzip2",
+        "application/x-rar-compressed",
+        "application/x-xz",
+        "application/pdf",
+        "application/octet-stream",
+    }
+)
+# text-based images still shrink
+_COMPRESSIBLE_IMAGES: frozenset[str] = frozenset({"image/svg+xml", "image/bmp"})
+
+
+class Compressor(t.Protocol):
+    def chunk(self, data: bytes) -> bytes:
+        """compress `data` and flush it, so the client can decode it right away"""
+        ...
+
+    def finish(self) -> bytes: ...
+
+
+class Encoding:
+    """One `Content-Encoding`: a one-shot `compress` and an incremental compressor.
+
+    `level` is the default for the encoding, `COMPRESS_LEVEL` overrides it;
+    `max_level` is used for bodies compressed once and served many times.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        level: int,
+        max_level: int,
+        compress: t.Callable[[bytes, int], bytes],
+        compressor: t.Callable[[int], Compressor],
+    ) -> None:
+        self.name = name
+        self.level = level
+        self.max_level = max_level
+        self.compress = compress
+        self.compressor = compressor
+
+
+class _ZlibCompressor:
+    def __init__(self, level: int, wbits: int) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def _zlib(name: str, wbits: int) -> Encoding:
+    # gzip is deflate with a gzip header (wbits 31), HTTP `deflate` the zlib format
+    return Encoding(
+        name,
+        6,
+        9,
+        lambda data, level: zlib.compress(data, level, wbits),
+        lambda level: _ZlibCompressor(level, wbits),
+    )
+
+
+def _brotli() -> Encoding:
+    try:
+        import brotli
+    except ImportError:
+        import brotlicffi as brotli  # type: ignore[no-redef]
+
+    class BrotliCompressor:
+        def __init__(self, level: int) -> None:
+            self._obj = brotli.Compressor(quality=level)
+
+        def chunk(self, data: bytes) -> bytes:
+            return self._obj.process(data) + self._obj.flush()
+
+        def finish(self) -> bytes:
+            return self._obj.finish()
+
+    return Encoding(
+        "br",
+        4,
+        11,
+        lambda data, level: brotli.compress(data, quality=level),
+        BrotliCompressor,
+    )
+
+
+def _zstd() -> Encoding:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+    except ImportError:
+        import zstandard
+
+        class ZstandardCompressor:
+            def __init__(self, level: int) -> None:
+                self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+            def chunk(self, data: bytes) -> bytes:
+                return self._obj.compress(data) + self._obj.flush(
+                    zstandard.COMPRESSOBJ_FLUSH_BLOCK
+                )
+
+            def finish(self) -> bytes:
+                return self._obj.flush()
+
+        return Encoding(
+            "zstd",
+            3,
+            19,
+            lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+            ZstandardCompressor,
+        )
+
+    class ZstdCompressor:
+        def __init__(self, level: int) -> None:
+            self._obj = zstd.ZstdCompressor(level=level)
+
+        def chunk(self, data: bytes) -> bytes:
+            return self._obj.compress(data, mode=self._obj.FLUSH_BLOCK)
+
+        def finish(self) -> bytes:
+            return self._obj.flush()
+
+    return Encoding(
+        "zstd",
+        3,
+        19,
+        lambda data, level: zstd.compress(data, level=level),
+        ZstdCompressor,
+    )
+
+
+@ft.cache
+def available_encodings() -> dict[str, Encoding]:
+    """gzip and deflate, `br` with `brotli`, `zstd` on 3.14 or with `zstandard`"""
+    encodings: dict[str, Encoding] = {
+        "gzip": _zlib("gzip", 31),
+        "deflate": _zlib("deflate", 15),
+    }
+    for factory in (_brotli, _zstd):
+        try:
+            encoding = factory()
+        except ImportError:
+            continue
+        encodings[encoding.name] = encoding
+    return encodings
+
+
+def negotiate(request: Request, names: t.Iterable[str]) -> str | None:
+    """the encoding among `names` (server preference order) the client accepts best"""
+    if "Accept-Encoding" not in request.headers:
+        return None
+    return request.accept_encodings.best_match(tuple(names))
+
+
+def is_compressible(mimetype: str | None) -> bool:
+    if not mimetype or mimetype in _COMPRESSED_TYPES:
+        return False
+    if mimetype in _COMPRESSIBLE_IMAGES:
+        return True
+    return not mimetype.startswith(_COMPRESSED_PREFIXES)
+
+
+def _stream(compressor: Compressor, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    for chunk in chunks:
+        if chunk:
+            yield compressor.chunk(chunk)
+    yield compressor.finish()
+
+
+class ResponseCompressor:
+    """Negotiate `Accept-Encoding` and compress the outgoing response.
+
+    Runs as an `after_request` hook of :class:`FlaskNova`, so model responses,
+    RFC 7807 errors and `/openapi.json` are covered. Streamed bodies are
+    compressed chunk by chunk and flushed, so each chunk still reaches the
+    client as soon as it is produced.
+    ```
+    app.config["COMPRESS"] = True  # off by default
+    app.config["COMPRESS_MIN_SIZE"] = 500
+    app.config["COMPRESS_LEVEL"] = {"gzip": 6, "br": 4, "zstd": 3}  # or one int
+    app.config["COMPRESS_ENCODINGS"] = ("zstd", "br", "gzip", "deflate")
+
+    @app.get("/events", compress=False)  # per-route opt-out
+    ```
+    """
+
+    def __init__(self, config: t.Mapping[str, t.Any]) -> None:
+        self.config = config
+
+    def __call__(
+        self, request: Request, response: Response, plan: RoutePlan | None
+    ) -> Response:
+        if not self._eligible(request, response, plan):
+            return response
+        streamed: bool = response.is_streamed
+        if not streamed and self._length(response) < self.config.get(
+            "COMPRESS_MIN_SIZE", DEFAULT_MIN_SIZE
+        ):
+            return response
+
+        # the body now depends on `Accept-Encoding`, whatever the client sent
+        response.vary.add("Accept-Encoding")
+        encoding = self._negotiate(request)
+        if encoding is None:
+            return response
+        level: int = self._level(encoding)
+
+        if streamed:
+            close = getattr(response.response, "close", None)
+            if close is not None:
+                # `stream_with_context` still releases the request context
+                response.call_on_close(close)
+            response.response = _stream(
+                encoding.compressor(level), response.iter_encoded()
+            )
+            response.headers.pop("Content-Length", None)
+        else:
+            response.set_data(encoding.compress(response.get_data(), level))
+        response.headers["Content-Encoding"] = encoding.name
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # same content, different bytes: only weakly equal to the original
+            response.set_etag(etag, weak=True)
+        return response
+
+    @staticmethod
+    def _eligible(request: Request, response: Response, plan: RoutePlan | None) -> bool:
+        if plan is not None and not plan.compress:
+            return False
+        if request.method == "HEAD" or response.direct_passthrough:
+            return False
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if "Content-Encoding" in response.headers:
+            return False
+        if "no-transform" in response.headers.get("Cache-Control", ""):
+            return False
+        return is_compressible(response.mimetype)
+
+    @staticmethod
+    def _length(response: Response) -> int:
+        length = response.content_length
+        return len(response.get_data()) if length is None else length
+
+    def _negotiate(self, request: Request) -> Encoding | None:
+        encodings = available_encodings()
+        best = negotiate(
+            request,
+            (
+                name
+                for name in self.config.get("COMPRESS_ENCODINGS", DEFAULT_ENCODINGS)
+                if name in encodings
+            ),
+        )
+        return encodings[best] if best else None
+
+    def _level(self, encoding: Encoding) -> int:
+        level: int | t.Mapping[str, int] | None = self.config.get("COMPRESS_LEVEL")
+        if isinstance(level, int):
+            return level
+        if level:
+            return level.get(encoding.name, encoding.level)
+        return encoding.level
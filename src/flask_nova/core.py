@@ -1,35 +1,88 @@
 from __future__ import annotations
 
-from flask import Flask as _Flask, Request, Response, jsonify, request, g
+from flask import Flask as _Flask, Request, Response, jsonify, request
+from flask import has_request_context, stream_with_context
 from flask.globals import request_ctx
+from flask.helpers import get_root_path
 from flask.typing import HeadersValue
 from werkzeug.datastructures import Headers
+from werkzeug.wrappers import Response as BaseResponse
 
-from .helpers import type_builder, TypeChecker, __openapi__
 from .exceptions import HTTPException
-from .docs import create_docs_blueprint
-from .serializer import Serializer
+from .json_provider import NovaJSONProvider
+from .media import BinaryCodec, binary_codecs
 from .logger import json_logger
 from .binder import Binder
-from .typed import Method
+from .wrappers import NovaGlobals, NovaRequest
+from .typed import HeaderMarker, Method
 
+from collections.abc import Iterable, Iterator, Mapping
+from functools import cached_property
+from contextlib import contextmanager
 from enum import Enum
-from uuid import UUID
+import concurrent.futures as cf
+import functools as ft
 import inspect as ip
 import typing as t
 import warnings
 import logging
-import secrets
+import asyncio
+import json
+import threading
+import weakref
 import os
 import re
 
+# schema tooling, docs, metrics, tracing, profiling, compression, the cache
+# and snapshots are imported on first use, `from flask_nova import FlaskNova`
+# only pays for what every app needs
 if t.TYPE_CHECKING:
+    from .asgi import NovaASGI
+    from .di import DependencyScope
+    from .cache import CachePolicy, ResponseCache
+    from .metrics import Metrics
+    from .plan import RoutePlan
+    from .profiling import Profiler
+    from .snapshot import Snapshot
+    from .tracing import RequestSpans, TraceContext, Tracer
     from werkzeug.routing import Rule
+    from flask import Blueprint
     from flask.typing import RouteCallable, ResponseReturnValue
     from flask.sansio.scaffold import T_route
+    from _typeshed.wsgi import StartResponse, WSGIEnvironment
+
+_NOT_STREAMED = (str, bytes, Mapping, BaseResponse)
+_NDJSON_MIMETYPES: tuple[str, ...] = ("application/x-ndjson", "application/ndjson")
+# batches of `register_routes()` built on a thread pool by default, free-threaded
+_PARALLEL_MIN_ROUTES: int = 64
+
+# `(rule, endpoint, view_func, provide_automatic_options, options)` of `add_url_rule`
+_Route = tuple[str, t.Optional[str], t.Any, t.Optional[bool], dict[str, t.Any]]
+# `(schema_cache, methods, plan)` built for a route before it is registered
+_PreparedRoute = tuple[dict[str, t.Any], set[str], "RoutePlan"]
+
+# view function -> `(path parameters, response_model)` -> request and response
+# schemas, so a view mounted on several rules is introspected once
+_VIEW_SCHEMAS: weakref.WeakKeyDictionary[
+    t.Callable[..., t.Any], dict[tuple[t.Any, ...], dict[str, t.Any]]
+] = weakref.WeakKeyDictionary()
+_VIEW_SCHEMAS_LOCK = threading.Lock()
+
+
+@ft.cache
+def _rule_paths(rule: str) -> tuple[str, ...]:
+    """names of the `<converter:name>` parameters of `rule`"""
+    return tuple(
+        path.split(sep=":")[1] if ":" in path else path
+        for path in re.findall(pattern=r"<([^>]+)>", string=rule)
+    )
 
 
 class FlaskNova(_Flask):
+    json_provider_class = NovaJSONProvider
+    request_class = NovaRequest
+    app_ctx_globals_class = NovaGlobals
+
     def __init__(
         self,
         import_name: str = __name__,
@@ -50,9 +103,40 @@ class FlaskNova(_Flask):
         license: dict[str, str] | None = None,
         terms_of_service: str | None = None,
         external_docs: dict[str, str] | None = None,
+        snapshot: str | os.PathLike[str] | None = None,
     ) -> None:
         self._compiled_validators: dict[str, t.Any] = {}
-        self.openapi: dict[str, t.Any] = {}
+        self._route_plans: dict[tuple[str, str], RoutePlan] = {}
+        self._openapi: dict[str, t.Any] = {}
+        # `(rule, metadata, tags, servers)` registered since the last assembly
+        self._openapi_pending: list[tuple[str, dict[str, t.Any], list, list]] = []
+        self._openapi_lock = threading.Lock()
+        # bumped on every change of the document, `/openapi.json` re-encodes then
+        self._openapi_version: int = 0
+        # routes added inside `register_routes()`, registered when it exits
+        self._deferred_routes: list[_Route] | None = None
+        # route schemas and document of `flask_nova build`, when still fresh
+        self._snapshot: Snapshot | None = None
+        # `(version, bytes)` of a pre-encoded document, served while unchanged
+        self._openapi_encoded: tuple[int, bytes] | None = None
+        # routes that depend on the config, added once before the first request
+        self._setup_finished: bool = False
+        self._setup_lock = threading.Lock()
+
+        #: file written by `flask_nova build`, relative to the app's `root_path`;
+        #: loaded before `Flask.__init__` so the static route uses it too
+        self.snapshot_path: str | None = (
+            os.path.join(root_path or get_root_path(import_name), snapshot)
+            if snapshot
+            else None
+        )
+        if self.snapshot_path:
+            from .snapshot import Snapshot
+
+            self._snapshot = Snapshot.load(self.snapshot_path)
+            if self._snapshot is not None:
+                self._openapi = json.loads(self._snapshot.openapi)
+                self._openapi_encoded = (self._openapi_version, self._snapshot.openapi)
 
         super().__init__(
             import_name,
@@ -73,28 +157,89 @@ class FlaskNova(_Flask):
         self.license = license
         self.terms_of_service = terms_of_service
         self.external_docs = external_docs
-
         # ? add
         # tags, externalDocs, servers, security
 
         self._binder = Binder
-        self._serializer = Serializer
-        self.__rule: str = ""  # let's call this SnoopShot
 
         @self.errorhandler(code_or_exception=HTTPException)
         def _http_exc(e: HTTPException) -> tuple[Response, int]:
             return self._to_rfc7807(e), e.status_code
 
+        @self.before_request
+        def _measure_request() -> None:
+            # first hook, so the latency covers the others
+            if self.config.get("METRICS", False):
+                self.metrics.start(request)
+
+        @self.before_request
+        def _match_route_plan() -> None:
+            # before the hooks of the app: a hook reading `request.form`
+            # already parses the `File(...)` parts with their limits
+            if request.url_rule is not None:
+                self._route_plan(request, request.url_rule)
+
+        @self.teardown_request
+        def _finish_measure(exc: BaseException | None) -> None:
+            # teardowns run in reverse: the last one, after dependency teardown
+            if getattr(request, "metrics_started", None) is not None:
+                self.metrics.finish(request)
+
         @self.before_request
         def _trace_request() -> None:
-            incoming_trace: str | None = request.headers.get(key="traceparent")
+            # `g.trace_id` is read from `request.trace` lazily; spans are only
+            # recorded for sampled requests once `TRACING_SINK` is set
+            spans: RequestSpans | None = self.tracer.start(request)
+            if spans is not None:
+                request.spans = spans  # type: ignore[attr-defined]
 
-            if incoming_trace and len(incoming_trace.split(sep="-")) == 4:
-                parts: list[str] = incoming_trace.split(sep="-")
-                trace_id: str = parts[1]
-            else:
-                trace_id = secrets.token_hex(nbytes=16)
-            g.trace_id = trace_id
+        @self.after_request
+        def _measure_response(response: Response) -> Response:
+            # after hooks run in reverse: this one sees the compressed body
+            if getattr(request, "metrics_started", None) is not None:
+                self.metrics.respond(request, response)
+            return response
+
+        @self.after_request
+        def _trace_response(response: Response) -> Response:
+            spans: RequestSpans | None = getattr(request, "spans", None)
+            if spans is not None:
+                status_code: int = response.status_code
+                spans.root.attributes["http.response.status_code"] = status_code
+            return response
+
+        from .compression import ResponseCompressor
+        from .docs import create_docs_blueprint
+
+        compress_response = ResponseCompressor(self.config)
+
+        @self.after_request
+        def _compress(response: Response) -> Response:
+            if not self.config.get("COMPRESS", False):
+                return response
+            plan: RoutePlan | None = getattr(request, "route_plan", None)
+            return compress_response(request, response, plan)
+
+        @self.after_request
+        def _store_cache(response: Response) -> Response:
+            # registered after `_compress` so it runs first: the cache keeps
+            # the identity body and every hit is negotiated again
+            if getattr(request, "cache_key", None) is not None:
+                self.cache.store(request, response)
+            return response
+
+        @self.teardown_request
+        def _close_dependencies(exc: BaseException | None) -> None:
+            # after the response: run the teardown of generator dependencies
+            scope: DependencyScope | None = getattr(request, "dependencies", None)
+            if scope is not None:
+                scope.close(exc)
+
+        @self.teardown_request
+        def _finish_trace(exc: BaseException | None) -> None:
+            spans: RequestSpans | None = getattr(request, "spans", None)
+            if spans is not None:
+                self.tracer.finish(spans, exc)
 
         self.register_blueprint(create_docs_blueprint(self))
 
@@ -107,11 +252,49 @@ class FlaskNova(_Flask):
         **options: dict[str, t.Any],
     ) -> None:
 
-        if view_func:
-            schema_cache: dict[str, dict[str, t.Any]] = self._build_schema_cache(
-                rule, view_func, options
-            )
+        if rule not in options:
+            # blueprint rules arrive with their `url_prefix`, the metadata
+            # is still keyed by the rule given to the decorator
+            meta_key = next((key for key in options if key.startswith("/")), None)
+            if meta_key is not None:
+                options[rule] = options.pop(meta_key)
+
+        route = (rule, endpoint, view_func, provide_automatic_options, options)
+        if self._deferred_routes is not None:
+            # inside `register_routes()`: introspected with the others on exit
+            self._deferred_routes.append(route)
+            return None
+        self._install_route(route, self._prepare_route(route))
+
+    def _prepare_route(self, route: _Route) -> _PreparedRoute | None:
+        """introspect the view of `route` and build its plan, without registering it"""
+        rule, _, view_func, _, options = route
+        if not view_func:
+            return None
+        schema_cache: dict[str, dict[str, t.Any]] = self._build_schema_cache(
+            rule, view_func, options
+        )
+        methods: set[str] = self._route_methods(view_func, options)
+        from .plan import RoutePlan
+
+        plan = RoutePlan(
+            rule,
+            methods,
+            schema_cache.get("request"),
+            schema_cache.get("response"),
+            self.json.encode,  # type: ignore[attr-defined]
+            compress=(options.get(rule) or {}).get("compress", True),
+            cache=(options.get(rule) or {}).get("cache"),
+        )
+        return schema_cache, methods, plan
+
+    def _install_route(self, route: _Route, prepared: _PreparedRoute | None) -> None:
+        rule, endpoint, view_func, provide_automatic_options, options = route
+        if view_func and prepared:
+            schema_cache, methods, plan = prepared
             self._compiled_validators[rule] = schema_cache
+            for method in methods:
+                self._route_plans[(rule, method)] = plan
 
             operationId: str = view_func.__name__
             route_meta: dict[str, t.Any] | None = options.pop(rule, None)
@@ -127,6 +310,8 @@ class FlaskNova(_Flask):
                         route_meta.pop(name)
                     route_meta = {**route_meta}
                 route_meta.pop("response_model", None)
+                route_meta.pop("compress", None)
+                route_meta.pop("cache", None)
                 open_api_meta: dict[str, t.Any | dict[str, t.Any]] = {
                     **route_meta,
                     **schema_cache,
@@ -135,62 +320,245 @@ class FlaskNova(_Flask):
                 open_api_meta = schema_cache
             open_api_meta["operationId"] = operationId
 
-            build: dict[str, t.Any] = {}
-            info: dict[str, str | dict[str, str]] = {}
-
-            if not rule.startswith(
-                ("/docs", "/openapi", "/redoc", "/static", "swagger")
+            snapshot = self._snapshot
+            # described by the document of the snapshot already
+            documented = snapshot is not None and snapshot.documents(rule, view_func)
+            if (
+                not documented
+                and not self._is_metrics_endpoint(endpoint)
+                and not rule.startswith(
+                    ("/docs", "/openapi", "/redoc", "/static", "swagger")
+                )
             ):
-                build[rule] = open_api_meta
-                route_spec = __openapi__(build)
-
-                # todo: MOVE IN SEPARATE FUNCTION------------------/
-                self.openapi["openapi"] = "3.2.0"
-                if self.external_docs:
-                    self.openapi["externalDocs"] = self.external_docs
-                if self.summary:
-                    info["summary"] = self.summary
-                if self.version:
-                    info["version"] = self.version
-                if self.description:
-                    info["description"] = self.description
-                if self.contact:
-                    info["contact"] = self.contact
-                if self.license:
-                    info["license"] = self.license
-                if self.terms_of_service:
-                    info["termsOfService"] = self.terms_of_service
-                self.openapi["info"] = info
-
-                if route_spec:
-                    self.openapi.setdefault("paths", {}).update(route_spec["paths"])
-                    self.openapi.setdefault("components", {}).update(
-                        route_spec["components"]
+                # assembled by `self.openapi` on first access, not per route
+                with self._openapi_lock:
+                    self._openapi_pending.append(
+                        (rule, open_api_meta, tags or [], servers or [])
                     )
-                if tags:
-                    self.openapi.setdefault("tags", []).extend(tags)
-                    self.openapi["tags"] = list(set(self.openapi["tags"]))
-                if servers:
-                    self.openapi.setdefault("servers", []).extend(servers)
+                    self._openapi_version += 1
 
-        return super().add_url_rule(
+        super().add_url_rule(
             rule, endpoint, view_func, provide_automatic_options, **options
         )
 
+    def _is_metrics_endpoint(self, endpoint: str | None) -> bool:
+        """whether `endpoint` is the `METRICS_PATH` route, added with `METRICS` on"""
+        if not self.config.get("METRICS", False):
+            return False
+        from .metrics import METRICS_ENDPOINT
+
+        return endpoint == METRICS_ENDPOINT
+
+    @contextmanager
+    def register_routes(self, parallel: bool | None = None) -> Iterator[None]:
+        """Register the routes added in the block in one pass when it exits.
+
+        Every view is introspected before any route is registered, so a
+        broken signature leaves the app untouched (the blueprints registered
+        in the block are dropped again), and a view mounted on several rules
+        (a blueprint registered twice) is introspected once.
+        Schemas are built on a thread pool when `parallel` is true, by
+        default on free-threaded builds for large batches.
+        :meth:`register_blueprint` uses it for the routes of a blueprint.
+        ```
+        with app.register_routes():
+            for module in api_modules:
+                app.register_blueprint(module.bp)
+        ```
+        """
+        if self._deferred_routes is not None:
+            # nested: the outermost block registers everything
+            yield
+            return
+        self._deferred_routes = deferred = []
+        blueprints = set(self.blueprints)
+        try:
+            try:
+                yield
+            finally:
+                self._deferred_routes = None
+            if parallel is None:
+                from ._task import gil_enabled
+
+                parallel = not gil_enabled and len(deferred) >= _PARALLEL_MIN_ROUTES
+            if parallel and len(deferred) > 1:
+                with cf.ThreadPoolExecutor(thread_name_prefix="nova-routes") as pool:
+                    prepared = list(pool.map(self._prepare_route, deferred))
+            else:
+                prepared = [self._prepare_route(route) for route in deferred]
+        except BaseException:
+            # their routes are dropped, so are the blueprints Flask recorded
+            self._forget_blueprints(self.blueprints.keys() - blueprints)
+            raise
+        for route, plan in zip(deferred, prepared):
+            self._install_route(route, plan)
+
+    def _forget_blueprints(self, names: t.Iterable[str]) -> None:
+        """undo what :meth:`Flask.register_blueprint` recorded for `names`"""
+        registries: tuple[dict[t.Any, t.Any], ...] = (
+            self.error_handler_spec,
+            self.before_request_funcs,
+            self.after_request_funcs,
+            self.teardown_request_funcs,
+            self.url_default_functions,
+            self.url_value_preprocessors,
+            self.template_context_processors,
+        )
+        for name in names:
+            self.blueprints.pop(name, None)
+            for registry in registries:
+                registry.pop(name, None)
+
+    def register_blueprint(self, blueprint: Blueprint, **options: t.Any) -> None:
+        """:meth:`Flask.register_blueprint`, routes added by :meth:`register_routes`"""
+        with self.register_routes():
+            super().register_blueprint(blueprint, **options)
+
+    @property
+    def openapi(self) -> dict[str, t.Any]:
+        """OpenAPI document of the registered routes.
+
+        Registration only records the route metadata; the document is
+        assembled on first access and memoized. Routes and blueprints added
+        afterwards are merged in on the next access, the routes already in
+        the document are not rebuilt.
+        """
+        if self._openapi_pending:
+            self._merge_openapi()
+        return self._openapi
+
+    @openapi.setter
+    def openapi(self, document: dict[str, t.Any]) -> None:
+        with self._openapi_lock:
+            self._openapi = document
+            self._openapi_pending.clear()
+            self._openapi_version += 1
+
+    def warmup(self, openapi: bool = False) -> None:
+        """Compile every route now instead of on its first request.
+
+        Routes build their pydantic adapters, binders and serializers on
+        first use; call this after registration (e.g. in a pre-fork master)
+        to pay that cost before the first request, `openapi=True` builds the
+        OpenAPI document too.
+        ```
+        app.warmup(openapi=True)
+        ```
+        """
+        self._finish_setup()
+        for plan in {id(plan): plan for plan in self._route_plans.values()}.values():
+            plan.compile()
+        if openapi:
+            self.openapi
+
+    def _finish_setup(self) -> None:
+        """add the routes the config asks for, e.g. `METRICS_PATH`, once"""
+        with self._setup_lock:
+            if self._setup_finished:
+                return
+            if self.config.get("METRICS", False):
+                from .metrics import create_metrics_blueprint
+
+                self.register_blueprint(create_metrics_blueprint(self))
+            self._setup_finished = True
+
+    def wsgi_app(
+        self, environ: WSGIEnvironment, start_response: StartResponse
+    ) -> Iterable[bytes]:
+        if not self._setup_finished:
+            self._finish_setup()
+        return super().wsgi_app(environ, start_response)
+
+    def _merge_openapi(self) -> None:
+        """merge the pending routes into the memoized document"""
+        from .helpers import __openapi__, _add_components
+
+        with self._openapi_lock:
+            pending, self._openapi_pending = self._openapi_pending, []
+            if not pending:
+                return
+            document = self._openapi
+            document["openapi"] = "3.2.0"
+            if self.external_docs:
+                document["externalDocs"] = self.external_docs
+            document["info"] = self._openapi_info()
+
+            paths: dict[str, t.Any] = document.setdefault("paths", {})
+            schemas: dict[str, t.Any] = document.setdefault(
+                "components", {}
+            ).setdefault("schemas", {})
+            tags: dict[t.Any, None] = dict.fromkeys(document.get("tags", ()))
+            for rule, open_api_meta, route_tags, servers in pending:
+                # `__openapi__` pops the keys it reads, keep the recorded metadata
+                route_spec = __openapi__({rule: {**open_api_meta}})
+                for path_key, operations in route_spec.get("paths", {}).items():
+                    paths.setdefault(path_key, {}).update(operations)
+                # models shared by several routes are one entry of `schemas`
+                _add_components(
+                    schemas, route_spec.get("components", {}).get("schemas", {})
+                )
+                tags.update(dict.fromkeys(route_tags))
+                if servers:
+                    document.setdefault("servers", []).extend(servers)
+            if tags:
+                document["tags"] = list(tags)
+
+    def _openapi_info(self) -> dict[str, str | dict[str, str]]:
+        info: dict[str, str | dict[str, str]] = {}
+        if self.summary:
+            info["summary"] = self.summary
+        if self.version:
+            info["version"] = self.version
+        if self.description:
+            info["description"] = self.description
+        if self.contact:
+            info["contact"] = self.contact
+        if self.license:
+            info["license"] = self.license
+        if self.terms_of_service:
+            info["termsOfService"] = self.terms_of_service
+        return info
+
+    @staticmethod
+    def _route_methods(view_func: RouteCallable, options: dict[str, t.Any]) -> set[str]:
+        """methods a plan is compiled for, resolved the same way Flask does"""
+        methods = options.get("methods") or getattr(view_func, "methods", None)
+        resolved: set[str] = {m.upper() for m in (methods or ("GET",))}
+        if "GET" in resolved:
+            resolved.add("HEAD")
+        return resolved
+
     def _build_schema_cache(
         self,
         rule: str,
         view_func: RouteCallable,
         options: dict[str, t.Any],
     ) -> dict[str, dict[str, t.Any]]:
-        build: dict[str, t.Any] = {}
-        signature: ip.Signature = ip.signature(view_func)
+        if self._snapshot is not None:
+            stored = self._snapshot.schema(rule, view_func)
+            if stored is not None:
+                return stored
         route_meta: dict | None = options.get(rule)
-        return_type = t.get_type_hints(obj=view_func).get("return")
-
-        build["request"] = self._request_signature(rule, signature)
-        build["response"] = self._response_signature(route_meta, return_type)
-        return build
+        paths: tuple[str, ...] = _rule_paths(rule)
+        key = (paths, route_meta and route_meta.get("response_model"))
+        try:
+            with _VIEW_SCHEMAS_LOCK:
+                schemas = _VIEW_SCHEMAS.setdefault(view_func, {})
+                build = schemas.get(key)
+        except TypeError:
+            # not weakly referenceable or an unhashable `response_model`
+            schemas, build = {}, None
+        if build is None:
+            signature: ip.Signature = ip.signature(view_func)
+            return_type = t.get_type_hints(obj=view_func).get("return")
+            build = {
+                "request": self._request_signature(paths, signature, view_func),
+                "response": self._response_signature(route_meta, return_type),
+            }
+            with _VIEW_SCHEMAS_LOCK:
+                schemas[key] = build
+        # the route adds its own keys, the field schemas are shared
+        return {**build}
 
     def _response_signature(
         self, route_meta: dict | None, return_type: t.Any
@@ -204,12 +572,10 @@ class FlaskNova(_Flask):
 
         elif return_type:
             r_args: tuple[t.Any, ...] = t.get_args(tp=return_type)
-            if t.get_origin(return_type) is tuple and r_args[0] not in (
-                int,
-                float,
-                dict,
-                str,
-                Response,
+            if (
+                t.get_origin(return_type) is tuple
+                and Ellipsis not in r_args
+                and r_args[0] not in (int, float, dict, str, Response)
             ):
 
                 len_rt: int = len(r_args)
@@ -223,47 +589,82 @@ class FlaskNova(_Flask):
             else:
                 response = return_type
 
+        from .helpers import TypeChecker, type_builder
+
         typed_result = type_builder(TypeChecker(response))
         if typed_result:
             typed_result.update({"status": status, "headers": headers})
         return typed_result
 
     def _request_signature(
-        self, rule: str, signature: ip.Signature
+        self, paths: tuple[str, ...], signature: ip.Signature, view_func: RouteCallable
     ) -> dict[str, t.Any]:
+        from .helpers import TypeChecker, _is_param_type, type_builder
+
         build: dict[str, t.Any] = {}
-        paths: list[str] = []
-        get_paths: list[str] = re.findall(pattern=r"<([^>]+)>", string=rule)
-        for path in get_paths:
-            if ":" in path:
-                paths.append(path.split(sep=":")[1])
-            else:
-                paths.append(path)
+        try:
+            hints = t.get_type_hints(view_func, include_extras=True)
+        except (NameError, TypeError):
+            hints = {}
 
         for name, param in signature.parameters.items():
-            annotation = param.annotation
+            annotation = hints.get(name, param.annotation)
             default = param.default
             if t.get_origin(annotation) is t.Annotated:
-                type_, *default_ = t.get_args(annotation)  # type: ignore[assignment]
+                type_, *metadata = t.get_args(annotation)
+                default_ = metadata[0]
             else:
                 type_ = annotation if annotation is not ip._empty else None
-                default_ = default if default is not ip._empty else None  # type: ignore[assignment]
-            default_ = default_[0] if isinstance(default_, list) else default_
-
-            if name and type_ in (str, int, float, UUID):
-                if name in paths:
-                    pq = {"type": "path", "object": type_}
-                else:
-                    pq = {"type": "query", "object": type_}
-                build[name] = pq
+                default_ = default if default is not ip._empty else None
+
+            if name and isinstance(default_, HeaderMarker):
+                build[name] = self._param_field(
+                    "header", annotation, default, default_.default
+                )
+                build[name]["alias"] = default_.alias or name.replace("_", "-")
+            elif name and _is_param_type(type_):
+                kind = "path" if name in paths else "query"
+                build[name] = self._param_field(kind, annotation, default)
+            elif name and not type_ and not default_ and name in paths:
+                # unannotated: the value of the rule's converter, as is
+                build[name] = self._param_field("path", t.Any, default)
             elif name and not type_ and not default_:
-                build[name] = {"type": "query", "object": str}
+                # unannotated: an optional string, `None` when it is absent
+                optional = None if default is ip._empty else default
+                build[name] = self._param_field("query", str, optional)
             else:
                 build[name] = type_builder(
                     type_checker=TypeChecker(annotation=type_, default=default_)
                 )
         return build
 
+    @staticmethod
+    def _param_field(
+        kind: str, annotation: t.Any, default: t.Any, marker_default: t.Any = ...
+    ) -> dict[str, t.Any]:
+        """field of the route's parameter model, required unless it has a default"""
+        if default is ip._empty or isinstance(default, HeaderMarker):
+            default = marker_default
+        type_ = annotation
+        if t.get_origin(annotation) is t.Annotated:
+            type_ = t.get_args(annotation)[0]
+        return {
+            "type": kind,
+            "object": type_,
+            "annotation": annotation,
+            "default": default,
+        }
+
+    def full_dispatch_request(self) -> Response:
+        """:meth:`Flask.full_dispatch_request` under `app.profiler`
+
+        A no-op unless `PROFILE_SECRET` or `PROFILE_SAMPLE` picks the request;
+        the hooks, :meth:`make_response` and the finalized response are part
+        of the profile.
+        """
+        with self.profiler.profile(request_ctx.request):
+            return super().full_dispatch_request()
+
     def dispatch_request(
         self,
     ) -> ResponseReturnValue:
@@ -278,15 +679,124 @@ class FlaskNova(_Flask):
         ):
             return self.make_default_options_response()
 
-        view_args: dict[str, t.Any] | None = {}
-        binders = self._compiled_validators[rule.rule].get("request")
-        if binders:
-            for field_name, field_obj in binders.items():
-                result = self._binder(field_name, field_obj, req).make_request()
-                view_args[field_name] = result  # type: ignore[index]
+        from .tracing import span
+
+        plan = req.route_plan or self._route_plan(req, rule)  # type: ignore[attr-defined]
+        params: dict[str, t.Any] | None = None
+        if plan is not None and plan.cache is not None:
+            params = plan.bind_params(req)
+            cached: Response | None = self._cached_response(req, plan, params)
+            if cached is not None:
+                return cached
+        view_args = plan.bind(req, params) if plan else req.view_args or {}
+        with span(req, "handler"):
+            return self.ensure_sync(self.view_functions[rule.endpoint])(**view_args)  # type: ignore[arg-type]
+
+    async def async_dispatch_request(self) -> ResponseReturnValue:
+        """:meth:`dispatch_request` for the ASGI entry point.
+
+        Coroutine views are awaited on the running loop instead of going
+        through `ensure_sync`; sync views run in a worker thread so they never
+        block the loop.
+        """
+        req: Request = request_ctx.request
+        if req.routing_exception is not None:
+            self.raise_routing_exception(request=req)
+
+        rule: Rule = req.url_rule  # type: ignore
+        if (
+            getattr(rule, "provide_automatic_options", False)
+            and req.method == "OPTIONS"
+        ):
+            return self.make_default_options_response()
+
+        from .tracing import span
+
+        plan = req.route_plan or self._route_plan(req, rule)  # type: ignore[attr-defined]
+        params: dict[str, t.Any] | None = None
+        if plan is not None and plan.cache is not None:
+            params = plan.bind_params(req)
+            cached: Response | None = self._cached_response(req, plan, params)
+            if cached is not None:
+                return cached
+        view = self.view_functions[rule.endpoint]
+        view_args = await plan.abind(req, params) if plan else req.view_args or {}
+        with span(req, "handler"):
+            if ip.iscoroutinefunction(view):
+                return await view(**view_args)
+            rv = await asyncio.to_thread(view, **view_args)
+            if ip.isawaitable(rv):
+                # sync decorators (e.g. `guard`) wrapping a coroutine view
+                return await rv
+            return rv
+
+    def _route_plan(self, req: Request, rule: Rule) -> RoutePlan | None:
+        """look up the compiled plan of the matched route and keep it on `req`"""
+        plan: RoutePlan | None = self._route_plans.get((rule.rule, req.method))
+        req.route_plan = plan  # type: ignore[attr-defined]
+        return plan
+
+    def _cached_response(
+        self, req: Request, plan: RoutePlan, params: dict[str, t.Any]
+    ) -> Response | None:
+        """stored response of a cached route, keyed by the negotiated body format too"""
+        negotiated = self._negotiate_codec(plan)
+        return self.cache.lookup(req, plan, params, negotiated and negotiated[0])
+
+    @cached_property
+    def cache(self) -> ResponseCache:
+        """Response cache of the `GET` routes declared with a :class:`CachePolicy`.
+        ```
+        app.cache.invalidate(tag="items")
+        ```
+        """
+        from .cache import ResponseCache
+
+        return ResponseCache(self)
+
+    @cached_property
+    def tracer(self) -> Tracer:
+        """W3C trace-context propagation and span export, see :class:`Tracer`.
+        ```
+        app.config["TRACING_SINK"] = OTLPJsonSink("http://collector:4318/v1/traces")
+        ```
+        """
+        from .tracing import Tracer
+
+        return Tracer(self)
+
+    @cached_property
+    def metrics(self) -> Metrics:
+        """Per-route request and stage metrics at `METRICS_PATH`, see :class:`Metrics`.
+        ```
+        app.config["METRICS"] = True
+        ```
+        """
+        from .metrics import Metrics
+
+        return Metrics(self)
+
+    @cached_property
+    def profiler(self) -> Profiler:
+        """cProfile of requests picked by a token or sampling, see :class:`Profiler`.
+        ```
+        app.config["PROFILE_SECRET"] = os.environ["NOVA_PROFILE_SECRET"]
+        ```
+        """
+        from .profiling import Profiler
+
+        return Profiler(self)
+
+    @cached_property
+    def asgi(self) -> NovaASGI:
+        """Native ASGI application for this app.
+        ```
+        uvicorn main:app.asgi
+        ```
+        """
+        from .asgi import NovaASGI
 
-        self.__rule = req.url_rule.rule  # type: ignore
-        return self.ensure_sync(self.view_functions[rule.endpoint])(**view_args)  # type: ignore[arg-type]
+        return NovaASGI(self)
 
     def make_response(self, rv: ResponseReturnValue | type) -> Response:
         """
@@ -300,43 +810,103 @@ class FlaskNova(_Flask):
         ```
         _Note_: This does not override the `reponse_model` in the route decorator
 
+        The body is written by the route's compiled serializer in one pass,
+        whether the handler returns a model class, an instance or a dict.
+
         **versionadded**: 0.1.3
         """
-        status: int | None = None
-        headers: HeadersValue | None = None
-        response_ = None
-
-        serializer_obj = self._compiled_validators.get(self.__rule)
-
-        if serializer_obj and rv:
-            response_obj = serializer_obj.get("response")
-            if isinstance(rv, type) and rv not in (int, float, str, Response):
-                result = self._serializer(rv, response_obj).serialize()
-                return jsonify(result)
-
-            elif isinstance(rv, tuple):
-                len_rv: int = len(rv)
-                if len_rv == 3:
-                    (
-                        response_,
-                        status,
-                        headers,
-                    ) = rv  # type: ignore
-                elif len_rv == 2:
-                    if not isinstance(rv[1], (Headers, dict, list, tuple)):
-                        response_, status = rv  # type: ignore
-                    else:
-                        response_, headers = rv  # pyright: ignore[reportAssignmentType]
+        plan: RoutePlan | None = (
+            getattr(request, "route_plan", None) if has_request_context() else None
+        )
+
+        if plan and plan.streamer and rv is not None:
+            response_, status, headers = self._unpack_return_value(rv)
+            if isinstance(response_, Iterable) and not isinstance(
+                response_, _NOT_STREAMED
+            ):
+                return self._stream_response(plan, response_, status, headers)
+
+        if plan and plan.serializer and (rv is not None or plan.nullable):
+            response_, status, headers = self._unpack_return_value(rv)
+            if not isinstance(response_, plan.passthrough):
+                from .tracing import span
 
-                result = self._serializer(response_, response_obj).serialize()
-                r_o: Response = jsonify(result)
+                negotiated = self._negotiate_codec(plan)
+                with span(request, "serialize"):
+                    if negotiated is None:
+                        r_o: Response = self.response_class(
+                            plan.serializer(response_),
+                            mimetype=self.json.mimetype,  # type: ignore[attr-defined]
+                        )
+                    else:
+                        mimetype, codec = negotiated
+                        r_o = self.response_class(
+                            codec.encode(plan.to_python(response_)),  # type: ignore[misc]
+                            mimetype=mimetype,
+                        )
+                if binary_codecs():
+                    r_o.vary.add("Accept")
                 if status:
-                    r_o.status = status
+                    r_o.status = status  # type: ignore[assignment]
                 if headers:
-                    r_o.headers.update(headers)
+                    r_o.headers.update(headers)  # type: ignore[arg-type]
                 return r_o
         return super().make_response(rv)  # type: ignore
 
+    def _negotiate_codec(self, plan: RoutePlan) -> tuple[str, BinaryCodec] | None:
+        """
+        the `(mimetype, codec)` the client prefers over JSON through `Accept`,
+        `None` to answer JSON; the header is only parsed when it names a codec
+        """
+        codecs = binary_codecs()
+        accept: str | None = request.headers.get("Accept")
+        if not codecs or not accept or plan.to_python is None:
+            return None
+        if not any(codec.name in accept for codec in codecs.values()):
+            return None
+        json_mimetype: str = self.json.mimetype  # type: ignore[attr-defined]
+        best = request.accept_mimetypes.best_match((json_mimetype, *codecs))
+        if best is None or best == json_mimetype:
+            return None
+        return best, codecs[best]
+
+    def _stream_response(
+        self,
+        plan: RoutePlan,
+        items: Iterable[t.Any],
+        status: int | None,
+        headers: HeadersValue | None,
+    ) -> Response:
+        """stream `items` as a chunked JSON array, or NDJSON when accepted"""
+        mimetype: str | None = request.accept_mimetypes.best_match(
+            ("application/json", *_NDJSON_MIMETYPES), default="application/json"
+        )
+        ndjson: bool = mimetype in _NDJSON_MIMETYPES
+        body = stream_with_context(plan.streamer(items, ndjson))  # type: ignore[misc]
+        r_o: Response = self.response_class(body, mimetype=mimetype)
+        r_o.vary.add("Accept")
+        if status:
+            r_o.status = status  # type: ignore[assignment]
+        if headers:
+            r_o.headers.update(headers)  # type: ignore[arg-type]
+        return r_o
+
+    @staticmethod
+    def _unpack_return_value(
+        rv: t.Any,
+    ) -> tuple[t.Any, int | None, HeadersValue | None]:
+        """split `(body, status, headers)`, `(body, status)` or `(body, headers)`"""
+        if not isinstance(rv, tuple):
+            return rv, None, None
+        len_rv: int = len(rv)
+        if len_rv == 3:
+            return rv
+        if len_rv == 2:
+            if not isinstance(rv[1], (Headers, dict, list, tuple)):
+                return rv[0], rv[1], None
+            return rv[0], None, rv[1]
+        return rv, None, None
+
     @property
     def logger(self) -> logging.Logger:
         if not self.config.get("ANSI_COLOR_JSON_LOG") == True:
@@ -350,9 +920,8 @@ class FlaskNova(_Flask):
         extensions, and tracing information for correlating the error with logs.
         """
 
-        trace_id = g.trace_id
-        span_id: str = secrets.token_hex(8)
-        w3c_traceparent: str = f"00-{trace_id}-{span_id}-01"
+        trace: TraceContext = request.trace  # type: ignore[attr-defined]
+        trace_id: str = trace.trace_id
 
         if self.debug:
             self.logger.error(e.title, exc_info=True)
@@ -368,7 +937,8 @@ class FlaskNova(_Flask):
         payload |= extensions
         response: Response = jsonify(payload)
         response.content_type = "application/problem+json"
-        response.headers["traceparent"] = w3c_traceparent
+        # the server span of the request, so the error joins the caller's trace
+        response.headers.update(trace.headers())
         return response
 
     def route(  # type: ignore
@@ -382,6 +952,7 @@ class FlaskNova(_Flask):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         """Register a route and attach Nova API metadata.
@@ -395,6 +966,7 @@ class FlaskNova(_Flask):
             servers: Server URLs associated with the endpoint.
             responses: Documented response definitions.
             response_model: Type used to describe the endpoint response.
+            compress: `False` sends the responses of this route uncompressed.
             options: Additional Flask route options.
 
         Returns:
@@ -409,10 +981,10 @@ class FlaskNova(_Flask):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=methods, **options)
 
-    # todo: introduce `cache: bool` as metadata only in `GET`
     def get(  # type: ignore
         self,
         rule: str,
@@ -423,6 +995,8 @@ class FlaskNova(_Flask):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
+        cache: CachePolicy | None = None,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         """Register a GET endpoint.
@@ -435,8 +1009,10 @@ class FlaskNova(_Flask):
             "/users",
             summary="List users",
             response_model=list[User],
+            cache=CachePolicy(ttl=30, tags=["users"]),
             )
         ```
+        `cache` answers repeated requests from `app.cache` until `ttl` expires.
         """
         options[rule] = {
             "methods": "GET",
@@ -447,6 +1023,8 @@ class FlaskNova(_Flask):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
+            "cache": cache,
         }
         return super().route(rule, methods=["GET"], **options)
 
@@ -460,6 +1038,7 @@ class FlaskNova(_Flask):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         """Register a POST endpoint.
@@ -484,6 +1063,7 @@ class FlaskNova(_Flask):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=["POST"], **options)
 
@@ -497,6 +1077,7 @@ class FlaskNova(_Flask):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         """Register a PUT endpoint.
@@ -520,6 +1101,7 @@ class FlaskNova(_Flask):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=["PUT"], **options)
 
@@ -533,6 +1115,7 @@ class FlaskNova(_Flask):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         """Register a PATCH endpoint.
@@ -556,6 +1139,7 @@ class FlaskNova(_Flask):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=["PATCH"], **options)
 
@@ -569,6 +1153,7 @@ class FlaskNova(_Flask):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         """Register a DELETE endpoint.
@@ -592,6 +1177,7 @@ class FlaskNova(_Flask):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=["DELETE"], **options)
 
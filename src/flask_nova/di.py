@@ -1,13 +1,406 @@
 from __future__ import annotations
 
+from flask import current_app
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+import inspect as ip
 import typing as t
+import contextvars
+import threading
+import asyncio
+import weakref
+import atexit
+
+if t.TYPE_CHECKING:
+    from flask import Flask, Request
 
 T = t.TypeVar("T")
+Scope = t.Literal["request", "app", "transient"]
+
+SCOPES: tuple[str, ...] = t.get_args(Scope)
+APP_SCOPE_KEY = "flask_nova.dependencies"
 
 
 class Depend(t.Generic[T]):
-    def __init__(self, dependency: t.Callable[..., T]) -> None:
-        self.dependency = dependency
+    """Provide a view (or dependency) parameter from `dependency`.
+
+    Parameters of `dependency` that default to another `Depend` are its
+    sub-dependencies. The whole graph is compiled and ordered once, when the
+    route is registered, and resolved in that order on each request.
+    Dependencies that do not need each other resolve concurrently: `async def`
+    ones with `asyncio.gather`, sync ones on a bounded thread pool
+    (`DEPENDENCY_WORKERS`, default 8, `0` resolves them one by one).
+
+    Args:
+        dependency: Callable, `async def` or generator function building the value.
+        scope: How long the value lives.
+            - `"request"` (default): built once per request, shared by every user
+            - `"app"`: built once per app, e.g. engines and HTTP clients
+            - `"transient"`: built again every time it is resolved
+
+    Generator dependencies `yield` their value; the code after `yield` runs once
+    the response is sent, or for `"app"` scope at app shutdown: the ASGI
+    lifespan shutdown, or interpreter exit under WSGI servers.
+
+    Assigning `dependency` (e.g. a fake in tests) recompiles the graphs that
+    use it on their next request.
+    ```
+    def get_session(engine=Depend(get_engine, scope="app")):
+        with Session(engine) as session:
+            yield session
+    ```
+    """
+
+    #: bumped whenever a `dependency` is swapped, compiled graphs compare it
+    generation: t.ClassVar[int] = 0
+
+    def __init__(
+        self, dependency: t.Callable[..., T], scope: Scope = "request"
+    ) -> None:
+        if scope not in SCOPES:
+            raise ValueError(
+                f"Depend: scope must be one of {list(SCOPES)}, got {scope!r}"
+            )
+        self._dependency = dependency
+        self.scope: Scope = scope
+        self._graph: DependencyGraph | None = None
+
+    @property
+    def dependency(self) -> t.Callable[..., T]:
+        return self._dependency
+
+    @dependency.setter
+    def dependency(self, dependency: t.Callable[..., T]) -> None:
+        self._dependency = dependency
+        Depend.generation += 1
 
     def __getitem__(self, key) -> None:
         pass
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """compiled graph, rebuilt when a dependency was swapped (tests)"""
+        graph = self._graph
+        if graph is None or graph.stale:
+            graph = self._graph = DependencyGraph({"": self})
+        return graph
+
+    def resolve(self, request: Request) -> T:
+        return self.graph.resolve(request)[""]
+
+    def __repr__(self) -> str:
+        name: str = getattr(self.dependency, "__name__", repr(self.dependency))
+        return f"{self.__class__.__name__}({name}, scope={self.scope!r})"
+
+
+class DependencyScope:
+    """Values built in one scope and the teardowns of its generator dependencies."""
+
+    def __init__(self) -> None:
+        self.values: dict[t.Any, t.Any] = {}
+        self.exits = ExitStack()
+        self.lock = threading.RLock()
+        self._executor: ThreadPoolExecutor | None = None
+        # one lock per value, so different values are built concurrently
+        self._key_locks: dict[t.Any, threading.Lock] = {}
+
+    def key_lock(self, key: t.Any) -> threading.Lock:
+        """lock guarding the first build of the value stored under `key`"""
+        lock = self._key_locks.get(key)
+        if lock is None:
+            with self.lock:
+                lock = self._key_locks.setdefault(key, threading.Lock())
+        return lock
+
+    def executor(self, max_workers: int) -> ThreadPoolExecutor:
+        """thread pool for sync dependencies, created on first concurrent level"""
+        if self._executor is None:
+            with self.lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers, thread_name_prefix="nova-depend"
+                    )
+        return self._executor
+
+    def enter(self, cm: t.ContextManager[T]) -> T:
+        """enter `cm` and register its exit, safe from several worker threads"""
+        value = cm.__enter__()
+        with self.lock:
+            self.exits.push(cm)
+        return value
+
+    def close(self, exc: BaseException | None = None) -> None:
+        """run the code after `yield` of every generator, newest first"""
+        with self.lock:
+            exits, self.exits = self.exits, ExitStack()
+            executor, self._executor = self._executor, None
+            self.values.clear()
+            self._key_locks.clear()
+        try:
+            if exc is None:
+                exits.close()
+            else:
+                exits.__exit__(type(exc), exc, exc.__traceback__)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+
+def _close_at_exit(ref: weakref.ref[DependencyScope]) -> None:
+    scope = ref()
+    if scope is not None:
+        scope.close()
+
+
+def app_scope(app: Flask) -> DependencyScope:
+    """
+    the `"app"` scope of `app`, stored in `app.extensions` and closed at
+    interpreter exit unless the ASGI lifespan closed it first
+    """
+    scope: DependencyScope | None = app.extensions.get(APP_SCOPE_KEY)
+    if scope is None:
+        new = DependencyScope()
+        scope = app.extensions.setdefault(APP_SCOPE_KEY, new)
+        if scope is new:
+            atexit.register(_close_at_exit, weakref.ref(scope))
+    return scope
+
+
+def request_scope(request: Request) -> DependencyScope:
+    """the `"request"` scope of `request`, created on first use"""
+    scope: DependencyScope | None = getattr(request, "dependencies", None)
+    if scope is None:
+        scope = request.dependencies = DependencyScope()  # type: ignore[union-attr]
+    return scope
+
+
+class _Node:
+    __slots__ = (
+        "depend",
+        "func",
+        "call",
+        "key",
+        "scope",
+        "kwargs",
+        "generator",
+        "coroutine",
+    )
+
+    def __init__(self, depend: Depend, kwargs: tuple[tuple[str, t.Any], ...]) -> None:
+        self.depend = depend
+        self.func: t.Callable[..., t.Any] = depend.dependency
+        self.key: t.Any = _node_key(depend)
+        self.scope: Scope = depend.scope
+        self.kwargs = kwargs
+        self.generator: bool = ip.isgeneratorfunction(self.func)
+        self.coroutine: bool = ip.iscoroutinefunction(self.func)
+        self.call = contextmanager(self.func) if self.generator else self.func
+        if ip.isasyncgenfunction(self.func):
+            raise TypeError(
+                f"Depend: async generator `{self.func.__name__}` is not supported, "
+                "use a sync generator or an `async def` returning the value"
+            )
+
+    def build(self, kwargs: dict[str, t.Any], scope: DependencyScope) -> t.Any:
+        if self.generator:
+            return scope.enter(self.call(**kwargs))
+        return self.call(**kwargs)
+
+
+def _node_key(depend: Depend) -> t.Any:
+    # request and app values are shared by callable, transient ones are never shared
+    if depend.scope == "transient":
+        return depend
+    return (depend.dependency, depend.scope)
+
+
+class DependencyGraph:
+    """The `Depend` parameters of a view and their sub-dependencies.
+
+    Nodes are grouped into levels: every node only needs values from earlier
+    levels, so the nodes of one level are built concurrently. Cycles and
+    app-scoped dependencies that need request-scoped values are rejected when
+    the graph is compiled, not when a request hits it.
+    """
+
+    __slots__ = ("roots", "nodes", "levels", "outputs", "awaitable", "generation")
+
+    def __init__(self, roots: t.Mapping[str, Depend]) -> None:
+        self.generation: int = Depend.generation
+        self.roots: dict[str, Depend] = dict(roots)
+        self.nodes: tuple[_Node, ...] = self._compile(self.roots.values())
+        self.levels: tuple[tuple[_Node, ...], ...] = self._group(self.nodes)
+        self.outputs: tuple[tuple[str, t.Any], ...] = tuple(
+            (name, _node_key(depend)) for name, depend in self.roots.items()
+        )
+        self.awaitable: bool = any(node.coroutine for node in self.nodes)
+
+    @property
+    def stale(self) -> bool:
+        """whether a `Depend.dependency` was swapped since the graph was compiled"""
+        return self.generation != Depend.generation
+
+    def fresh(self) -> DependencyGraph:
+        """this graph, or a recompiled one if a dependency was swapped"""
+        return DependencyGraph(self.roots) if self.stale else self
+
+    @staticmethod
+    def _compile(roots: t.Iterable[Depend]) -> tuple[_Node, ...]:
+        ordered: dict[t.Any, _Node] = {}
+        path: list[Depend] = []
+
+        def visit(depend: Depend) -> t.Any:
+            key = _node_key(depend)
+            if key in ordered:
+                return key
+            if any(_node_key(seen) == key for seen in path):
+                cycle = " -> ".join(repr(d) for d in (*path, depend))
+                raise ValueError(f"Depend: circular dependency {cycle}")
+
+            path.append(depend)
+            kwargs: list[tuple[str, t.Any]] = []
+            for name, param in ip.signature(depend.dependency).parameters.items():
+                sub = param.default
+                if not isinstance(sub, Depend):
+                    continue
+                if depend.scope == "app" and sub.scope != "app":
+                    raise ValueError(
+                        f"Depend: app-scoped {depend!r} cannot depend on "
+                        f"{sub.scope}-scoped {sub!r}"
+                    )
+                kwargs.append((name, visit(sub)))
+            path.pop()
+
+            ordered[key] = _Node(depend, tuple(kwargs))
+            return key
+
+        for root in roots:
+            visit(root)
+        return tuple(ordered.values())
+
+    @staticmethod
+    def _group(nodes: tuple[_Node, ...]) -> tuple[tuple[_Node, ...], ...]:
+        depth: dict[t.Any, int] = {}
+        levels: list[list[_Node]] = []
+        for node in nodes:  # topological order, sub-dependencies come first
+            level = max((depth[key] + 1 for _, key in node.kwargs), default=0)
+            depth[node.key] = level
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(node)
+        return tuple(tuple(level) for level in levels)
+
+    def resolve(self, request: Request) -> dict[str, t.Any]:
+        """build the graph for `request` and return the root values by name"""
+        if self.awaitable:
+            return current_app.ensure_sync(self.aresolve)(request)
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        workers: int = app.config.get("DEPENDENCY_WORKERS", 8)
+        scopes = (request_scope(request), app_scope(app))
+        values: dict[t.Any, t.Any] = {}
+        for level in self.levels:
+            pending = [node for node in level if not self._cached(node, values, scopes)]
+            if len(pending) > 1 and workers > 0:
+                executor = scopes[1].executor(workers)
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self._build,
+                        node,
+                        values,
+                        scopes,
+                    )
+                    for node in pending
+                ]
+                for node, future in zip(pending, futures):
+                    values[node.key] = future.result()
+            else:
+                for node in pending:
+                    values[node.key] = self._build(node, values, scopes)
+        return {name: values[key] for name, key in self.outputs}
+
+    async def aresolve(self, request: Request) -> dict[str, t.Any]:
+        """:meth:`resolve` for async callers, never blocking the running loop"""
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        workers: int = app.config.get("DEPENDENCY_WORKERS", 8)
+        scopes = (request_scope(request), app_scope(app))
+        executor = scopes[1].executor(workers) if workers > 0 else None
+        loop = asyncio.get_running_loop()
+        values: dict[t.Any, t.Any] = {}
+
+        async def build(node: _Node) -> t.Any:
+            if not node.coroutine:
+                return await loop.run_in_executor(
+                    executor,
+                    contextvars.copy_context().run,
+                    self._build,
+                    node,
+                    values,
+                    scopes,
+                )
+            value = await node.call(**self._kwargs(node, values))
+            return self._store(node, value, scopes)
+
+        for level in self.levels:
+            pending = [node for node in level if not self._cached(node, values, scopes)]
+            results = await asyncio.gather(*(build(node) for node in pending))
+            values.update(zip((node.key for node in pending), results))
+        return {name: values[key] for name, key in self.outputs}
+
+    @staticmethod
+    def _kwargs(node: _Node, values: dict[t.Any, t.Any]) -> dict[str, t.Any]:
+        return {name: values[key] for name, key in node.kwargs}
+
+    @staticmethod
+    def _cached(
+        node: _Node,
+        values: dict[t.Any, t.Any],
+        scopes: tuple[DependencyScope, DependencyScope],
+    ) -> bool:
+        """copy a cached request or app value into `values`, if there is one"""
+        match node.scope:
+            case "request":
+                cache = scopes[0].values
+            case "app":
+                cache = scopes[1].values
+            case _:
+                return False
+        try:
+            values[node.key] = cache[node.key]
+        except KeyError:
+            return False
+        return True
+
+    def _build(
+        self,
+        node: _Node,
+        values: dict[t.Any, t.Any],
+        scopes: tuple[DependencyScope, DependencyScope],
+    ) -> t.Any:
+        req_scope, app_scope_ = scopes
+        if node.scope != "app":
+            value = node.build(self._kwargs(node, values), req_scope)
+            return self._store(node, value, scopes)
+        with app_scope_.key_lock(node.key):
+            # built once even when concurrent first requests race for it,
+            # without waiting for the other app values being built
+            if node.key not in app_scope_.values:
+                value = node.build(self._kwargs(node, values), app_scope_)
+                with app_scope_.lock:
+                    app_scope_.values[node.key] = value
+            return app_scope_.values[node.key]
+
+    @staticmethod
+    def _store(
+        node: _Node, value: t.Any, scopes: tuple[DependencyScope, DependencyScope]
+    ) -> t.Any:
+        match node.scope:
+            case "request":
+                scopes[0].values[node.key] = value
+            case "app":
+                # async app values may race on first use, the first one wins
+                with scopes[1].lock:
+                    value = scopes[1].values.setdefault(node.key, value)
+        return value
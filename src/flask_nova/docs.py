@@ -1,12 +1,95 @@
-from flask import Blueprint, Response, jsonify, render_template_string, url_for
+from __future__ import annotations
 
+from flask import Blueprint, Request, Response, render_template_string, request, url_for
 
-def create_docs_blueprint(app) -> Blueprint:
+from .compression import DEFAULT_ENCODINGS, available_encodings, negotiate
+
+import typing as t
+import threading
+import hashlib
+
+if t.TYPE_CHECKING:
+    from .core import FlaskNova
+
+#: `Cache-Control: max-age` of `/openapi.json`, then clients revalidate with the ETag
+DEFAULT_OPENAPI_MAX_AGE: int = 86400
+
+
+class EncodedDocument:
+    """`/openapi.json` encoded once, with a compressed copy per encoding.
+
+    The bytes and their strong ETag are built on the first request after the
+    route table changed, the compressed variants on the first one with
+    `COMPRESS` on; every other request picks a variant or answers
+    `304 Not Modified`.
+    ```
+    app.config["OPENAPI_MAX_AGE"] = 86400
+    ```
+    """
+
+    def __init__(self, app: FlaskNova) -> None:
+        self.app = app
+        self.version: int | None = None
+        # encoding (`"identity"` for none) -> (body, etag)
+        self.variants: dict[str, tuple[bytes, str]] = {}
+        # whether `variants` holds the compressed copies of this version
+        self.compressed: bool = False
+        self._lock = threading.Lock()
+
+    def _encode(self, compress: bool) -> None:
+        with self._lock:
+            version: int = self.app._openapi_version
+            if version != self.version:
+                encoded = self.app._openapi_encoded
+                if encoded is not None and encoded[0] == version:
+                    # nothing registered since the snapshot was loaded
+                    body: bytes = encoded[1]
+                else:
+                    body = self.app.json.encode(self.app.openapi)  # type: ignore[attr-defined]
+                digest: str = hashlib.blake2b(body, digest_size=16).hexdigest()
+                self.variants = {"identity": (body, digest)}
+                self.compressed, self.version = False, version
+            if compress and not self.compressed:
+                body, digest = self.variants["identity"]
+                variants = dict(self.variants)
+                for name, encoding in available_encodings().items():
+                    compressed = encoding.compress(body, encoding.max_level)
+                    variants[name] = (compressed, f"{digest}-{name}")
+                self.variants, self.compressed = variants, True
+
+    def response(self, request: Request) -> Response:
+        compress: bool = self.app.config.get("COMPRESS", False)
+        if self.version != self.app._openapi_version or (
+            compress and not self.compressed
+        ):
+            self._encode(compress)
+        variants = self.variants
+        encoding: str | None = None
+        if compress:
+            encoding = negotiate(
+                request, (name for name in DEFAULT_ENCODINGS if name in variants)
+            )
+        body, etag = variants[encoding or "identity"]
+
+        response: Response = self.app.response_class(body, mimetype="application/json")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        if compress:
+            response.vary.add("Accept-Encoding")
+        max_age: int = self.app.config.get("OPENAPI_MAX_AGE", DEFAULT_OPENAPI_MAX_AGE)
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        return response.make_conditional(request)
+
+
+def create_docs_blueprint(app: FlaskNova) -> Blueprint:
     docs_bp = Blueprint("docs", __name__)
+    document = EncodedDocument(app)
 
     @docs_bp.get("/openapi.json")
-    def openpai_json() -> Response:
-        return jsonify(app.openapi)
+    def openapi_json() -> Response:
+        return document.response(request)
 
     @docs_bp.get("/docs")
     def swagger_ui() -> str:
@@ -1,15 +1,80 @@
 from __future__ import annotations
 
-from .typed import FileMarker, FormMarker
+from .typed import FileMarker, FormMarker, HeaderMarker
 from .di import Depend
+from .media import binary_media_types
 
+from collections.abc import Generator, Iterable, Iterator
+from datetime import date, datetime, time
 from dataclasses import is_dataclass
+from decimal import Decimal
+from enum import Enum
 from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_jsonable_python
 from uuid import UUID
+import functools as ft
+import warnings
+import types
+import copy
 import inspect as ip
 import typing as t
 import re
 
+_STREAM_ORIGINS: tuple[type, ...] = (Iterator, Iterable, Generator)
+_GENERIC_ORIGINS: tuple[t.Any, ...] = (
+    list,
+    tuple,
+    set,
+    frozenset,
+    dict,
+    t.Union,
+    types.UnionType,
+)
+
+
+_PARAM_SCALARS: tuple[type, ...] = (
+    str,
+    int,
+    float,
+    bool,
+    UUID,
+    Decimal,
+    datetime,
+    date,
+    time,
+)
+_PARAM_SEQUENCES: tuple[type, ...] = (list, tuple, set, frozenset)
+
+
+def _is_param_type(annotation: t.Any) -> bool:
+    """
+    `True` for types read from the path, query string or headers: scalars,
+    enums, `Literal`, optionals and `list[...]` of those, `Annotated` included
+    """
+    origin = t.get_origin(annotation)
+    args = t.get_args(annotation)
+    if origin is t.Annotated:
+        return _is_param_type(args[0])
+    if origin is t.Literal:
+        return True
+    if origin in (t.Union, types.UnionType):
+        return all(arg is type(None) or _is_param_type(arg) for arg in args)
+    if origin in _PARAM_SEQUENCES:
+        return all(_is_param_type(arg) for arg in args if arg is not Ellipsis)
+    return annotation in _PARAM_SCALARS or (
+        isinstance(annotation, type) and issubclass(annotation, Enum)
+    )
+
+
+def _mentions_model(annotation: t.Any) -> bool:
+    """`True` when a pydantic model or dataclass appears anywhere in the type args"""
+    for arg in t.get_args(annotation):
+        if isinstance(arg, type) and (issubclass(arg, BaseModel) or is_dataclass(arg)):
+            return True
+        if t.get_args(arg) and _mentions_model(arg):
+            return True
+    return False
+
 
 class TypeChecker:
     def __init__(self, annotation, default: t.Any | None = None) -> None:
@@ -45,6 +110,32 @@ class TypeChecker:
     def _is_form(self) -> bool:
         return isinstance(self.default, FormMarker)
 
+    def _is_header(self) -> bool:
+        return isinstance(self.default, HeaderMarker)
+
+    def _is_stream(self) -> bool:
+        return t.get_origin(self.annotation) in _STREAM_ORIGINS
+
+    def _is_generic_model(self) -> bool:
+        """`list[Model]`, `tuple[Model, ...]`, `dict[str, Model]`, `Model | None`"""
+        return t.get_origin(self.annotation) in _GENERIC_ORIGINS and _mentions_model(
+            self.annotation
+        )
+
+
+@ft.cache
+def _cached_type_adapter(type_: t.Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def type_adapter(type_: t.Any) -> TypeAdapter:
+    """shared `TypeAdapter` per type, so routes using the same model build it once"""
+    try:
+        return _cached_type_adapter(type_)
+    except TypeError:
+        # unhashable annotations, e.g. `Annotated[..., Field(...)]` metadata
+        return TypeAdapter(type_)
+
 
 def _map_types(
     type_: type | t.Union[t.Any, t.Any],
@@ -97,6 +188,17 @@ def type_builder(
     if type_checker._is_dependency():
         return {"type": "dependency", "default": type_checker.default}
 
+    if type_checker._is_stream():
+        item = (t.get_args(type_checker.annotation) or (t.Any,))[0]
+        return {
+            "type": "stream",
+            "object": item,
+            "item": type_builder(TypeChecker(item)),
+        }
+
+    if type_checker._is_generic_model():
+        return {"type": "generic", "object": type_checker.annotation}
+
     if type_checker._is_file():
         return {"type": "file", "default": type_checker.default}
 
@@ -133,6 +235,147 @@ def type_builder(
         return {"type": "form", "default": type_checker.default}
 
 
+REF_TEMPLATE: str = "#/components/schemas/{model}"
+
+SchemaParts = tuple[dict[str, t.Any], dict[str, t.Any]]
+
+
+def _ref(type_: type) -> dict[str, str]:
+    return {"$ref": REF_TEMPLATE.format(model=type_.__name__)}
+
+
+def _model_schema(type_: t.Any) -> SchemaParts:
+    """
+    `$ref` to `type_` and the definitions of it and its nested models, named
+    by pydantic as in `$defs` (`Page_User_` for `Page[User]`) so that a model
+    used on its own and inside another one is a single component
+    """
+    schema, defs = _json_schema(list[type_])
+    return schema["items"], defs
+
+
+def _json_schema(type_: t.Any) -> SchemaParts:
+    """
+    JSON Schema of `type_` and the definitions of the models it references,
+    generated once per type however many routes mention it
+    """
+    try:
+        return _cached_json_schema(type_)
+    except TypeError:
+        # unhashable annotations, e.g. `Annotated[..., Field(...)]` metadata
+        return _split_defs(type_adapter(type_).json_schema(ref_template=REF_TEMPLATE))
+
+
+@ft.cache
+def _cached_json_schema(type_: t.Any) -> SchemaParts:
+    return _split_defs(type_adapter(type_).json_schema(ref_template=REF_TEMPLATE))
+
+
+def _split_defs(schema: dict[str, t.Any]) -> SchemaParts:
+    defs: dict[str, t.Any] = schema.pop("$defs", {})
+    return schema, defs
+
+
+@ft.cache
+def _custom_schema(type_: type) -> SchemaParts:
+    """:func:`_gen_schema` of a `to_dict` class, generated once per class"""
+    return _gen_schema(type_), {}
+
+
+def _add_components(target: dict[str, t.Any], schemas: dict[str, t.Any]) -> None:
+    """
+    copy `schemas` into the `components/schemas` of `target`, warning when
+    two different models share a name instead of replacing one with the other
+    """
+    for name, schema in schemas.items():
+        existing = target.get(name)
+        if existing is None:
+            # the cached schemas are shared, the document gets its own copy
+            target[name] = copy.deepcopy(schema)
+        elif existing != schema:
+            warnings.warn(
+                f"two different models are named {name!r} in components/schemas, "
+                "the first one is documented; rename one of them",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+
+def _component(
+    type_: type,
+    route_schemas: dict[str, t.Any],
+    generate: t.Callable[[t.Any], SchemaParts] = _model_schema,
+) -> dict[str, str]:
+    """
+    register `type_` and the models nested in it as shared
+    `components/schemas` and return the `$ref` to it
+    """
+    schema, defs = generate(type_)
+    if "$ref" in schema:
+        # `_model_schema`: `type_` is one of `defs` already
+        ref = schema
+    else:
+        ref = _ref(type_)
+        defs = {**defs, type_.__name__: schema}
+    _add_components(route_schemas, defs)
+    return ref
+
+
+def _generic_schema(
+    annotation: t.Any, route_schemas: dict[str, t.Any]
+) -> dict[str, t.Any]:
+    """
+    schema of `list[...]`, `dict[str, ...]` and friends as arrays and maps,
+    with the models they mention hoisted into the shared components
+    """
+    schema, defs = _json_schema(annotation)
+    _add_components(route_schemas, defs)
+    # the cached schema is shared, callers may add keys such as `default`
+    return copy.deepcopy(schema)
+
+
+def _parameter(
+    name: str, obj: dict[str, t.Any], route_schemas: dict[str, t.Any]
+) -> dict[str, t.Any]:
+    """openapi parameter of a path, query or header field of the route"""
+    default: t.Any = obj.get("default", ...)
+    schema = _generic_schema(obj.get("annotation", obj["object"]), route_schemas)
+    required: bool = obj["type"] == "path" or default is ...
+    if not required and default is not None:
+        schema.setdefault("default", to_jsonable_python(default))
+    parameter: dict[str, t.Any] = {
+        "name": obj.get("alias") or name,
+        "in": obj["type"],
+        "required": required,
+        "schema": schema,
+    }
+    if obj["type"] == "query":
+        parameter["style"] = "form"
+        parameter["explode"] = True
+    elif obj["type"] == "path":
+        parameter["style"] = "simple"
+    return parameter
+
+
+def _with_binary_media(content: dict[str, t.Any]) -> dict[str, t.Any]:
+    """JSON bodies are also accepted and served as every installed binary codec"""
+    if "application/json" in content:
+        for mimetype in binary_media_types():
+            content[mimetype] = content["application/json"]
+    return content
+
+
+def _success_response(schema: dict[str, t.Any], streamed: bool) -> dict[str, t.Any]:
+    if streamed:
+        content = {
+            "application/json": {"schema": {"type": "array", "items": schema}},
+            "application/x-ndjson": {"schema": schema},
+        }
+    else:
+        content = _with_binary_media({"application/json": {"schema": schema}})
+    return {"200": {"description": "Successful Response", "content": content}}
+
+
 def __openapi__(open_api_meta: dict[str, t.Any]) -> dict[str, t.Any]:
 
     route_spec: dict[str, t.Any] = {}
@@ -150,94 +393,40 @@ def __openapi__(open_api_meta: dict[str, t.Any]) -> dict[str, t.Any]:
         if req:
             for param, obj in req.items():
                 match obj["type"]:
-                    case "query":
-                        parameters.append(
-                            {
-                                "name": param,
-                                "in": "query",
-                                "required": True,
-                                "style": "form",
-                                "schema": _map_types(obj["object"]),
-                                "uniqueItems": True,
-                            }
-                        )
-                    case "path":
-                        parameters.append(
-                            {
-                                "name": param,
-                                "in": "path",
-                                "required": True,
-                                "style": "simple",
-                                "schema": _map_types(obj["object"]),
-                            }
-                        )
-                    case "basemodel":
-                        properties = obj["object"].model_json_schema(
-                            ref_template="#/components/schemas/{model}"
-                        )
-                        route_schemas[obj["object"].__name__] = properties
+                    case "query" | "path" | "header":
+                        parameters.append(_parameter(param, obj, route_schemas))
+                    case "basemodel" | "dataclass":
                         request_body["content"] = {
                             "application/json": {
-                                "schema": {
-                                    "$ref": f"#/components/schemas/{obj["object"].__name__}"
-                                }
+                                "schema": _component(obj["object"], route_schemas)
                             }
                         }
-                    case "dataclass":
-                        properties = TypeAdapter(obj["object"]).json_schema(
-                            ref_template="#/components/schemas/{model}"
-                        )
-                        route_schemas[obj["object"].__name__] = properties
+                    case "generic":
                         request_body["content"] = {
                             "application/json": {
-                                "schema": {
-                                    "$ref": f"#/components/schemas/{obj["object"].__name__}"
-                                }
+                                "schema": _generic_schema(obj["object"], route_schemas)
                             }
                         }
                     case "customclass":
-                        properties = _gen_schema(obj["object"])
-                        route_schemas[obj["object"].__name__] = properties
                         request_body["content"] = {
                             "application/json": {
-                                "schema": {
-                                    "$ref": f"#/components/schemas/{obj["object"].__name__}"
-                                }
-                            }
-                        }
-                    case "basemodelform":
-                        properties = obj["object"].model_json_schema(
-                            ref_template="#/components/schemas/{model}"
-                        )
-                        route_schemas[obj["object"].__name__] = properties
-
-                        request_body["content"] = {
-                            "application/x-www-form-urlencoded": {
-                                "schema": {
-                                    "$ref": f"#/components/schemas/{obj["object"].__name__}"
-                                }
+                                "schema": _component(
+                                    obj["object"], route_schemas, _custom_schema
+                                )
                             }
                         }
-                    case "dataclassform":
-                        properties = TypeAdapter(obj["object"]).json_schema(
-                            ref_template="#/components/schemas/{model}"
-                        )
-                        route_schemas[obj["object"].__name__] = properties
+                    case "basemodelform" | "dataclassform":
                         request_body["content"] = {
                             "application/x-www-form-urlencoded": {
-                                "schema": {
-                                    "$ref": f"#/components/schemas/{obj["object"].__name__}"
-                                }
+                                "schema": _component(obj["object"], route_schemas)
                             }
                         }
                     case "customclassform":
-                        properties = _gen_schema(obj["object"])
-                        route_schemas[obj["object"].__name__] = properties
                         request_body["content"] = {
                             "application/x-www-form-urlencoded": {
-                                "schema": {
-                                    "$ref": f"#/components/schemas/{obj["object"].__name__}"
-                                }
+                                "schema": _component(
+                                    obj["object"], route_schemas, _custom_schema
+                                )
                             }
                         }
                     case "file":
@@ -256,22 +445,21 @@ def __openapi__(open_api_meta: dict[str, t.Any]) -> dict[str, t.Any]:
                                 }
                             }
                         }
+        response_schema: dict[str, t.Any] | None = None
+        streamed: bool = bool(res and res["type"] == "stream")
+        if streamed:
+            # streamed responses document the model of a single item
+            res = res["item"]
         if res:
             match res["type"]:
-                case "basemodel":
-                    properties = res["object"].model_json_schema(
-                        ref_template="#/components/schemas/{model}"
-                    )
-                    route_schemas[res["object"].__name__] = properties
-                case "dataclass":
-                    properties = TypeAdapter(res["object"]).json_schema(
-                        ref_template="#/components/schemas/{model}"
-                    )
-                    route_schemas[res["object"].__name__] = properties
-
+                case "basemodel" | "dataclass":
+                    response_schema = _component(res["object"], route_schemas)
                 case "customclass":
-                    properties = _gen_schema(res["object"])
-                    route_schemas[res["object"].__name__] = properties
+                    response_schema = _component(
+                        res["object"], route_schemas, _custom_schema
+                    )
+                case "generic":
+                    response_schema = _generic_schema(res["object"], route_schemas)
         if method:
             path_key: str = re.sub(r"<(?:[^:<>]+:)?([^<>]+)>", r"{\1}", rule)
             route_spec["paths"] = {path_key: {}}
@@ -280,11 +468,16 @@ def __openapi__(open_api_meta: dict[str, t.Any]) -> dict[str, t.Any]:
             if parameters:
                 route_spec["paths"][path_key][method.lower()]["parameters"] = parameters
             if request_body:
+                _with_binary_media(request_body["content"])
                 request_body["required"] = True
                 route_spec["paths"][path_key][method.lower()][
                     "requestBody"
                 ] = request_body
+            if response_schema and not meta_obj.get("responses"):
+                route_spec["paths"][path_key][method.lower()]["responses"] = (
+                    _success_response(response_schema, streamed)
+                )
         if route_schemas:
-            route_spec["components"] = route_schemas
+            route_spec["components"] = {"schemas": route_schemas}
 
     return route_spec
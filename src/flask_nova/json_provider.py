@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import typing as t
+import warnings
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel
+
+
+def _default(o: t.Any) -> t.Any:
+    """fallback hook for values a codec cannot encode natively"""
+    if isinstance(o, BaseModel):
+        return o.model_dump(mode="json")
+    if isinstance(o, (datetime, time)):
+        # UTC as `Z`, matching orjson, msgspec and pydantic
+        value: str = o.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, (Decimal, UUID)):
+        return str(o)
+    if is_dataclass(o) and not isinstance(o, type):
+        return asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """Encode/decode pair behind :class:`NovaJSONProvider`.
+
+    Every codec writes UUID, datetime, Decimal and dataclass values the same
+    way, and sorts the keys of dicts when `sort_keys` is set, so switching
+    `JSON_PROVIDER` never changes the wire format.
+    """
+
+    name: str = "json"
+
+    def __init__(self, sort_keys: bool = False) -> None:
+        self.sort_keys = sort_keys
+
+    def encode(self, obj: t.Any, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(
+                obj, default=_default, indent=2, sort_keys=self.sort_keys
+            ).encode()
+        return json.dumps(
+            obj, default=_default, separators=(",", ":"), sort_keys=self.sort_keys
+        ).encode()
+
+    def decode(self, data: str | bytes) -> t.Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self, sort_keys: bool = False) -> None:
+        import orjson
+
+        super().__init__(sort_keys)
+        self._orjson = orjson
+        self._option: int = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if sort_keys:
+            self._option |= orjson.OPT_SORT_KEYS
+
+    def encode(self, obj: t.Any, indent: bool = False) -> bytes:
+        option = self._option | self._orjson.OPT_INDENT_2 if indent else self._option
+        return self._orjson.dumps(obj, default=_default, option=option)
+
+    def decode(self, data: str | bytes) -> t.Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self, sort_keys: bool = False) -> None:
+        import msgspec
+
+        super().__init__(sort_keys)
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder(
+            enc_hook=_default,
+            decimal_format="string",
+            order="sorted" if sort_keys else None,
+        )
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, obj: t.Any, indent: bool = False) -> bytes:
+        data: bytes = self._encoder.encode(obj)
+        if indent:
+            return self._msgspec.json.format(data, indent=2)
+        return data
+
+    def decode(self, data: str | bytes) -> t.Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            # keep `request.get_json` turning bad input into `400 Bad Request`
+            raise ValueError(str(e)) from e
+
+
+CODECS: dict[str, type[JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+
+def get_codec(name: str = "auto", sort_keys: bool = False) -> JSONCodec:
+    """Return the codec registered under `name`.
+
+    `"auto"` picks the fastest installed adapter. A named adapter that is not
+    installed falls back to the stdlib `json` codec with a warning.
+    """
+    if name == "auto":
+        for codec in (OrjsonCodec, MsgspecCodec):
+            try:
+                return codec(sort_keys)
+            except ImportError:
+                continue
+        return JSONCodec(sort_keys)
+
+    if name not in CODECS:
+        raise ValueError(
+            f"JSON_PROVIDER must be one of {['auto', *CODECS]}, got {name!r}"
+        )
+    try:
+        return CODECS[name](sort_keys)
+    except ImportError:
+        warnings.warn(
+            f"JSON_PROVIDER={name!r} is not installed, falling back to stdlib json",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return JSONCodec(sort_keys)
+
+
+class NovaJSONProvider(DefaultJSONProvider):
+    """`app.json` for FlaskNova, backed by the codec named in `JSON_PROVIDER`.
+
+    Everything that goes through `jsonify`, `request.get_json` or `app.json`
+    (responses, problem details, `/openapi.json`, the JSON logger) uses the
+    same codec. Keys are sorted like Flask's provider does; response models
+    compiled by a route keep their field order either way.
+    ```
+    app.config["JSON_PROVIDER"] = "orjson"  # "msgspec", "json" or "auto"
+    app.json.sort_keys = False  # insertion order, skips the sort
+    ```
+    """
+
+    def __init__(self, app) -> None:
+        super().__init__(app)
+        # `(config value, sort_keys, codec)` swapped in one assignment, safe
+        # across threads
+        self._resolved: tuple[str | None, bool, JSONCodec] = (None, False, JSONCodec())
+
+    @property
+    def codec(self) -> JSONCodec:
+        name: str = self._app.config.get("JSON_PROVIDER", "auto")
+        resolved_name, sort_keys, codec = self._resolved
+        if name != resolved_name or self.sort_keys != sort_keys:
+            codec = get_codec(name, self.sort_keys)
+            self._resolved = (name, self.sort_keys, codec)
+        return codec
+
+    def encode(self, obj: t.Any) -> bytes:
+        """serialize `obj` straight to UTF-8 bytes"""
+        return self.codec.encode(obj)
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        if kwargs:
+            kwargs.setdefault("default", _default)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self.codec.encode(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: t.Any) -> t.Any:
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return self.codec.decode(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent: bool = (
+            self.compact is None and self._app.debug
+        ) or self.compact is False
+        return self._app.response_class(
+            self.codec.encode(obj, indent=indent), mimetype=self.mimetype
+        )
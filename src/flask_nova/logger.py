@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from flask import request, g, Flask
+from flask import request, g, Flask, current_app, has_app_context
+import functools as ft
 import typing as t
 import logging
 import time
@@ -55,7 +56,10 @@ class AnsiColorJsonFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        message = json.dumps(log_data)
+        if has_app_context():
+            message: str = current_app.json.dumps(log_data)
+        else:
+            message = json.dumps(log_data)
         return f"{color}{message}{self.RESET_CODE}"
 
     def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
@@ -64,8 +68,12 @@ class AnsiColorJsonFormatter(logging.Formatter):
         return f"{t}.{int(record.msecs):03d}Z"
 
 
-_handler = logging.StreamHandler(_error_stream())
-_handler.setFormatter(AnsiColorJsonFormatter())
+@ft.cache
+def _handler() -> logging.Handler:
+    # created with the first app logger, not when the package is imported
+    handler = logging.StreamHandler(_error_stream())
+    handler.setFormatter(AnsiColorJsonFormatter())
+    return handler
 
 
 def json_logger(app: Flask) -> logging.Logger:
@@ -86,7 +94,7 @@ def json_logger(app: Flask) -> logging.Logger:
         logger.setLevel(logging.DEBUG)
 
     if not _level_handler(logger):
-        logger.addHandler(_handler)
+        logger.addHandler(_handler())
 
     return logger
 
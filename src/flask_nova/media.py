@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import functools as ft
+import typing as t
+from abc import ABC, abstractmethod
+
+from .json_provider import _default
+
+
+class BinaryCodec(ABC):
+    """Encode/decode pair for a binary body format negotiated next to JSON.
+
+    Request bodies in :attr:`mimetype` (or one of its :attr:`aliases`) are
+    decoded and validated like JSON ones; responses are encoded when the
+    `Accept` header prefers it. `decode` raises `ValueError` on bad input.
+    """
+
+    name: str
+    mimetype: str
+    aliases: tuple[str, ...] = ()
+
+    @abstractmethod
+    def encode(self, obj: t.Any) -> bytes: ...
+
+    @abstractmethod
+    def decode(self, data: bytes) -> t.Any: ...
+
+
+class MsgpackCodec(BinaryCodec):
+    name = "msgpack"
+    mimetype = "application/msgpack"
+    aliases = ("application/x-msgpack", "application/vnd.msgpack")
+
+    def __init__(self) -> None:
+        import msgpack
+
+        self._msgpack = msgpack
+        self._packer = ft.partial(msgpack.packb, default=_default, use_bin_type=True)
+
+    def encode(self, obj: t.Any) -> bytes:
+        return self._packer(obj)
+
+    def decode(self, data: bytes) -> t.Any:
+        try:
+            return self._msgpack.unpackb(data, raw=False)
+        except (ValueError, self._msgpack.UnpackException) as e:
+            raise ValueError(str(e)) from e
+
+
+class CborCodec(BinaryCodec):
+    name = "cbor"
+    mimetype = "application/cbor"
+
+    def __init__(self) -> None:
+        import cbor2
+
+        self._cbor2 = cbor2
+
+    def encode(self, obj: t.Any) -> bytes:
+        return self._cbor2.dumps(
+            obj, default=lambda encoder, o: encoder.encode(_default(o))
+        )
+
+    def decode(self, data: bytes) -> t.Any:
+        try:
+            return self._cbor2.loads(data)
+        except self._cbor2.CBORDecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+BINARY_CODECS: dict[str, type[BinaryCodec]] = {
+    "msgpack": MsgpackCodec,
+    "cbor": CborCodec,
+}
+
+
+@ft.cache
+def binary_codecs() -> dict[str, BinaryCodec]:
+    """installed codecs by mimetype, aliases included; install `flasknova[msgpack]`
+    or `flasknova[cbor]` to enable them"""
+    codecs: dict[str, BinaryCodec] = {}
+    for codec_class in BINARY_CODECS.values():
+        try:
+            codec = codec_class()
+        except ImportError:
+            continue
+        for mimetype in (codec.mimetype, *codec.aliases):
+            codecs[mimetype] = codec
+    return codecs
+
+
+def binary_media_types() -> tuple[str, ...]:
+    """canonical mimetype of every installed codec, for the OpenAPI document"""
+    return tuple(dict.fromkeys(codec.mimetype for codec in binary_codecs().values()))
@@ -0,0 +1,533 @@
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import typing as t
+import weakref
+from bisect import bisect_left
+from collections.abc import Iterator
+
+from flask import Blueprint, Flask, Request, Response
+
+if t.TYPE_CHECKING:
+    from .core import FlaskNova
+
+#: upper bounds of the latency histograms, in seconds
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+#: upper bounds of the body size histograms, in bytes
+DEFAULT_SIZE_BUCKETS: tuple[float, ...] = (
+    100.0,
+    1_000.0,
+    10_000.0,
+    100_000.0,
+    1_000_000.0,
+    10_000_000.0,
+)
+#: seconds between two writes of a worker's series to `METRICS_DIR`
+DEFAULT_FLUSH_INTERVAL: float = 1.0
+#: path of the exposition endpoint unless `METRICS_PATH` is set
+DEFAULT_METRICS_PATH: str = "/metrics"
+#: endpoint of the exposition view, left out of the OpenAPI document
+METRICS_ENDPOINT: str = "nova_metrics.metrics"
+#: Prometheus text exposition format
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+# any other method is counted as `OTHER`, clients cannot grow the label set
+_METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT")
+)
+# route label of requests no rule matched (404, 405)
+_UNMATCHED = "<unmatched>"
+_WORKER_FILE = re.compile(r"metrics-(\d+)\.db")
+
+# file header: bytes used; each entry: key length, value count, JSON key padded
+# to 8 bytes, then the values as doubles
+_HEADER = struct.Struct("<I4x")
+_ENTRY = struct.Struct("<II")
+_INITIAL_SIZE = 1 << 16
+
+# `(metric name, label values)` of a series
+SeriesKey = tuple[str, tuple[str, ...]]
+
+
+class Metric(t.NamedTuple):
+    name: str
+    kind: t.Literal["counter", "gauge", "histogram"]
+    help: str
+    labels: tuple[str, ...] = ()
+    buckets: tuple[float, ...] = ()
+
+    @property
+    def size(self) -> int:
+        # histograms: a count per bucket, one for `+Inf`, then the sum
+        return len(self.buckets) + 2 if self.kind == "histogram" else 1
+
+
+REQUESTS = Metric(
+    "nova_requests_total",
+    "counter",
+    "Requests answered, by route template, method and status.",
+    ("route", "method", "status"),
+)
+IN_FLIGHT = Metric("nova_requests_in_flight", "gauge", "Requests being handled.", ())
+REQUEST_DURATION = Metric(
+    "nova_request_duration_seconds",
+    "histogram",
+    "Time from the first request hook to teardown.",
+    ("route", "method"),
+    DEFAULT_LATENCY_BUCKETS,
+)
+STAGE_DURATION = Metric(
+    "nova_stage_duration_seconds",
+    "histogram",
+    "Time spent in each stage: bind, dependencies, handler, serialize.",
+    ("route", "method", "stage"),
+    DEFAULT_LATENCY_BUCKETS,
+)
+REQUEST_SIZE = Metric(
+    "nova_request_size_bytes",
+    "histogram",
+    "Request bodies announced by Content-Length.",
+    ("route", "method"),
+    DEFAULT_SIZE_BUCKETS,
+)
+RESPONSE_SIZE = Metric(
+    "nova_response_size_bytes",
+    "histogram",
+    "Response bodies with a known length, as sent.",
+    ("route", "method"),
+    DEFAULT_SIZE_BUCKETS,
+)
+#: every metric of `app.metrics`, in exposition order
+METRICS: dict[str, Metric] = {
+    metric.name: metric
+    for metric in (
+        REQUESTS,
+        IN_FLIGHT,
+        REQUEST_DURATION,
+        STAGE_DURATION,
+        REQUEST_SIZE,
+        RESPONSE_SIZE,
+    )
+}
+
+# live `Metrics` instances, reset in forked workers
+_INSTANCES: weakref.WeakSet[Metrics] = weakref.WeakSet()
+
+
+def _add(
+    totals: dict[SeriesKey, list[float]], key: SeriesKey, values: list[float]
+) -> None:
+    total = totals.get(key)
+    if total is None:
+        totals[key] = list(values)
+    else:
+        for i, value in enumerate(values):
+            total[i] += value
+
+
+def _route_labels(request: Request) -> tuple[str, str]:
+    """route template and method of `request`, bounded whatever the client sends"""
+    rule = request.url_rule
+    method = request.method if request.method in _METHODS else "OTHER"
+    return (rule.rule if rule is not None else _UNMATCHED), method
+
+
+def _alive(pid: int) -> bool:
+    if os.name == "nt":
+        # signal 0 terminates the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _Shards:
+    """Series of every thread, each shard written by its own thread only.
+
+    Recording takes no lock: a thread adds to the lists of its own shard, the
+    lock only guards the list of shards when a thread records its first value.
+    The shards of exited threads are folded into one retired total then, so
+    thread-per-request servers do not grow a shard per request. Collecting
+    sums copies of every shard.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: list[tuple[threading.Thread, dict[SeriesKey, list[float]]]] = []
+        # series of the threads that exited, only changed under the lock
+        self._retired: dict[SeriesKey, list[float]] = {}
+
+    def series(self, metric: Metric, labels: tuple[str, ...]) -> list[float]:
+        try:
+            shard: dict[SeriesKey, list[float]] = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire()
+                self._shards.append((threading.current_thread(), shard))
+        key = (metric.name, labels)
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = [0.0] * metric.size
+        return series
+
+    def _retire(self) -> None:
+        """fold the shards of exited threads into `_retired`, under the lock"""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                for key, series in shard.items():
+                    _add(self._retired, key, series)
+        self._shards = live
+
+    def collect(self) -> dict[SeriesKey, list[float]]:
+        with self._lock:
+            self._retire()
+            shards = [shard for _, shard in self._shards]
+            totals: dict[SeriesKey, list[float]] = {
+                key: list(series) for key, series in self._retired.items()
+            }
+        for shard in shards:
+            for key, series in shard.copy().items():
+                _add(totals, key, series)
+        return totals
+
+    def reset(self) -> None:
+        # only the forking thread runs in the child
+        self._lock = threading.Lock()
+        self._retired = {}
+        current = threading.current_thread()
+        self._shards = [
+            (thread, shard) for thread, shard in self._shards if thread is current
+        ]
+        for _, shard in self._shards:
+            shard.clear()
+
+
+class MmapFile:
+    """Series of one worker in `METRICS_DIR`, written by it and read by any worker.
+
+    Known series are updated in place; new ones are written after the last
+    entry before the header counts them, so readers never see half an entry.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.pid = os.getpid()
+        # a file left by a dead process with the same pid is started over
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._file = os.fdopen(fd, "r+b")
+        self._file.truncate(_INITIAL_SIZE)
+        self._map = mmap.mmap(fd, _INITIAL_SIZE)
+        self._used = _HEADER.size
+        _HEADER.pack_into(self._map, 0, self._used)
+        # offset of the values of each series
+        self._offsets: dict[SeriesKey, int] = {}
+
+    def write(self, series: dict[SeriesKey, list[float]]) -> None:
+        for key, values in series.items():
+            offset = self._offsets.get(key)
+            if offset is None:
+                self._append(key, values)
+            else:
+                struct.pack_into(f"<{len(values)}d", self._map, offset, *values)
+
+    def _append(self, key: SeriesKey, values: list[float]) -> None:
+        data = json.dumps(key).encode()
+        padding = -(_ENTRY.size + len(data)) % 8
+        start = self._used
+        offset = start + _ENTRY.size + len(data) + padding
+        end = offset + 8 * len(values)
+        if end > len(self._map):
+            self._grow(end)
+        _ENTRY.pack_into(self._map, start, len(data), len(values))
+        self._map[start + _ENTRY.size : start + _ENTRY.size + len(data)] = data
+        struct.pack_into(f"<{len(values)}d", self._map, offset, *values)
+        self._used = end
+        _HEADER.pack_into(self._map, 0, end)
+        self._offsets[key] = offset
+
+    def _grow(self, needed: int) -> None:
+        size = len(self._map)
+        while size < needed:
+            size *= 2
+        self._file.truncate(size)
+        self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    @staticmethod
+    def read(path: str) -> Iterator[tuple[SeriesKey, list[float]]]:
+        """the series written to the file at `path`"""
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < _HEADER.size:
+            return
+        used = min(_HEADER.unpack_from(data)[0], len(data))
+        start = _HEADER.size
+        while start + _ENTRY.size <= used:
+            length, count = _ENTRY.unpack_from(data, start)
+            key_at = start + _ENTRY.size
+            offset = key_at + length + (-(_ENTRY.size + length) % 8)
+            name, labels = json.loads(data[key_at : key_at + length])
+            values = list(struct.unpack_from(f"<{count}d", data, offset))
+            yield (name, tuple(labels)), values
+            start = offset + 8 * count
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render(series: dict[SeriesKey, list[float]]) -> str:
+    """Prometheus text exposition of collected series"""
+    by_metric: dict[str, list[tuple[tuple[str, ...], list[float]]]] = {}
+    for (name, labels), values in series.items():
+        by_metric.setdefault(name, []).append((labels, values))
+
+    lines: list[str] = []
+    for metric in METRICS.values():
+        name = metric.name
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        rows = sorted(by_metric.get(name, ()), key=lambda row: row[0])
+        if metric.kind != "histogram":
+            if not rows and not metric.labels:
+                rows = [((), [0.0])]
+            for labels, values in rows:
+                lines.append(
+                    f"{name}{_label_text(metric.labels, labels)} {_number(values[0])}"
+                )
+            continue
+        for labels, values in rows:
+            count = 0.0
+            for bound, bucket in zip((*metric.buckets, math.inf), values):
+                count += bucket
+                le = "+Inf" if bound == math.inf else repr(bound)
+                text = _label_text((*metric.labels, "le"), (*labels, le))
+                lines.append(f"{name}_bucket{text} {_number(count)}")
+            text = _label_text(metric.labels, labels)
+            lines.append(f"{name}_sum{text} {_number(values[-1])}")
+            lines.append(f"{name}_count{text} {_number(count)}")
+    return "\n".join(lines) + "\n"
+
+
+class Metrics:
+    """Prometheus metrics of a :class:`FlaskNova` app, as `app.metrics`.
+
+    Off by default. Once on, every request counts towards its route template
+    (`/items/<int:item_id>`): requests by status, requests in flight, request
+    and response sizes, total latency and the latency of each stage (`bind`,
+    `dependencies`, `handler`, `serialize`), served as text at `METRICS_PATH`.
+    ```
+    app.config["METRICS"] = True
+    app.config["METRICS_PATH"] = "/metrics"
+    app.config["METRICS_DIR"] = "/run/nova-metrics"  # pre-fork servers, see below
+    app.config["METRICS_FLUSH_INTERVAL"] = 1.0
+    ```
+    The endpoint is added with the first request (or :meth:`FlaskNova.warmup`)
+    when `METRICS` is on by then, after the app's own routes, so a route of
+    the app on the same path takes precedence.
+
+    Each process only sees its own requests. With `METRICS_DIR`, every worker
+    writes its series to `metrics-<pid>.db` there and `/metrics` sums the
+    files of all workers, so any of them answers for the whole server. Empty
+    the directory when the server starts; the in-flight gauge of exited
+    workers is left out, their counters are kept.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._shards = _Shards()
+        self._file: MmapFile | None = None
+        self._flusher: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._pid: int | None = None
+        self._registered: bool = False
+        self._lock = threading.Lock()
+        _INSTANCES.add(self)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.app.config.get("METRICS", False))
+
+    @property
+    def directory(self) -> str | None:
+        return self.app.config.get("METRICS_DIR")
+
+    def inc(
+        self, metric: Metric, labels: tuple[str, ...] = (), value: float = 1.0
+    ) -> None:
+        self._shards.series(metric, labels)[0] += value
+
+    def observe(self, metric: Metric, labels: tuple[str, ...], value: float) -> None:
+        series = self._shards.series(metric, labels)
+        series[bisect_left(metric.buckets, value)] += 1
+        series[-1] += value
+
+    def start(self, request: Request) -> None:
+        """count `request` in flight and start timing its stages"""
+        if self.directory and self._pid != os.getpid():
+            self._start_flusher()
+        request.metrics_started = time.perf_counter()  # type: ignore[attr-defined]
+        request.stage_durations = {}  # type: ignore[attr-defined]
+        self.inc(IN_FLIGHT)
+        size = request.content_length
+        if size is not None:
+            self.observe(REQUEST_SIZE, _route_labels(request), size)
+
+    def respond(self, request: Request, response: Response) -> None:
+        route, method = _route_labels(request)
+        self.inc(REQUESTS, (route, method, str(response.status_code)))
+        size = response.content_length
+        if size is not None:
+            self.observe(RESPONSE_SIZE, (route, method), size)
+
+    def finish(self, request: Request) -> None:
+        started: float | None = getattr(request, "metrics_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        self.inc(IN_FLIGHT, (), -1.0)
+        labels = _route_labels(request)
+        self.observe(REQUEST_DURATION, labels, duration)
+        stages: dict[str, float] = getattr(request, "stage_durations", None) or {}
+        for stage, seconds in stages.items():
+            self.observe(STAGE_DURATION, (*labels, stage), seconds)
+
+    def collect(self) -> dict[SeriesKey, list[float]]:
+        """series of this process, or of every worker writing to `METRICS_DIR`"""
+        directory = self.directory
+        if not directory:
+            return self._shards.collect()
+        self.flush()
+        totals: dict[SeriesKey, list[float]] = {}
+        for name in os.listdir(directory):
+            match = _WORKER_FILE.fullmatch(name)
+            if match is None:
+                continue
+            pid = int(match.group(1))
+            alive = pid == os.getpid() or _alive(pid)
+            try:
+                entries = list(MmapFile.read(os.path.join(directory, name)))
+            except OSError:
+                continue
+            for key, values in entries:
+                metric = METRICS.get(key[0])
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                _add(totals, key, values)
+        return totals
+
+    def render(self) -> str:
+        return render(self.collect())
+
+    def flush(self) -> None:
+        """write this process's series to its file in `METRICS_DIR`"""
+        directory = self.directory
+        if not directory:
+            return
+        with self._lock:
+            if self._file is None or self._file.pid != os.getpid():
+                path = os.path.join(directory, f"metrics-{os.getpid()}.db")
+                self._file = MmapFile(path)
+            self._file.write(self._shards.collect())
+
+    def _start_flusher(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # a forked worker inherits neither the thread nor the parent's series
+            self._stop = threading.Event()
+            self._flusher = threading.Thread(
+                target=self._run, args=(self._stop,), name="nova-metrics", daemon=True
+            )
+            self._flusher.start()
+            if not self._registered:
+                atexit.register(self.shutdown)
+                self._registered = True
+            self._pid = os.getpid()
+
+    def _run(self, stop: threading.Event) -> None:
+        interval: float = self.app.config.get(
+            "METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL
+        )
+        while not stop.wait(interval):
+            self.flush()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """stop the flusher thread after a last write, the next request restarts it"""
+        with self._lock:
+            flusher, self._flusher, self._pid = self._flusher, None, None
+            self._stop.set()
+        if flusher is not None and flusher.is_alive():
+            flusher.join(timeout)
+        self.flush()
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._shards.reset()
+        self._flusher, self._pid = None, None
+
+
+def _reset_after_fork() -> None:
+    for metrics in list(_INSTANCES):
+        metrics._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def create_metrics_blueprint(app: FlaskNova) -> Blueprint:
+    metrics_bp = Blueprint("nova_metrics", __name__)
+
+    @metrics_bp.get(app.config.get("METRICS_PATH", DEFAULT_METRICS_PATH))
+    def metrics() -> Response:
+        return Response(app.metrics.render(), content_type=CONTENT_TYPE)
+
+    return metrics_bp
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import typing as t
+import hashlib
 from .typed import (
     Guard,
     Decorated,
     FileMarker,
     FormMarker,
+    HeaderMarker,
     FuncType,
 )
 
@@ -26,5 +28,36 @@ def Form(type_: type | None = None) -> t.Any:
     return FormMarker(type_)
 
 
-def File(name: str, multiple: bool = False) -> t.Any:
-    return FileMarker(name, multiple)
+def File(
+    name: str,
+    multiple: bool = False,
+    max_size: int | None = None,
+    spool_threshold: int | None = None,
+    allowed_types: t.Iterable[str] | None = None,
+    dest_dir: str | None = None,
+    checksum: str | None = None,
+) -> t.Any:
+    """
+    bind the uploaded file(s) of form field `name`, streamed by the parser
+
+    Args:
+        max_size: bytes per file, crossing it stops the upload with `413`.
+        spool_threshold: bytes kept in memory before spooling to disk.
+        allowed_types: accepted mimetypes, `"image/*"` style wildcards allowed.
+        dest_dir: directory for the spooled temporary files.
+        checksum: `hashlib` algorithm computed while the file is written,
+            read back from `upload.stream.checksum`.
+    """
+    if checksum is not None:
+        hashlib.new(checksum)  # unknown algorithms fail at registration
+    return FileMarker(
+        name, multiple, max_size, spool_threshold, allowed_types, dest_dir, checksum
+    )
+
+
+def Header(alias: str | None = None, default: t.Any = ...) -> t.Any:
+    """
+    read a parameter from a request header, `x_token` from `x-token` unless
+    `alias` names the header
+    """
+    return HeaderMarker(alias, default)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import typing as t
+
+from flask import Request
+from pydantic import Field, ValidationError
+
+from .binder import Binder
+from .helpers import type_adapter
+
+Source = t.Literal["path", "query", "header"]
+PARAM_KINDS: frozenset[str] = frozenset(t.get_args(Source))
+
+
+def is_sequence(annotation: t.Any) -> bool:
+    """`list[int]`, `set[str] | None`... read with `getlist` from the request"""
+    origin = t.get_origin(annotation)
+    if origin is t.Annotated:
+        return is_sequence(t.get_args(annotation)[0])
+    if origin in (list, set, frozenset, tuple):
+        return True
+    return any(is_sequence(arg) for arg in t.get_args(annotation) if t.get_args(arg))
+
+
+class RouteParams:
+    """One validated schema for every path, query and header parameter of a route.
+
+    The fields are compiled into a single `TypedDict` when the route is
+    registered; each request collects the raw values and validates them in
+    one pydantic-core call, so handlers get typed values and a bad value
+    answers `422` with every error at once.
+    """
+
+    __slots__ = ("defaults", "paths", "queries", "headers", "sources", "validate")
+
+    def __init__(self, rule: str, fields: dict[str, dict[str, t.Any]]) -> None:
+        self.defaults: dict[str, t.Any] = {}
+        # `(key in the request, key in the schema, read every value)`
+        self.paths: tuple[str, ...] = ()
+        self.queries: tuple[tuple[str, bool], ...] = ()
+        self.headers: tuple[tuple[str, bool], ...] = ()
+        self.sources: dict[str, Source] = {}
+
+        schema: dict[str, t.Any] = {}
+        for name, field_obj in fields.items():
+            kind: Source = field_obj["type"]
+            annotation: t.Any = field_obj["annotation"]
+            default: t.Any = field_obj.get("default", ...)
+            key: str = field_obj.get("alias") or name
+            many: bool = is_sequence(annotation)
+            match kind:
+                case "path":
+                    self.paths += (name,)
+                case "query":
+                    self.queries += ((name, many),)
+                case "header":
+                    self.headers += ((key, many),)
+                    annotation = t.Annotated[annotation, Field(validation_alias=key)]
+            self.sources[key] = kind
+            if default is ...:
+                schema[name] = t.Required[annotation]
+            else:
+                schema[name] = t.NotRequired[annotation]
+                self.defaults[name] = default
+
+        params = t.TypedDict(f"Params[{rule}]", schema)  # type: ignore[operator]
+        self.validate = type_adapter(params).validate_python
+
+    def collect(self, request: Request) -> dict[str, t.Any]:
+        """raw values of the declared parameters present in `request`"""
+        data: dict[str, t.Any] = {}
+        if self.queries:
+            args = request.args
+            for name, many in self.queries:
+                if name in args:
+                    data[name] = args.getlist(name) if many else args[name]
+        if self.headers:
+            headers = request.headers
+            for key, many in self.headers:
+                if key in headers:
+                    data[key] = headers.getlist(key) if many else headers[key]
+        if self.paths:
+            view_args = request.view_args or {}
+            for name in self.paths:
+                data[name] = view_args[name]
+        return data
+
+    def bind(self, request: Request) -> dict[str, t.Any]:
+        try:
+            values = self.validate(self.collect(request))
+        except ValidationError as e:
+            raise Binder.translate_error(e, self.sources)
+        return {**self.defaults, **values}
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import threading
+import typing as t
+
+from flask import Request
+from pydantic import ValidationError
+from werkzeug.wrappers import Response as BaseResponse
+
+from .binder import Binder, Extractor
+from .di import DependencyGraph
+from .helpers import type_adapter
+from .params import PARAM_KINDS, RouteParams
+from .serializer import Dumper, Serializer, Streamer, ToPython
+from .tracing import span
+
+if t.TYPE_CHECKING:
+    from .cache import CachePolicy
+    from .typed import FileMarker
+
+_GENERIC_PASSTHROUGH_RESULTS: tuple[type, ...] = (str, bytes, BaseResponse)
+_PASSTHROUGH_RESULTS: tuple[type, ...] = (*_GENERIC_PASSTHROUGH_RESULTS, list)
+# kinds bound by the route as a whole rather than by a per-parameter `Binder`
+_PLANNED_KINDS: frozenset[str] = PARAM_KINDS | {"dependency"}
+
+
+# kinds whose body is validated by a shared `TypeAdapter`
+_VALIDATED_KINDS: frozenset[str] = frozenset(
+    {"basemodel", "dataclass", "dataclassform", "generic"}
+)
+# slots filled by :meth:`RoutePlan.compile`, on first use of the route
+_COMPILED: frozenset[str] = frozenset(
+    {"binders", "params", "serializer", "to_python", "streamer"}
+)
+
+
+def attach_validators(request_fields: dict[str, t.Any]) -> None:
+    """build one `TypeAdapter` per validated body model, once per route"""
+    for field_obj in request_fields.values():
+        if field_obj and field_obj["type"] in _VALIDATED_KINDS:
+            field_obj["validator"] = type_adapter(field_obj["object"])
+
+
+class RoutePlan:
+    """Precompiled invoker for one view function.
+
+    Built by :meth:`FlaskNova.add_url_rule` from the route's schema cache and
+    stored once per `(rule, method)` pair, so
+    :meth:`FlaskNova.dispatch_request` only runs the extractors in order.
+
+    Registration only sorts the parameters; the pydantic adapters, binders
+    and serializers are compiled on first use of the route, or for every
+    route by :meth:`FlaskNova.warmup`.
+    """
+
+    __slots__ = (
+        "rule",
+        "methods",
+        "binders",
+        "params",
+        "uploads",
+        "dependencies",
+        "response",
+        "serializer",
+        "to_python",
+        "streamer",
+        "passthrough",
+        "nullable",
+        "compress",
+        "cache",
+        "_request",
+        "_encode",
+        "_lock",
+        "_compiled",
+    )
+
+    def __init__(
+        self,
+        rule: str,
+        methods: t.Iterable[str],
+        request: dict[str, t.Any] | None,
+        response: dict[str, t.Any] | None,
+        encode: t.Callable[[t.Any], bytes],
+        compress: bool = True,
+        cache: CachePolicy | None = None,
+    ) -> None:
+        self.rule = rule
+        self.methods: frozenset[str] = frozenset(methods)
+        self._request: dict[str, t.Any] = request or {}
+        self._encode = encode
+        self._lock = threading.Lock()
+        self._compiled: bool = False
+        request = self._request
+        # `File(...)` markers by form field, read by the multipart parser
+        self.uploads: dict[str, FileMarker] = {
+            obj["default"].name: obj["default"]
+            for obj in request.values()
+            if obj and obj["type"] == "file"
+        }
+        # every `Depend` of the view in one graph, so independent ones overlap
+        depends = {
+            name: obj["default"]
+            for name, obj in request.items()
+            if obj and obj["type"] == "dependency"
+        }
+        self.dependencies: DependencyGraph | None = (
+            DependencyGraph(depends) if depends else None
+        )
+        self.response = response
+        # results handed to Flask untouched; lists only when no model expects one
+        self.passthrough: tuple[type, ...] = _PASSTHROUGH_RESULTS
+        # `Model | None` routes serialize a `None` result as `null`
+        self.nullable: bool = False
+        if response and response["type"] == "generic":
+            self.passthrough = _GENERIC_PASSTHROUGH_RESULTS
+            self.nullable = type(None) in t.get_args(response["object"])
+        # `compress=False` on the route keeps its responses uncompressed
+        self.compress = compress
+        # `GET` routes with a `CachePolicy` are answered from `app.cache` on a hit
+        self.cache = cache
+        if cache is not None:
+            cache.check(
+                rule,
+                (
+                    name
+                    for name, obj in request.items()
+                    if obj and obj["type"] in PARAM_KINDS
+                ),
+            )
+
+    def compile(self) -> RoutePlan:
+        """build the adapters, binders and serializers of the route, once"""
+        with self._lock:
+            if self._compiled:
+                return self
+            request = self._request
+            attach_validators(request)
+            # path, query and header values validated together in one call
+            fields = {
+                name: obj
+                for name, obj in request.items()
+                if obj and obj["type"] in PARAM_KINDS
+            }
+            self.params: RouteParams | None = (
+                RouteParams(self.rule, fields) if fields else None
+            )
+            self.serializer: Dumper | None = None
+            # same shaping without the JSON step, for msgpack/cbor responses
+            self.to_python: ToPython | None = None
+            self.streamer: Streamer | None = None
+            if self.response:
+                serializer = Serializer(self.response, self._encode)
+                self.serializer = serializer.compile()
+                self.to_python = serializer.compile_python()
+                self.streamer = serializer.compile_stream()
+            self.binders: tuple[tuple[str, Extractor], ...] = tuple(
+                (name, Binder(name, obj).compile())
+                for name, obj in request.items()
+                if not obj or obj["type"] not in _PLANNED_KINDS
+            )
+            self._compiled = True
+        return self
+
+    def __getattr__(self, name: str) -> t.Any:
+        # only reached while a compiled slot is still unset
+        if name in _COMPILED:
+            self.compile()
+            return object.__getattribute__(self, name)
+        raise AttributeError(
+            f"{self.__class__.__name__!r} object has no attribute {name!r}"
+        )
+
+    def bind_params(self, request: Request) -> dict[str, t.Any]:
+        """validated path, query and header parameters of `request`"""
+        return self.params.bind(request) if self.params is not None else {}
+
+    def bind(
+        self, request: Request, params: dict[str, t.Any] | None = None
+    ) -> dict[str, t.Any]:
+        """
+        run every extractor against `request` and return the view kwargs,
+        `params` are the route parameters when already validated
+        """
+        with span(request, "bind"):
+            try:
+                kwargs = {name: extract(request) for name, extract in self.binders}
+            except (TypeError, ValidationError) as e:
+                raise Binder.translate_error(e)
+            kwargs.update(self.bind_params(request) if params is None else params)
+        graph = self.dependencies
+        if graph is not None:
+            if graph.stale:
+                graph = self.dependencies = graph.fresh()
+            with span(request, "dependencies"):
+                kwargs.update(graph.resolve(request))
+        return kwargs
+
+    async def abind(
+        self, request: Request, params: dict[str, t.Any] | None = None
+    ) -> dict[str, t.Any]:
+        """:meth:`bind` for the ASGI entry point, dependencies are awaited"""
+        with span(request, "bind"):
+            try:
+                kwargs = {name: extract(request) for name, extract in self.binders}
+            except (TypeError, ValidationError) as e:
+                raise Binder.translate_error(e)
+            kwargs.update(self.bind_params(request) if params is None else params)
+        graph = self.dependencies
+        if graph is not None:
+            if graph.stale:
+                graph = self.dependencies = graph.fresh()
+            with span(request, "dependencies"):
+                kwargs.update(await graph.aresolve(request))
+        return kwargs
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({'|'.join(sorted(self.methods))} {self.rule})"
+        )
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import cProfile
+import hashlib
+import hmac
+import logging
+import os
+import random
+import re
+import threading
+import time
+import typing as t
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+
+from flask import Flask, Request
+
+#: request header carrying a token from :func:`profile_token`
+PROFILE_HEADER: str = "X-Nova-Profile"
+#: seconds a token from :func:`profile_token` is accepted by default
+DEFAULT_TOKEN_TTL: float = 300.0
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+_NOT_PROFILED: t.ContextManager[None] = nullcontext()
+
+logger = logging.getLogger(__name__)
+
+
+def _signature(secret: str | bytes, expires: int, path: str) -> str:
+    key = secret.encode() if isinstance(secret, str) else secret
+    message = f"{expires}:{path}".encode()
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def profile_token(
+    secret: str | bytes, path: str, ttl: float = DEFAULT_TOKEN_TTL
+) -> str:
+    """
+    `X-Nova-Profile` value signed with `PROFILE_SECRET`, valid for requests
+    to `path` (e.g. `/items/3`, without the query string) for `ttl` seconds
+    """
+    expires = int(time.time() + ttl)
+    return f"{expires}.{_signature(secret, expires, path)}"
+
+
+def verify_token(secret: str | bytes, token: str, path: str) -> bool:
+    """whether `token` is signed with `secret` for `path` and not expired"""
+    expires, _, signature = token.strip().partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(secret, int(expires), path))
+
+
+class Profiler:
+    """On-demand cProfile of requests of a :class:`FlaskNova` app, as `app.profiler`.
+
+    A request is profiled when it carries an `X-Nova-Profile` token signed
+    with `PROFILE_SECRET` for its path (see :func:`profile_token` and
+    `flask_nova profile-token`), or when it is drawn by the `PROFILE_SAMPLE`
+    rate of its route template (`"*"` for the others). The whole dispatch,
+    from the `before_request` hooks to the finalized response, runs under
+    :class:`cProfile.Profile`, and the stats are written to `PROFILE_DIR` as
+    `<time>-<method>-<route>-<trace_id>.prof`, for `pstats` or snakeviz.
+    ```
+    app.config["PROFILE_SECRET"] = os.environ["NOVA_PROFILE_SECRET"]
+    app.config["PROFILE_SAMPLE"] = {"/items/<int:item_id>": 0.01}
+    app.config["PROFILE_DIR"] = "/var/tmp/profiles"  # default: instance/profiles
+    ```
+    Without either setting, requests only pay for two config lookups. One
+    request per process is profiled at a time, others run as usual: on
+    Python 3.12+ cProfile is built on `sys.monitoring`, which profiles every
+    thread of the process at once.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return self.app.config.get("PROFILE_DIR") or os.path.join(
+            self.app.instance_path, "profiles"
+        )
+
+    def wants(self, request: Request) -> bool:
+        """whether `request` is signed for profiling or drawn by its sampling rule"""
+        config = self.app.config
+        secret: str | bytes | None = config.get("PROFILE_SECRET")
+        sample: t.Mapping[str, float] | None = config.get("PROFILE_SAMPLE")
+        if not secret and not sample:
+            return False
+        if secret:
+            token: str | None = request.headers.get(PROFILE_HEADER)
+            if token and verify_token(secret, token, request.path):
+                return True
+        if sample:
+            rule = request.url_rule
+            rate = sample.get(rule.rule if rule else "", sample.get("*", 0.0))
+            return rate > 0 and random.random() < rate
+        return False
+
+    def profile(self, request: Request) -> t.ContextManager[cProfile.Profile | None]:
+        """:meth:`record` the block when :meth:`wants` picks `request`, else a no-op"""
+        return self.record(request) if self.wants(request) else _NOT_PROFILED
+
+    @contextmanager
+    def record(self, request: Request) -> Iterator[cProfile.Profile | None]:
+        """run the block under cProfile and write its stats, unless another one runs"""
+        if not self._lock.acquire(blocking=False):
+            yield None
+            return
+        try:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # another profiler or debugger holds the process
+                logger.debug("not profiling %s, a profiler is active", request.path)
+                yield None
+                return
+            try:
+                yield profile
+            finally:
+                profile.disable()
+                self._dump(request, profile)
+        finally:
+            self._lock.release()
+
+    def _dump(self, request: Request, profile: cProfile.Profile) -> str | None:
+        rule = request.url_rule.rule if request.url_rule else request.path
+        route = _UNSAFE.sub("_", rule).strip("_")[:100] or "root"
+        trace_id: str = request.trace.trace_id  # type: ignore[attr-defined]
+        name = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{request.method}-{route}-{trace_id}.prof"
+        )
+        path = os.path.join(self.directory, name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path)
+        except OSError:
+            logger.warning("could not write the profile %s", path, exc_info=True)
+            return None
+        logger.info("profiled %s %s to %s", request.method, rule, path)
+        return path
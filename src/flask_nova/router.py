@@ -7,6 +7,7 @@ import os
 
 if t.TYPE_CHECKING:
     from flask.sansio.scaffold import T_route
+    from .cache import CachePolicy
     from .typed import Method
     from enum import Enum
 
@@ -49,6 +50,7 @@ class NovaBlueprint(_BluePrint):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         options[rule] = {
@@ -60,6 +62,7 @@ class NovaBlueprint(_BluePrint):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=methods, **options)
 
@@ -73,6 +76,8 @@ class NovaBlueprint(_BluePrint):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
+        cache: CachePolicy | None = None,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         options[rule] = {
@@ -84,6 +89,8 @@ class NovaBlueprint(_BluePrint):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
+            "cache": cache,
         }
 
         return super().route(rule, methods=["GET"], **options)
@@ -98,6 +105,7 @@ class NovaBlueprint(_BluePrint):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route]:
         options[rule] = {
@@ -109,6 +117,7 @@ class NovaBlueprint(_BluePrint):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=["POST"], **options)
 
@@ -122,6 +131,7 @@ class NovaBlueprint(_BluePrint):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         options[rule] = {
@@ -133,6 +143,7 @@ class NovaBlueprint(_BluePrint):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=["PUT"], **options)
 
@@ -146,6 +157,7 @@ class NovaBlueprint(_BluePrint):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         options[rule] = {
@@ -157,6 +169,7 @@ class NovaBlueprint(_BluePrint):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=["PATCH"], **options)
 
@@ -170,6 +183,7 @@ class NovaBlueprint(_BluePrint):
         responses: dict[str, t.Any] | None = None,
         response_model: type | None = None,
         deprecated: bool = False,
+        compress: bool = True,
         **options: t.Any,
     ) -> t.Callable[[T_route], T_route] | type:
         options[rule] = {
@@ -181,6 +195,7 @@ class NovaBlueprint(_BluePrint):
             "responses": responses,
             "response_model": response_model,
             "deprecated": deprecated,
+            "compress": compress,
         }
         return super().route(rule, methods=["DELETE"], **options)
 
@@ -1,59 +1,172 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+from .helpers import type_adapter
 
-from pydantic import BaseModel
-from typing import Any
+from pydantic import BaseModel, TypeAdapter
+
+from dataclasses import fields as dataclass_fields, is_dataclass
+from collections.abc import Iterable, Iterator, Mapping
+from operator import attrgetter, itemgetter
+from functools import partial
+from typing import Any, Callable, get_type_hints
+
+Dumper = Callable[[Any], bytes]
+#: same reshaping as a :data:`Dumper`, returning JSON-compatible python objects
+ToPython = Callable[[Any], Any]
+Streamer = Callable[[Iterable[Any], bool], Iterator[bytes]]
+
+# flush streamed items in chunks of about this size instead of one write per item
+STREAM_CHUNK_SIZE: int = 64 * 1024
+
+
+def _shallow_fields(result: Any) -> Any:
+    """top-level fields of `result` as a dict, without recursing like `asdict`"""
+    if isinstance(result, BaseModel):
+        return dict(result)
+    if is_dataclass(result):
+        return {f.name: getattr(result, f.name) for f in dataclass_fields(result)}
+    if hasattr(result, "__dict__"):
+        return vars(result)
+    return result
+
+
+def _python_dump(adapter: TypeAdapter) -> ToPython:
+    return partial(adapter.dump_python, mode="json")
 
 
 class Serializer:
     """
-    return the shape the obj based on
-    fields provide, if extra it will be ignored,
-    if field not found ValidationError or ValueError will be raise
+    compile the response model of a route into a dumper that returns
+    ready-to-send JSON bytes, shaped by the fields of the model.
+    extra fields are ignored, a missing field raises ValidationError or ValueError
     """
 
-    def __init__(self, result: Any, response: dict[str, Any]) -> None:
-        self.result = result
+    def __init__(
+        self, response: dict[str, Any], encode: Callable[[Any], bytes]
+    ) -> None:
         self.response = response
+        self.encode = encode
 
-    def _base_model(self) -> dict[str, Any]:
-        v: BaseModel = self.response["object"](**self.result.model_dump())  # type: ignore[attr-defined]
-        rv: dict[str, Any] = v.model_validate(self.result).model_dump()
-        return rv
-
-    def _dataclass(self) -> dict[str, Any]:
-        result = self._serializer_checker(self.response["object"], asdict(self.result))  # type: ignore
-        return result
-
-    def _custom_class(self) -> dict[str, Any]:
-        result = self._serializer_checker(
-            self.response["object"],
-            self.result.__result_values__,  # type: ignore[attr-defined]
-        )
-        return result
+    def compile(self) -> Dumper | None:
+        match self.response["type"]:
+            case "basemodel" | "dataclass":
+                return self._model_dumper()
+            case "customclass":
+                return self._custom_class_dumper()
+            case "generic":
+                return self._generic_dumper()
+            case _:
+                return None
 
-    def serialize(self) -> dict[str, Any] | None:
+    def compile_python(self) -> ToPython | None:
+        """
+        like :meth:`compile`, but stop before the JSON encoding so binary
+        codecs (msgpack, cbor) can encode the shaped result themselves
+        """
         match self.response["type"]:
-            case "basemodel":
-                return self._base_model()
-            case "dataclass":
-                return self._dataclass()
+            case "basemodel" | "dataclass":
+                return self._model_dumper(python=True)
             case "customclass":
-                return self._custom_class()
+                return self._custom_class_dumper(python=True)
+            case "generic":
+                return self._generic_dumper(python=True)
             case _:
                 return None
 
-    def _serializer_checker(self, cls: type, result: dict) -> dict[str, Any]:
+    def compile_stream(self) -> Streamer | None:
         """
-        This return the fields in the :param:`cls` given a :param:`result`
-        and will raise `ValueError` if field is not found in :param:`result`
+        compile a `stream` response (`-> Iterator[Model]`) into a streamer that
+        serializes each item with the item model as it is produced
+        """
+        if self.response["type"] != "stream":
+            return None
+        item: dict[str, Any] | None = self.response["item"]
+        dump: Dumper = (item and Serializer(item, self.encode).compile()) or self.encode
+
+        def stream(items: Iterable[Any], ndjson: bool) -> Iterator[bytes]:
+            buffer = bytearray() if ndjson else bytearray(b"[")
+            separator: bytes = b"\n" if ndjson else b","
+            first = True
+            for value in items:
+                if ndjson:
+                    buffer += dump(value) + separator
+                elif first:
+                    buffer += dump(value)
+                else:
+                    buffer += separator + dump(value)
+                first = False
+                if len(buffer) >= STREAM_CHUNK_SIZE:
+                    yield bytes(buffer)
+                    buffer.clear()
+            if not ndjson:
+                buffer += b"]"
+            if buffer:
+                yield bytes(buffer)
+
+        return stream
+
+    def _model_dumper(self, python: bool = False) -> Dumper:
+        cls: type = self.response["object"]
+        adapter = type_adapter(cls)
+        dump_json = _python_dump(adapter) if python else adapter.dump_json
+        validate = adapter.validate_python
+        # pydantic reads attributes for models only, dataclasses need a mapping
+        needs_mapping: bool = self.response["type"] == "dataclass"
+
+        def dump(result: Any) -> bytes:
+            if type(result) is not cls:
+                # other models, dataclasses, plain objects and dicts are reshaped
+                if needs_mapping and not isinstance(result, Mapping):
+                    result = _shallow_fields(result)
+                result = validate(result, from_attributes=True)
+            return dump_json(result)
+
+        return dump
+
+    def _generic_dumper(self, python: bool = False) -> Dumper:
+        """
+        `list[Model]`, `dict[str, Model]`, `Model | None`...: one adapter for
+        the whole shape, validated and dumped in native calls, not per item
+        """
+        adapter = type_adapter(self.response["object"])
+        dump_json = _python_dump(adapter) if python else adapter.dump_json
+        validate = adapter.validate_python
+        return lambda result: dump_json(validate(result, from_attributes=True))
 
+    def _custom_class_dumper(self, python: bool = False) -> Dumper:
         """
-        keys = cls.__annotations__.items()
-        return_odj: dict[str, Any] = {}
-        for field_name, _ in keys:
-            if field_name not in result.keys():
-                raise ValueError(f"{cls.__name__} expect {field_name} field")
-            return_odj[field_name] = result[field_name]
-        return return_odj
+        read the annotated fields of :attr:`to_dict` classes with one
+        `attrgetter` (or `itemgetter` for mappings) built at registration
+        """
+        cls: type = self.response["object"]
+        fields: tuple[str, ...] = tuple(get_type_hints(cls))
+        encode: Callable[[Any], Any] = dict if python else self.encode
+        if not fields:
+            return lambda result: encode({})
+
+        get_attrs = attrgetter(*fields)
+        get_items = itemgetter(*fields)
+        single: bool = len(fields) == 1
+
+        def dump(result: Any) -> bytes:
+            try:
+                if isinstance(result, Mapping):
+                    values = get_items(result)
+                else:
+                    values = get_attrs(result)
+            except (AttributeError, KeyError) as e:
+                missing = self._missing_field(fields, result)
+                raise ValueError(f"{cls.__name__} expect {missing} field") from e
+            return encode(dict(zip(fields, (values,) if single else values)))
+
+        return dump
+
+    @staticmethod
+    def _missing_field(fields: tuple[str, ...], result: Any) -> str:
+        for field_name in fields:
+            if isinstance(result, Mapping):
+                if field_name not in result:
+                    return field_name
+            elif not hasattr(result, field_name):
+                return field_name
+        return fields[0]
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import typing as t
+from dataclasses import fields, is_dataclass
+
+import pydantic
+from pydantic import BaseModel
+
+if t.TYPE_CHECKING:
+    from .core import FlaskNova
+
+#: bumped whenever the layout of the snapshot or of the route schemas changes
+SNAPSHOT_VERSION: int = 1
+#: file name used by `flask_nova build` when the app has no `snapshot` path
+DEFAULT_SNAPSHOT: str = "nova.snapshot"
+
+# modules whose code shapes the stored schemas and document
+_FRAMEWORK_MODULES: tuple[str, ...] = ("flask_nova.core", "flask_nova.helpers")
+
+logger = logging.getLogger(__name__)
+
+# `(rule, view)` of a route, `view` as `module.qualname`
+RouteKey = tuple[str, str]
+
+
+def view_name(view_func: t.Callable[..., t.Any]) -> str:
+    module = getattr(view_func, "__module__", None)
+    return f"{module}.{getattr(view_func, '__qualname__', repr(view_func))}"
+
+
+def _file_digest(path: str) -> str | None:
+    try:
+        with open(path, "rb") as file:
+            return hashlib.blake2b(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _type_modules(obj: t.Any, found: set[str], seen: set[int]) -> None:
+    """modules defining `obj`, its type arguments and the fields of models"""
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    module: str | None = getattr(obj, "__module__", None)
+    if isinstance(module, str):
+        found.add(module)
+    for arg in t.get_args(obj):
+        _type_modules(arg, found, seen)
+    if isinstance(obj, type) and issubclass(obj, BaseModel):
+        for field in obj.model_fields.values():
+            _type_modules(field.annotation, found, seen)
+    elif is_dataclass(obj) and isinstance(obj, type):
+        for field in fields(obj):
+            _type_modules(field.type, found, seen)
+
+
+def _schema_objects(schema: dict[str, t.Any]) -> t.Iterator[t.Any]:
+    """types and dependency callables named by a route's request/response schema"""
+    fields_ = [*(schema.get("request") or {}).values(), schema.get("response")]
+    for field in fields_:
+        if not field:
+            continue
+        yield field.get("object")
+        yield field.get("annotation")
+        default = field.get("default")
+        yield getattr(default, "dependency", None)
+        item = field.get("item")
+        if item:
+            yield item.get("object")
+
+
+class Snapshot:
+    """Route schemas and OpenAPI document of an app, written by `flask_nova build`.
+
+    Loaded by :class:`FlaskNova` when it is given a `snapshot` path: routes
+    found in it skip the introspection of their view and the document is not
+    assembled again. The snapshot is ignored, and everything introspected as
+    usual, when one of the source files it was built from changed, or when
+    Python, pydantic or the snapshot format differ.
+    ```
+    flask_nova build --app main:app
+
+    app = FlaskNova(__name__, snapshot="nova.snapshot")
+    ```
+    Like `.pyc` files, snapshots are unpickled: only load files you built.
+    """
+
+    def __init__(
+        self,
+        schemas: dict[RouteKey, bytes | None],
+        openapi: bytes,
+        files: dict[str, str],
+    ) -> None:
+        #: pickled `{"request": ..., "response": ...}` by documented route,
+        #: `None` for the routes introspected at startup
+        self.schemas = schemas
+        #: `/openapi.json` as served
+        self.openapi = openapi
+        #: digest of every source file the snapshot depends on, by path
+        self.files = files
+
+    @staticmethod
+    def _environment() -> tuple[t.Any, ...]:
+        return (SNAPSHOT_VERSION, sys.version_info[:2], pydantic.VERSION)
+
+    @classmethod
+    def build(cls, app: FlaskNova) -> Snapshot:
+        """snapshot of the routes registered on `app`, without unpicklable routes"""
+        schemas: dict[RouteKey, bytes | None] = {}
+        modules: set[str] = {app.import_name, *_FRAMEWORK_MODULES}
+        seen: set[int] = set()
+        for rule in app.url_map.iter_rules():
+            view_func = app.view_functions.get(rule.endpoint)
+            # the plan of this rule's own view: views on other methods of the
+            # same rule have schemas of their own
+            plan = next(
+                (
+                    app._route_plans[(rule.rule, method)]
+                    for method in sorted(rule.methods or ())
+                    if (rule.rule, method) in app._route_plans
+                ),
+                None,
+            )
+            if view_func is None or plan is None:
+                continue
+            schema = {
+                "request": {
+                    name: field and {k: v for k, v in field.items() if k != "validator"}
+                    for name, field in plan._request.items()
+                },
+                "response": plan.response,
+            }
+            _type_modules(view_func, modules, seen)
+            for obj in _schema_objects(schema):
+                _type_modules(obj, modules, seen)
+            try:
+                data = pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, AttributeError, TypeError):
+                # local views and models are introspected at startup
+                data = None
+            schemas[(rule.rule, view_name(view_func))] = data
+
+        files: dict[str, str] = {}
+        for name in sorted(modules):
+            path: str | None = getattr(sys.modules.get(name), "__file__", None)
+            digest = _file_digest(path) if path else None
+            if path and digest:
+                files[path] = digest
+        openapi: bytes = app.json.encode(app.openapi)  # type: ignore[attr-defined]
+        return cls(schemas, openapi, files)
+
+    def dump(self, path: str | os.PathLike[str]) -> None:
+        data = pickle.dumps(
+            (self._environment(), self.files, self.schemas, self.openapi),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        # written next to the target and renamed, so workers never read half a file
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> Snapshot | None:
+        """the snapshot at `path`, or `None` when it is missing, unreadable or stale"""
+        try:
+            with open(path, "rb") as file:
+                environment, files, schemas, openapi = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("ignoring unreadable snapshot %s", path, exc_info=True)
+            return None
+        if environment != cls._environment():
+            logger.info("ignoring snapshot %s built for another environment", path)
+            return None
+        for source, digest in files.items():
+            if _file_digest(source) != digest:
+                logger.info("ignoring snapshot %s: %s changed", path, source)
+                return None
+        return cls(schemas, openapi, files)
+
+    def documents(self, rule: str, view_func: t.Callable[..., t.Any]) -> bool:
+        """whether the stored document already describes the route"""
+        return (rule, view_name(view_func)) in self.schemas
+
+    def schema(
+        self, rule: str, view_func: t.Callable[..., t.Any]
+    ) -> dict[str, t.Any] | None:
+        """stored request and response schemas of a route, `None` when not stored"""
+        data = self.schemas.get((rule, view_name(view_func)))
+        if data is None:
+            return None
+        try:
+            return pickle.loads(data)
+        except Exception:
+            # e.g. a model renamed in a module the snapshot does not track
+            return None
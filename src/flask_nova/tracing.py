@@ -0,0 +1,479 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import typing as t
+import urllib.request
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+
+from flask import Flask, Request
+
+#: spans sent to the sink at once, and at most every `DEFAULT_FLUSH_INTERVAL` seconds
+DEFAULT_BATCH_SIZE: int = 512
+DEFAULT_FLUSH_INTERVAL: float = 5.0
+#: spans waiting for the exporter thread; further ones are dropped
+DEFAULT_MAX_QUEUE: int = 2048
+
+# version-traceid-parentid-flags, lowercase hex only
+_TRACEPARENT = re.compile(
+    r"([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-[^ ]*)?"
+)
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+# list members a `tracestate` may carry
+_MAX_TRACESTATE_MEMBERS = 32
+
+# OTLP span kinds and status codes
+_KIND_INTERNAL, _KIND_SERVER = 1, 2
+_STATUS_ERROR = 2
+
+_NO_SPAN: t.ContextManager[None] = nullcontext()
+
+logger = logging.getLogger(__name__)
+
+
+def new_trace_id() -> str:
+    # not a secret: the fast Mersenne Twister, reseeded in forked workers
+    return f"{random.getrandbits(128) or 1:032x}"
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64) or 1:016x}"
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, int] | None:
+    """`(trace_id, parent_id, flags)` of a valid `traceparent`, else `None`"""
+    if not value:
+        return None
+    match = _TRACEPARENT.fullmatch(value.strip())
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags, rest = match.groups()
+    # `ff` is forbidden; version 00 has exactly four fields, later ones may add more
+    if version == "ff" or (version == "00" and rest):
+        return None
+    if trace_id == _INVALID_TRACE_ID or parent_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, parent_id, int(flags, 16)
+
+
+def parse_tracestate(values: t.Iterable[str]) -> str | None:
+    """every `tracestate` header joined, `None` when empty or over 32 members"""
+    members = [
+        member.strip()
+        for value in values
+        for member in value.split(",")
+        if member.strip()
+    ]
+    if not members or len(members) > _MAX_TRACESTATE_MEMBERS:
+        return None
+    return ",".join(members)
+
+
+class TraceContext:
+    """W3C trace context of one request, available as `request.trace`.
+
+    The incoming `traceparent`/`tracestate` are parsed when it is first
+    used; the trace and span IDs are only generated when something reads
+    them (a log line, an error response, an exported span).
+    ```
+    requests.get(url, headers=request.trace.headers())  # propagate downstream
+    ```
+    """
+
+    __slots__ = ("_trace_id", "_span_id", "parent_id", "sampled", "tracestate")
+
+    def __init__(
+        self,
+        traceparent: str | None = None,
+        tracestate: t.Iterable[str] = (),
+        sample_rate: float = 1.0,
+    ) -> None:
+        parent = parse_traceparent(traceparent)
+        self._span_id: str | None = None
+        if parent is not None:
+            self._trace_id: str | None = parent[0]
+            self.parent_id: str | None = parent[1]
+            # head-based: follow the caller's decision
+            self.sampled: bool = bool(parent[2] & 1)
+            self.tracestate: str | None = parse_tracestate(tracestate)
+        else:
+            self._trace_id = None
+            self.parent_id = None
+            self.sampled = sample_rate >= 1 or random.random() < sample_rate
+            # a `tracestate` without a valid `traceparent` is discarded
+            self.tracestate = None
+
+    @property
+    def trace_id(self) -> str:
+        if self._trace_id is None:
+            self._trace_id = new_trace_id()
+        return self._trace_id
+
+    @property
+    def span_id(self) -> str:
+        """ID of this server's span, the parent of the calls it makes"""
+        if self._span_id is None:
+            self._span_id = new_span_id()
+        return self._span_id
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def headers(self) -> dict[str, str]:
+        """`traceparent` and `tracestate` for outgoing requests and error responses"""
+        headers = {"traceparent": self.traceparent}
+        if self.tracestate:
+            headers["tracestate"] = self.tracestate
+        return headers
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "span_id",
+        "parent_id",
+        "kind",
+        "start",
+        "end",
+        "attributes",
+        "error",
+    )
+
+    def __init__(
+        self, name: str, span_id: str, parent_id: str | None, kind: int
+    ) -> None:
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start: int = time.time_ns()
+        self.end: int = 0
+        self.attributes: dict[str, t.Any] = {}
+        self.error: str | None = None
+
+
+class RequestSpans:
+    """Spans of one sampled request: the server span and one per stage."""
+
+    __slots__ = ("context", "root", "spans")
+
+    def __init__(self, context: TraceContext, name: str) -> None:
+        self.context = context
+        self.root = Span(name, context.span_id, context.parent_id, _KIND_SERVER)
+        self.spans: list[Span] = [self.root]
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        span = Span(name, new_span_id(), self.root.span_id, _KIND_INTERNAL)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.end = time.time_ns()
+            self.spans.append(span)
+
+    def finish(self, exc: BaseException | None = None) -> None:
+        self.root.end = time.time_ns()
+        if exc is not None:
+            self.root.error = repr(exc)
+
+
+def span(request: Request, name: str) -> t.ContextManager[t.Any]:
+    """
+    a child span of the request's server span, timed for `app.metrics` too;
+    a no-op unless the request is traced or measured
+    """
+    spans: RequestSpans | None = getattr(request, "spans", None)
+    durations: dict[str, float] | None = getattr(request, "stage_durations", None)
+    if durations is None:
+        return _NO_SPAN if spans is None else spans.span(name)
+    return _timed(spans, durations, name)
+
+
+@contextmanager
+def _timed(
+    spans: RequestSpans | None, durations: dict[str, float], name: str
+) -> Iterator[Span | None]:
+    start = time.perf_counter()
+    try:
+        if spans is None:
+            yield None
+        else:
+            with spans.span(name) as span_:
+                yield span_
+    finally:
+        durations[name] = durations.get(name, 0.0) + time.perf_counter() - start
+
+
+def _attribute(key: str, value: t.Any) -> dict[str, t.Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def otlp_json(
+    batch: list[tuple[TraceContext, Span]], service_name: str
+) -> dict[str, t.Any]:
+    """OTLP/JSON `ExportTraceServiceRequest` for a batch of spans"""
+    spans = []
+    for context, span_ in batch:
+        encoded: dict[str, t.Any] = {
+            "traceId": context.trace_id,
+            "spanId": span_.span_id,
+            "name": span_.name,
+            "kind": span_.kind,
+            "startTimeUnixNano": str(span_.start),
+            "endTimeUnixNano": str(span_.end),
+            "attributes": [_attribute(k, v) for k, v in span_.attributes.items()],
+        }
+        if span_.parent_id:
+            encoded["parentSpanId"] = span_.parent_id
+        if context.tracestate:
+            encoded["traceState"] = context.tracestate
+        if span_.error:
+            encoded["status"] = {"code": _STATUS_ERROR, "message": span_.error}
+        spans.append(encoded)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [_attribute("service.name", service_name)]},
+                "scopeSpans": [{"scope": {"name": "flask_nova"}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class SpanSink(ABC):
+    """Where :class:`BatchExporter` sends the finished spans, one batch at a time.
+    ```
+    app.config["TRACING_SINK"] = FileSink("spans.jsonl")
+    ```
+    """
+
+    @abstractmethod
+    def export(self, payload: dict[str, t.Any]) -> None:
+        """write one OTLP/JSON `ExportTraceServiceRequest`"""
+
+
+class FileSink(SpanSink):
+    """One OTLP/JSON request per line, the format of the collector's file exporter."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, payload: dict[str, t.Any]) -> None:
+        line = json.dumps(payload, separators=(",", ":")) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(line)
+
+
+class OTLPJsonSink(SpanSink):
+    """`POST` to an OTLP/HTTP endpoint with the JSON encoding, no SDK needed.
+    ```
+    app.config["TRACING_SINK"] = OTLPJsonSink("http://collector:4318/v1/traces")
+    ```
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        headers: t.Mapping[str, str] | None = None,
+        timeout: float = 10.0,
+    ) -> None:
+        self.endpoint = endpoint
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timeout = timeout
+
+    def export(self, payload: dict[str, t.Any]) -> None:
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        req = urllib.request.Request(
+            self.endpoint, data=data, headers=self.headers, method="POST"
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            response.read()
+
+
+class BatchExporter:
+    """Queue finished spans and send them from a background thread in batches.
+
+    Requests never wait for the sink: spans beyond `max_queue` are dropped
+    and counted in `dropped`. The thread starts with the first span of each
+    process, so it survives pre-fork servers, and the queue is flushed at exit.
+    """
+
+    def __init__(
+        self,
+        sink: SpanSink,
+        service_name: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ) -> None:
+        self.sink = sink
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.dropped: int = 0
+        self._queue: queue.Queue[tuple[TraceContext, Span] | None] = queue.Queue(
+            max_queue
+        )
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._registered: bool = False
+        self._lock = threading.Lock()
+
+    def submit(self, spans: RequestSpans) -> None:
+        if self._pid != os.getpid():
+            self._start()
+        for span_ in spans.spans:
+            try:
+                self._queue.put_nowait((spans.context, span_))
+            except queue.Full:
+                self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # a forked worker inherits the queue but not the thread
+            self._queue = queue.Queue(self.max_queue)
+            self._thread = threading.Thread(
+                target=self._run, name="nova-tracing", daemon=True
+            )
+            self._thread.start()
+            if not self._registered:
+                atexit.register(self.shutdown)
+                self._registered = True
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        batch: list[tuple[TraceContext, Span]] = []
+        deadline = time.monotonic() + self.flush_interval
+        running = True
+        while running:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = ()  # type: ignore[assignment]
+            if item is None:
+                # `shutdown()`: send what is left and stop
+                running = False
+            elif item:
+                batch.append(item)
+            if (
+                not running
+                or len(batch) >= self.batch_size
+                or time.monotonic() >= deadline
+            ):
+                self._send(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _send(self, batch: list[tuple[TraceContext, Span]]) -> None:
+        if not batch:
+            return
+        try:
+            self.sink.export(otlp_json(batch, self.service_name))
+        except Exception:
+            logger.warning(
+                "dropped %d spans, the sink failed", len(batch), exc_info=True
+            )
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """send the queued spans and stop the thread, the next span starts it again"""
+        with self._lock:
+            thread, self._thread, self._pid = self._thread, None, None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+
+class Tracer:
+    """W3C trace context and span export of a :class:`FlaskNova` app, as `app.tracer`.
+
+    Without a sink the app only propagates `traceparent`/`tracestate`. With
+    one, sampled requests record a server span with a child span per stage
+    (`bind`, `dependencies`, `handler`, `serialize`).
+    ```
+    app.config["TRACING_SINK"] = FileSink("spans.jsonl")  # or OTLPJsonSink(url)
+    app.config["TRACING_SAMPLE_RATE"] = 0.1  # requests without a sampled parent
+    app.config["TRACING_BATCH_SIZE"] = 512
+    app.config["TRACING_FLUSH_INTERVAL"] = 5.0
+    app.config["TRACING_SERVICE_NAME"] = "api"  # defaults to the app name
+    ```
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._exporter: BatchExporter | None = None
+
+    @property
+    def sample_rate(self) -> float:
+        return self.app.config.get("TRACING_SAMPLE_RATE", 1.0)
+
+    @property
+    def exporter(self) -> BatchExporter | None:
+        """exporter of `TRACING_SINK`, `None` when spans are not recorded"""
+        if self._exporter is None:
+            config = self.app.config
+            sink: SpanSink | None = config.get("TRACING_SINK")
+            if sink is None:
+                return None
+            self._exporter = BatchExporter(
+                sink,
+                config.get("TRACING_SERVICE_NAME") or self.app.name,
+                config.get("TRACING_BATCH_SIZE", DEFAULT_BATCH_SIZE),
+                config.get("TRACING_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL),
+                config.get("TRACING_MAX_QUEUE", DEFAULT_MAX_QUEUE),
+            )
+        return self._exporter
+
+    def context(self, request: Request) -> TraceContext:
+        headers = request.headers
+        return TraceContext(
+            headers.get("traceparent"), headers.getlist("tracestate"), self.sample_rate
+        )
+
+    def start(self, request: Request) -> RequestSpans | None:
+        """the span recorder of `request`, when it is sampled and exported"""
+        if self.exporter is None:
+            return None
+        context: TraceContext = request.trace  # type: ignore[attr-defined]
+        if not context.sampled:
+            return None
+        rule = request.url_rule.rule if request.url_rule else request.path
+        spans = RequestSpans(context, f"{request.method} {rule}")
+        spans.root.attributes.update(
+            {
+                "http.request.method": request.method,
+                "http.route": rule,
+                "url.path": request.path,
+            }
+        )
+        return spans
+
+    def finish(self, spans: RequestSpans, exc: BaseException | None = None) -> None:
+        spans.finish(exc)
+        exporter = self.exporter
+        if exporter is not None:
+            exporter.submit(spans)
@@ -13,9 +13,31 @@ class FormMarker:
 
 
 class FileMarker:
-    def __init__(self, name: str, multiple: bool = False) -> None:
+    def __init__(
+        self,
+        name: str,
+        multiple: bool = False,
+        max_size: int | None = None,
+        spool_threshold: int | None = None,
+        allowed_types: t.Iterable[str] | None = None,
+        dest_dir: str | None = None,
+        checksum: str | None = None,
+    ) -> None:
         self.name = name
         self.multiple = multiple
+        self.max_size = max_size
+        self.spool_threshold = spool_threshold
+        self.allowed_types: tuple[str, ...] = tuple(
+            allowed.lower() for allowed in allowed_types or ()
+        )
+        self.dest_dir = dest_dir
+        self.checksum = checksum
+
+
+class HeaderMarker:
+    def __init__(self, alias: str | None = None, default: t.Any = ...) -> None:
+        self.alias = alias
+        self.default = default
 
 
 Method = t.Literal["GET", "POST", "PUT", "DELETE", "PATCH"]
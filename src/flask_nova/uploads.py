@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+import typing as t
+from io import BytesIO
+from tempfile import NamedTemporaryFile
+
+from werkzeug.formparser import FormDataParser, MultiPartParser
+from werkzeug.sansio.multipart import File as FileEvent
+
+from .exceptions import HTTPException
+from .status import status
+
+if t.TYPE_CHECKING:
+    from .typed import FileMarker
+
+#: parts without their own `spool_threshold` move to disk past this size,
+#: the same threshold werkzeug's default stream factory uses
+DEFAULT_SPOOL_THRESHOLD: int = 500 * 1024
+
+
+def _allowed(content_type: str | None, allowed_types: tuple[str, ...]) -> bool:
+    mimetype: str = (content_type or "").split(";", 1)[0].strip().lower()
+    for allowed in allowed_types:
+        if allowed.endswith("/*"):
+            if mimetype.startswith(allowed[:-1]):
+                return True
+        elif mimetype == allowed:
+            return True
+    return False
+
+
+class UploadSpool:
+    """Writable, then readable, container for one uploaded file.
+
+    Chunks from the multipart parser are kept in memory up to
+    `spool_threshold`, then the spool rolls over to a temporary file in
+    `dest_dir`. `max_size` is checked on every write, so an oversized part
+    stops the upload with `413` as soon as the limit is crossed.
+
+    Available as `FileStorage.stream` in the handler:
+    ```
+    upload.stream.size, upload.stream.checksum, upload.stream.path
+    ```
+    """
+
+    def __init__(self, marker: FileMarker) -> None:
+        self.max_size: int | None = marker.max_size
+        self.spool_threshold: int = (
+            DEFAULT_SPOOL_THRESHOLD
+            if marker.spool_threshold is None
+            else marker.spool_threshold
+        )
+        self.dest_dir: str | None = marker.dest_dir
+        self.size: int = 0
+        self._hash = hashlib.new(marker.checksum) if marker.checksum else None
+        self._file: t.IO[bytes] = BytesIO()
+        self._rolled: bool = False
+
+    @property
+    def path(self) -> str | None:
+        """temporary file holding the upload, `None` while it is in memory"""
+        return self._file.name if self._rolled else None  # type: ignore[return-value]
+
+    @property
+    def checksum(self) -> str | None:
+        """running hex digest of everything written, when `checksum` was set"""
+        return self._hash.hexdigest() if self._hash else None
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            raise self.too_large()
+        if self._hash is not None:
+            self._hash.update(data)
+        if not self._rolled and self.size > self.spool_threshold:
+            self._rollover()
+        return self._file.write(data)
+
+    def too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.PAYLOAD_TOO_LARGE,
+            detail=f"Uploaded file exceeds the limit of {self.max_size} bytes.",
+        )
+
+    def _rollover(self) -> None:
+        memory = t.cast(BytesIO, self._file)
+        self._file = NamedTemporaryFile(
+            mode="w+b", dir=self.dest_dir, prefix="nova-upload-"
+        )
+        self._file.write(memory.getbuffer())
+        memory.close()
+        self._rolled = True
+
+    def __getattr__(self, name: str) -> t.Any:
+        # read, seek, tell, close, fileno... of the current file
+        return getattr(self._file, name)
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        return iter(self._file)
+
+
+class UploadMultiPartParser(MultiPartParser):
+    """`MultiPartParser` that spools the parts declared with `File(...)`."""
+
+    def __init__(self, uploads: t.Mapping[str, FileMarker], **kwargs: t.Any) -> None:
+        super().__init__(**kwargs)
+        self.uploads = uploads
+
+    def start_file_streaming(
+        self, event: FileEvent, total_content_length: int | None
+    ) -> t.IO[bytes]:
+        marker = self.uploads.get(event.name)
+        if marker is None:
+            return super().start_file_streaming(event, total_content_length)
+
+        content_type: str | None = event.headers.get("content-type")
+        if marker.allowed_types and not _allowed(content_type, marker.allowed_types):
+            raise HTTPException(
+                status_code=status.UNSUPPORTED_MEDIA_TYPE,
+                detail=f"`{event.name}` must be one of {list(marker.allowed_types)}, "
+                f"got {content_type!r}.",
+            )
+        spool = UploadSpool(marker)
+        declared: str = event.headers.get("content-length", "")
+        if spool.max_size is not None and declared.isdigit():
+            # refuse before reading when the part announces its size
+            if int(declared) > spool.max_size:
+                raise spool.too_large()
+        return t.cast(t.IO[bytes], spool)
+
+
+class UploadFormDataParser(FormDataParser):
+    """`FormDataParser` for routes with `File(...)` parameters."""
+
+    def __init__(self, uploads: t.Mapping[str, FileMarker], **kwargs: t.Any) -> None:
+        super().__init__(**kwargs)
+        self.uploads = uploads
+
+    def _parse_multipart(
+        self,
+        stream: t.IO[bytes],
+        mimetype: str,
+        content_length: int | None,
+        options: dict[str, str],
+    ):
+        parser = UploadMultiPartParser(
+            self.uploads,
+            stream_factory=self.stream_factory,
+            max_form_memory_size=self.max_form_memory_size,
+            max_form_parts=self.max_form_parts,
+            cls=self.cls,
+        )
+        boundary = options.get("boundary", "").encode("ascii")
+
+        if not boundary:
+            raise ValueError("Missing boundary")
+
+        form, files = parser.parse(stream, boundary, content_length)
+        return stream, form, files
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import typing as t
+from functools import cached_property
+
+from flask import Request as _Request
+from flask import current_app, has_request_context, request
+from flask.ctx import _AppCtxGlobals
+from werkzeug.formparser import FormDataParser
+
+from .uploads import UploadFormDataParser
+
+if t.TYPE_CHECKING:
+    from .di import DependencyScope
+    from .plan import RoutePlan
+    from .tracing import RequestSpans, TraceContext
+
+
+class NovaRequest(_Request):
+    """Request carrying the per-request state FlaskNova needs between stages.
+
+    Keeping it on the request instead of the app makes concurrent requests on
+    threaded or free-threaded servers independent of each other.
+    """
+
+    #: compiled plan of the matched route, set before the `before_request` hooks
+    route_plan: RoutePlan | None = None
+
+    #: request-scoped `Depend` values and teardowns, created on first use
+    dependencies: DependencyScope | None = None
+
+    #: `app.cache` key and tags the response is stored under after a miss
+    cache_key: str | None = None
+    cache_tags: tuple[str, ...] = ()
+
+    #: spans of the request when it is sampled and `TRACING_SINK` is set
+    spans: RequestSpans | None = None
+
+    #: `time.perf_counter()` at the first hook and seconds spent in each stage
+    #: (`bind`, `handler`, ...), while `METRICS` is on
+    metrics_started: float | None = None
+    stage_durations: dict[str, float] | None = None
+
+    @cached_property
+    def trace(self) -> TraceContext:
+        """W3C trace context of `traceparent`/`tracestate`, IDs made on first read"""
+        return current_app.tracer.context(self)  # type: ignore[attr-defined]
+
+    def make_form_data_parser(self) -> FormDataParser:
+        """stream the `File(...)` parts of the matched route with their limits"""
+        uploads = self.route_plan.uploads if self.route_plan else None
+        if not uploads:
+            return super().make_form_data_parser()
+        return UploadFormDataParser(
+            uploads,
+            stream_factory=self._get_file_stream,
+            max_form_memory_size=self.max_form_memory_size,
+            max_content_length=self.max_content_length,
+            max_form_parts=self.max_form_parts,
+            cls=self.parameter_storage_class,
+        )
+
+
+class NovaGlobals(_AppCtxGlobals):
+    """`g` of a :class:`FlaskNova` app.
+
+    `g.trace_id` reads `request.trace`, so the ID is only parsed or generated
+    for requests that use it (a log line, an error response).
+    """
+
+    def __getattr__(self, name: str) -> t.Any:
+        if name == "trace_id" and has_request_context():
+            trace: TraceContext | None = getattr(request, "trace", None)
+            if trace is not None:
+                return trace.trace_id
+        return super().__getattr__(name)
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from collections.abc import Iterator
+
+from pydantic import BaseModel
+
+from flask_nova import Depend, FlaskNova, HTTPException, status
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+async def get_tenant():
+    await asyncio.sleep(0)
+    return "acme"
+
+
+def call(app, method, path, body=b"", headers=(), query=b""):
+    """drive one HTTP request through `app.asgi` and collect what it sends"""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "root_path": "",
+        "query_string": query,
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 5000),
+    }
+    asyncio.run(app.asgi(scope, receive, send))
+    start = sent[0]
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return start["status"], dict(start["headers"]), body
+
+
+class ASGITestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.post("/items", response_model=Item)
+        def create(item: Item):
+            return item
+
+        @self.app.get("/items/<int:item_id>")
+        async def read(item_id: int, q: str = "") -> Item:
+            await asyncio.sleep(0)
+            return Item(name=f"{item_id}{q}", price=1)
+
+        @self.app.get("/missing")
+        async def missing():
+            raise HTTPException(status_code=status.NOT_FOUND, detail="gone")
+
+        @self.app.get("/tenant")
+        def tenant(name=Depend(get_tenant)):
+            return {"tenant": name}
+
+        @self.app.get("/export")
+        def export() -> Iterator[Item]:
+            for i in range(3):
+                yield Item(name=str(i), price=i)
+
+    def test_sync_view_with_json_body(self):
+        code, headers, body = call(
+            self.app,
+            "POST",
+            "/items",
+            body=b'{"name": "pen", "price": 2}',
+            headers=[("content-type", "application/json")],
+        )
+        self.assertEqual(code, 200)
+        self.assertEqual(headers[b"content-type"], b"application/json")
+        self.assertEqual(json.loads(body), {"name": "pen", "price": 2.0})
+
+    def test_async_view_is_awaited(self):
+        code, _, body = call(self.app, "GET", "/items/7", query=b"q=x")
+        self.assertEqual(code, 200)
+        self.assertEqual(json.loads(body)["name"], "7x")
+
+    def test_async_dependency_on_server_loop(self):
+        code, _, body = call(self.app, "GET", "/tenant")
+        self.assertEqual(code, 200)
+        self.assertEqual(json.loads(body), {"tenant": "acme"})
+
+    def test_http_exception_is_problem_details(self):
+        code, headers, body = call(self.app, "GET", "/missing")
+        self.assertEqual(code, 404)
+        self.assertEqual(headers[b"content-type"], b"application/problem+json")
+        self.assertEqual(json.loads(body)["detail"], "gone")
+
+    def test_invalid_body_and_size_limit(self):
+        code, _, _ = call(
+            self.app,
+            "POST",
+            "/items",
+            body=b'{"name": "pen"}',
+            headers=[("content-type", "application/json")],
+        )
+        self.assertEqual(code, 422)
+
+        self.app.config["MAX_CONTENT_LENGTH"] = 8
+        code, _, _ = call(self.app, "POST", "/items", body=b"x" * 64)
+        self.assertEqual(code, 413)
+
+    def test_streamed_response(self):
+        code, _, body = call(self.app, "GET", "/export")
+        self.assertEqual(code, 200)
+        self.assertEqual([item["name"] for item in json.loads(body)], ["0", "1", "2"])
+
+    def test_lifespan(self):
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(self.app.asgi({"type": "lifespan"}, receive, send))
+        self.assertEqual(
+            sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        )
+
+    def test_whole_dispatch_is_profiled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.app.config.update(PROFILE_DIR=tmp, PROFILE_SAMPLE={"*": 1.0})
+            status_code, _, _ = call(self.app, "GET", "/items/1")
+            [name] = os.listdir(tmp)
+            stats = pstats.Stats(os.path.join(tmp, name))
+        self.assertEqual(status_code, 200)
+        profiled = {function for _, _, function in stats.stats}
+        self.assertIn("finalize_request", profiled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import pickle
+import time
+import unittest
+
+from pydantic import BaseModel
+
+from flask_nova import CachePolicy, Depend, FlaskNova, Header, NovaBlueprint
+from flask_nova.cache import CacheBackend, CacheEntry, MemoryCache
+
+calls = {"item": 0, "user": 0, "slow": 0}
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def get_user():
+    calls["user"] += 1
+    return "ada"
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        for key in calls:
+            calls[key] = 0
+        self.app = FlaskNova(__name__)
+
+        @self.app.get(
+            "/items/<int:item_id>",
+            cache=CachePolicy(ttl=60, tags=["items", "item:{item_id}"]),
+        )
+        def read_item(item_id: int, user=Depend(get_user)) -> Item:
+            calls["item"] += 1
+            return Item(id=item_id, name=user)
+
+        @self.app.get("/lang", cache=CachePolicy(ttl=60, vary=["Accept-Language"]))
+        def lang(x_tenant: str = Header(default="acme")):
+            return {"tenant": x_tenant, "calls": calls["item"]}
+
+        @self.app.get("/slow", cache=CachePolicy(ttl=0.05, stale_while_revalidate=5))
+        def slow():
+            calls["slow"] += 1
+            return {"version": calls["slow"]}
+
+        self.client = self.app.test_client()
+
+    def test_hit_skips_binding_and_handler(self):
+        first = self.client.get("/items/1")
+        second = self.client.get("/items/1")
+        self.assertEqual(first.get_json(), second.get_json())
+        self.assertEqual(calls, {"item": 1, "user": 1, "slow": 0})
+        self.assertIn("Age", second.headers)
+        self.assertEqual(second.mimetype, "application/json")
+
+    def test_key_uses_validated_parameters(self):
+        self.client.get("/items/1")
+        self.client.get("/items/01")  # same validated `item_id`
+        self.client.get("/items/2")
+        self.assertEqual(calls["item"], 2)
+
+    def test_vary_headers(self):
+        self.client.get("/lang", headers={"Accept-Language": "en"})
+        calls["item"] = 5
+        cached = self.client.get("/lang", headers={"Accept-Language": "en"})
+        fresh = self.client.get("/lang", headers={"Accept-Language": "fr"})
+        other = self.client.get("/lang", headers={"X-Tenant": "globex"})
+        self.assertEqual(cached.get_json()["calls"], 0)
+        self.assertEqual(fresh.get_json()["calls"], 5)
+        self.assertEqual(other.get_json()["tenant"], "globex")
+
+    def test_invalidate_by_tag(self):
+        self.client.get("/items/1")
+        self.client.get("/items/2")
+        self.assertEqual(self.app.cache.invalidate(tag="item:1"), 1)
+        self.client.get("/items/1")
+        self.client.get("/items/2")
+        self.assertEqual(calls["item"], 3)
+        self.assertEqual(self.app.cache.invalidate(tag="items"), 2)
+
+    def test_blueprint_route(self):
+        bp = NovaBlueprint("shop", __name__, url_prefix="/shop")
+
+        @bp.get("/items/<int:item_id>", cache=CachePolicy(ttl=60, tags=["shop"]))
+        def shop_item(item_id: int) -> Item:
+            calls["item"] += 1
+            return Item(id=item_id, name="shop")
+
+        self.app.register_blueprint(bp)
+        miss = self.client.get("/shop/items/1")
+        hit = self.client.get("/shop/items/1")
+        self.assertEqual(miss.get_json(), hit.get_json())
+        self.assertNotIn("Age", miss.headers)
+        self.assertIn("Age", hit.headers)
+        self.client.get("/shop/items/2")
+        self.assertEqual(calls["item"], 2)
+        self.assertEqual(self.app.cache.invalidate(tag="shop"), 2)
+
+    def test_errors_are_not_cached(self):
+        self.client.get("/items/x")
+        self.assertEqual(self.client.get("/items/x").status_code, 404)
+        self.assertEqual(len(self.app.cache.backend), 0)
+
+    def test_stale_while_revalidate(self):
+        self.assertEqual(self.client.get("/slow").get_json()["version"], 1)
+        time.sleep(0.1)
+        # stale copy served at once, refreshed in the background
+        self.assertEqual(self.client.get("/slow").get_json()["version"], 1)
+        deadline = time.time() + 2
+        while calls["slow"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(self.client.get("/slow").get_json()["version"], 2)
+
+    def test_unknown_tag_parameter_fails_at_registration(self):
+        with self.assertRaisesRegex(ValueError, "unknown parameter 'slug'"):
+
+            @self.app.get(
+                "/posts/<int:post_id>", cache=CachePolicy(ttl=1, tags=["post:{slug}"])
+            )
+            def post(post_id: int):
+                return {}
+
+
+class MemoryCacheTestCase(unittest.TestCase):
+    def entry(self, *tags):
+        return CacheEntry(b"{}", 200, [], tags, ttl=60, stale_while_revalidate=0)
+
+    def test_lru_eviction_per_shard(self):
+        cache = MemoryCache(max_entries=2, shards=1)
+        cache.set("a", self.entry())
+        cache.set("b", self.entry())
+        cache.get("a")
+        cache.set("c", self.entry())
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entries_are_dropped(self):
+        cache = MemoryCache()
+        entry = self.entry("t")
+        entry.stale = time.time() - 1
+        cache.set("a", entry)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.invalidate(["t"]), 0)
+
+    def test_entry_pickles(self):
+        entry = pickle.loads(pickle.dumps(self.entry("t")))
+        self.assertEqual((entry.body, entry.tags), (b"{}", ("t",)))
+
+    def test_backends_implement_every_method(self):
+        class GetOnly(CacheBackend):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import gzip
+import json
+import unittest
+import zlib
+from collections.abc import Iterator
+
+from flask import Response
+from pydantic import BaseModel
+
+from flask_nova import FlaskNova, HTTPException, NovaBlueprint, status
+from flask_nova.compression import available_encodings
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+ITEMS = [Item(name=f"item-{i}", price=i) for i in range(200)]
+
+
+class CompressionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+        self.app.config["COMPRESS"] = True
+
+        @self.app.get("/items")
+        def items() -> list[Item]:
+            return ITEMS
+
+        @self.app.get("/small")
+        def small():
+            return {"ok": True}
+
+        @self.app.get("/raw", compress=False)
+        def raw() -> list[Item]:
+            return ITEMS
+
+        @self.app.get("/export")
+        def export() -> Iterator[Item]:
+            yield from ITEMS
+
+        @self.app.get("/missing")
+        def missing():
+            raise HTTPException(status_code=status.NOT_FOUND, detail="gone")
+
+        @self.app.get("/image")
+        def image():
+            return Response(b"\x89PNG" * 1000, mimetype="image/png")
+
+        self.client = self.app.test_client()
+
+    def test_off_by_default(self):
+        app = FlaskNova(__name__)
+        app.get("/items")(lambda: {"items": [item.name for item in ITEMS]})
+        client = app.test_client()
+        for path in ("/items", "/openapi.json"):
+            res = client.get(path, headers={"Accept-Encoding": "gzip"})
+            self.assertNotIn("Content-Encoding", res.headers)
+
+    def test_gzip_and_deflate(self):
+        res = self.client.get("/items", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res.vary)
+        self.assertEqual(len(json.loads(gzip.decompress(res.data))), 200)
+        self.assertEqual(int(res.headers["Content-Length"]), len(res.data))
+
+        res = self.client.get("/items", headers={"Accept-Encoding": "deflate"})
+        self.assertEqual(res.headers["Content-Encoding"], "deflate")
+        self.assertEqual(len(json.loads(zlib.decompress(res.data))), 200)
+
+    def test_preferred_encoding(self):
+        res = self.client.get(
+            "/items", headers={"Accept-Encoding": "gzip;q=0.5, deflate"}
+        )
+        self.assertEqual(res.headers["Content-Encoding"], "deflate")
+        res = self.client.get("/items", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertIn("Accept-Encoding", res.vary)
+
+    @unittest.skipUnless("br" in available_encodings(), "needs brotli")
+    def test_brotli(self):
+        import brotli
+
+        res = self.client.get("/items", headers={"Accept-Encoding": "gzip, br"})
+        self.assertEqual(res.headers["Content-Encoding"], "br")
+        self.assertEqual(len(json.loads(brotli.decompress(res.data))), 200)
+
+    def test_skipped_responses(self):
+        headers = {"Accept-Encoding": "gzip"}
+        res = self.client.get("/small", headers=headers)
+        self.assertNotIn("Content-Encoding", res.headers)
+        res = self.client.get("/raw", headers=headers)
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertNotIn("Accept-Encoding", res.vary)
+        res = self.client.get("/image", headers=headers)
+        self.assertNotIn("Content-Encoding", res.headers)
+
+        self.app.config["COMPRESS"] = False
+        res = self.client.get("/items", headers=headers)
+        self.assertNotIn("Content-Encoding", res.headers)
+
+    def test_blueprint_route_opt_out(self):
+        bp = NovaBlueprint("export", __name__, url_prefix="/export")
+
+        @bp.get("/items")
+        def items() -> list[Item]:
+            return ITEMS
+
+        @bp.get("/raw", compress=False)
+        def raw() -> list[Item]:
+            return ITEMS
+
+        self.app.register_blueprint(bp)
+        headers = {"Accept-Encoding": "gzip"}
+        res = self.client.get("/export/items", headers=headers)
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        res = self.client.get("/export/raw", headers=headers)
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertEqual(len(res.get_json()), 200)
+
+    def test_threshold_and_level(self):
+        self.app.config["COMPRESS_MIN_SIZE"] = 0
+        res = self.client.get("/small", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(json.loads(gzip.decompress(res.data)), {"ok": True})
+
+        raw = self.client.get("/raw").data
+        self.app.config["COMPRESS_LEVEL"] = 0  # stored, not deflated
+        stored = self.client.get("/items", headers={"Accept-Encoding": "gzip"})
+        self.assertGreater(len(stored.data), len(raw))
+        self.app.config["COMPRESS_LEVEL"] = {"gzip": 9}
+        best = self.client.get("/items", headers={"Accept-Encoding": "gzip"})
+        self.assertLess(len(best.data), len(raw))
+
+    def test_streamed_body_is_compressed_incrementally(self):
+        res = self.client.get("/export", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", res.headers)
+        self.assertEqual(len(json.loads(gzip.decompress(res.data))), 200)
+
+    def test_problem_details_are_compressed(self):
+        self.app.config["COMPRESS_MIN_SIZE"] = 0
+        res = self.client.get("/missing", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(res.status_code, 404)
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(res.data))["status"], 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
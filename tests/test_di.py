@@ -0,0 +1,202 @@
+import asyncio
+import time
+import unittest
+import weakref
+
+from flask import g
+
+from flask_nova import Depend, FlaskNova
+from flask_nova.di import _close_at_exit, app_scope
+
+calls = {"engine": 0, "settings": 0, "token": 0}
+events = []
+
+
+def get_engine():
+    calls["engine"] += 1
+    return object()
+
+
+def get_settings():
+    calls["settings"] += 1
+    return {"debug": True}
+
+
+def get_session(engine=Depend(get_engine, scope="app")):
+    events.append("open")
+    yield {"engine": engine}
+    events.append("close")
+
+
+def get_token():
+    calls["token"] += 1
+    return calls["token"]
+
+
+def get_user(session=Depend(get_session), settings=Depend(get_settings)):
+    return {"session": session, "settings": settings}
+
+
+class DependencyGraphTestCase(unittest.TestCase):
+    def setUp(self):
+        for key in calls:
+            calls[key] = 0
+        events.clear()
+        self.app = FlaskNova(__name__)
+
+        @self.app.get("/me")
+        def me(
+            user=Depend(get_user),
+            session=Depend(get_session),
+            first=Depend(get_token, scope="transient"),
+            second=Depend(get_token, scope="transient"),
+        ):
+            return {
+                "shared": user["session"] is session,
+                "engine": id(session["engine"]),
+                "tokens": [first, second],
+            }
+
+        self.client = self.app.test_client()
+
+    def test_request_scope_is_shared_and_torn_down(self):
+        body = self.client.get("/me").get_json()
+        self.assertTrue(body["shared"])
+        self.assertEqual(events, ["open", "close"])
+        self.assertEqual(calls["settings"], 1)
+        self.assertEqual(sorted(body["tokens"]), [1, 2])
+
+    def test_app_scope_is_built_once(self):
+        first = self.client.get("/me").get_json()["engine"]
+        second = self.client.get("/me").get_json()["engine"]
+        self.assertEqual(first, second)
+        self.assertEqual(calls["engine"], 1)
+        self.assertEqual(calls["settings"], 2)
+
+    def test_graph_is_topologically_ordered(self):
+        order = [node.func for node in Depend(get_user).graph.nodes]
+        self.assertEqual(order, [get_engine, get_session, get_settings, get_user])
+
+    def test_invalid_graphs_fail_at_registration(self):
+        def needs_request(settings=Depend(get_settings)):
+            return settings
+
+        with self.assertRaisesRegex(ValueError, "app-scoped"):
+            Depend(needs_request, scope="app").graph
+        with self.assertRaisesRegex(ValueError, "scope must be one of"):
+            Depend(get_settings, scope="session")  # type: ignore[arg-type]
+
+    def test_swapped_dependency_recompiles(self):
+        marker = Depend(get_settings)
+        graph = marker.graph
+        marker.dependency = lambda: {"debug": False}
+        self.assertIsNot(marker.graph, graph)
+
+    def test_graph_is_reused_across_requests(self):
+        self.client.get("/me")
+        graph = self.app._route_plans[("/me", "GET")].dependencies
+        self.client.get("/me")
+        self.assertIs(self.app._route_plans[("/me", "GET")].dependencies, graph)
+
+    def test_app_scope_is_closed_at_exit(self):
+        def get_pool():
+            yield "pool"
+            events.append("close pool")
+
+        self.app.get("/pool")(lambda pool=Depend(get_pool, scope="app"): {})
+        self.client.get("/pool")
+        _close_at_exit(weakref.ref(app_scope(self.app)))
+        _close_at_exit(weakref.ref(app_scope(self.app)))
+        self.assertEqual(events, ["close pool"])
+
+
+def slow_auth():
+    time.sleep(0.2)
+    return g.trace_id
+
+
+def slow_flags():
+    time.sleep(0.2)
+    return {"beta": True}
+
+
+async def slow_tenant():
+    await asyncio.sleep(0.2)
+    return "acme"
+
+
+async def slow_quota(tenant=Depend(slow_tenant)):
+    await asyncio.sleep(0.2)
+    return f"{tenant}:100"
+
+
+def slow_client():
+    time.sleep(0.2)
+    return object()
+
+
+def slow_pool():
+    time.sleep(0.2)
+    return object()
+
+
+class ConcurrentDependencyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.get("/sync")
+        def sync_view(auth=Depend(slow_auth), flags=Depend(slow_flags)):
+            return {"auth": auth, "flags": flags}
+
+        @self.app.get("/mixed")
+        async def mixed_view(
+            auth=Depend(slow_auth),
+            tenant=Depend(slow_tenant),
+            quota=Depend(slow_quota),
+        ):
+            return {"auth": auth, "tenant": tenant, "quota": quota}
+
+        self.client = self.app.test_client()
+
+    def test_sync_dependencies_overlap(self):
+        start = time.perf_counter()
+        body = self.client.get("/sync").get_json()
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(len(body["auth"]), 32)  # app context reached the worker
+
+    def test_async_dependencies_are_gathered(self):
+        start = time.perf_counter()
+        body = self.client.get("/mixed").get_json()
+        # slowest chain is tenant -> quota, auth runs alongside it
+        self.assertLess(time.perf_counter() - start, 0.55)
+        self.assertEqual(body["quota"], "acme:100")
+
+    def test_sequential_when_pool_disabled(self):
+        self.app.config["DEPENDENCY_WORKERS"] = 0
+        start = time.perf_counter()
+        self.client.get("/sync")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.4)
+
+    def test_app_values_are_built_concurrently(self):
+        @self.app.get("/app")
+        def app_view(
+            client=Depend(slow_client, scope="app"),
+            pool=Depend(slow_pool, scope="app"),
+        ):
+            return {"same": client is pool}
+
+        start = time.perf_counter()
+        self.assertEqual(self.client.get("/app").get_json(), {"same": False})
+        self.assertLess(time.perf_counter() - start, 0.35)
+
+    def test_graph_levels(self):
+        graph = self.app._route_plans[("/mixed", "GET")].dependencies
+        self.assertEqual(
+            [[node.func for node in level] for level in graph.levels],
+            [[slow_auth, slow_tenant], [slow_quota]],
+        )
+        self.assertTrue(graph.awaitable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# budget for `from flask_nova import FlaskNova` in a fresh interpreter, loose
+# enough for slow CI machines; about 0.1s locally, most of it pydantic
+IMPORT_BUDGET: float = 1.0
+
+
+def run(code):
+    """run `code` in a fresh interpreter and return what it printed as JSON"""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_package_import_is_lazy(self):
+        loaded = run(
+            "import sys, json, flask_nova\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith("
+            "('pydantic', 'click', 'flask_nova.')))))"
+        )
+        self.assertEqual(loaded, ["flask_nova.status"])
+
+    def test_app_class_import_is_lazy(self):
+        loaded = run(
+            "import sys, json\n"
+            "from flask_nova import FlaskNova\n"
+            "print(json.dumps(sorted(sys.modules)))"
+        )
+        for module in (
+            "flask_nova._task",
+            "flask_nova.cache",
+            "flask_nova.compression",
+            "flask_nova.docs",
+            "flask_nova.helpers",
+            "flask_nova.metrics",
+            "flask_nova.plan",
+            "flask_nova.profiling",
+            "flask_nova.snapshot",
+            "flask_nova.tracing",
+        ):
+            self.assertNotIn(module, loaded)
+
+    def test_exports_resolve_on_access(self):
+        names = run(
+            "import json, flask_nova\n"
+            "print(json.dumps([type(getattr(flask_nova, name)).__name__"
+            " for name in ('FlaskNova', 'Depend', 'cli')]))"
+        )
+        self.assertEqual(names, ["type", "type", "Group"])
+
+    def test_star_import(self):
+        names = run(
+            "import json\nfrom flask_nova import *\n"
+            "print(json.dumps(sorted(n for n in dir() if not n.startswith('_'))))"
+        )
+        self.assertIn("FlaskNova", names)
+        self.assertIn("CachePolicy", names)
+
+    def test_import_budget(self):
+        elapsed = run(
+            "import json, time\n"
+            "start = time.perf_counter()\n"
+            "from flask_nova import FlaskNova\n"
+            "print(json.dumps(time.perf_counter() - start))"
+        )
+        self.assertLess(elapsed, IMPORT_BUDGET)
+
+    def test_unknown_attribute(self):
+        import flask_nova
+
+        with self.assertRaises(AttributeError):
+            flask_nova.missing
@@ -0,0 +1,100 @@
+import json
+import unittest
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from flask import request
+
+from flask_nova import FlaskNova
+from flask_nova.json_provider import CODECS, JSONCodec, get_codec
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+PAYLOAD = {
+    "id": UUID("12345678-1234-5678-1234-567812345678"),
+    "at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "price": Decimal("9.99"),
+    "point": Point(1, 2),
+}
+
+
+class JSONCodecTestCase(unittest.TestCase):
+    def test_codecs_share_wire_format(self):
+        expected = json.loads(JSONCodec().encode(PAYLOAD))
+        self.assertEqual(expected["id"], "12345678-1234-5678-1234-567812345678")
+        self.assertEqual(expected["price"], "9.99")
+        self.assertEqual(expected["point"], {"x": 1, "y": 2})
+
+        for name in CODECS:
+            try:
+                codec = CODECS[name]()
+            except ImportError:
+                continue
+            with self.subTest(codec=name):
+                self.assertEqual(json.loads(codec.encode(PAYLOAD)), expected)
+                self.assertEqual(codec.decode(b'{"a": [1, 2]}'), {"a": [1, 2]})
+
+    def test_sort_keys(self):
+        for name in CODECS:
+            try:
+                codec = CODECS[name](sort_keys=True)
+            except ImportError:
+                continue
+            with self.subTest(codec=name):
+                self.assertEqual(
+                    codec.encode({"b": 1, "a": {"d": 1, "c": 2}}),
+                    b'{"a":{"c":2,"d":1},"b":1}',
+                )
+
+    def test_unknown_provider(self):
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+
+class JSONProviderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.post("/echo")
+        def echo():
+            return {"echo": request.get_json(force=True), **PAYLOAD}
+
+        self.client = self.app.test_client()
+
+    def test_provider_follows_config(self):
+        for name in ("json", "auto"):
+            self.app.config["JSON_PROVIDER"] = name
+            response = self.client.post("/echo", json={"a": 1})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()["echo"], {"a": 1})
+            self.assertEqual(response.get_json()["price"], "9.99")
+
+    def test_keys_are_sorted_like_flask(self):
+        for name in ("json", "auto"):
+            self.app.config["JSON_PROVIDER"] = name
+            with self.subTest(provider=name):
+                body = self.client.post("/echo", json={}).get_data(as_text=True)
+                self.assertLess(body.index('"at"'), body.index('"echo"'))
+
+                self.app.json.sort_keys = False
+                body = self.client.post("/echo", json={}).get_data(as_text=True)
+                self.assertLess(body.index('"echo"'), body.index('"at"'))
+                self.app.json.sort_keys = True
+
+    def test_bad_json_is_bad_request(self):
+        self.app.config["JSON_PROVIDER"] = "auto"
+        response = self.client.post(
+            "/echo", data="{not json", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
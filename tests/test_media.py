@@ -0,0 +1,108 @@
+import unittest
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+from flask_nova import FlaskNova
+from flask_nova.media import BinaryCodec, binary_codecs, binary_media_types
+
+try:
+    import cbor2
+    import msgpack
+except ImportError:  # pragma: no cover - the `msgpack` and `cbor` extras
+    cbor2 = msgpack = None
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class BinaryCodecTestCase(unittest.TestCase):
+    def test_codecs_must_encode_and_decode(self):
+        class EncodeOnly(BinaryCodec):
+            name = "text"
+            mimetype = "text/plain"
+
+            def encode(self, obj):
+                return str(obj).encode()
+
+        with self.assertRaises(TypeError):
+            EncodeOnly()
+
+
+@unittest.skipIf(msgpack is None or cbor2 is None, "needs flasknova[msgpack,cbor]")
+class MediaNegotiationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.post("/items")
+        def create(item: Item) -> Item:
+            return item
+
+        @self.app.get("/points")
+        def points() -> list[Point]:
+            return [Point(1, 2), Point(3, 4)]
+
+        self.client = self.app.test_client()
+
+    def test_codecs_are_registered(self):
+        self.assertEqual(
+            binary_media_types(), ("application/msgpack", "application/cbor")
+        )
+        self.assertIn("application/x-msgpack", binary_codecs())
+
+    def test_msgpack_round_trip(self):
+        res = self.client.post(
+            "/items",
+            data=msgpack.packb({"name": "pen", "price": 2}),
+            content_type="application/msgpack",
+            headers={"Accept": "application/msgpack"},
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, "application/msgpack")
+        self.assertEqual(msgpack.unpackb(res.data), {"name": "pen", "price": 2.0})
+        self.assertIn("Accept", res.vary)
+
+    def test_cbor_response_for_generic_model(self):
+        res = self.client.get("/points", headers={"Accept": "application/cbor"})
+        self.assertEqual(res.mimetype, "application/cbor")
+        self.assertEqual(cbor2.loads(res.data), [{"x": 1, "y": 2}, {"x": 3, "y": 4}])
+
+    def test_json_stays_the_default(self):
+        res = self.client.get(
+            "/points", headers={"Accept": "application/json, application/cbor;q=0.5"}
+        )
+        self.assertEqual(res.mimetype, "application/json")
+        res = self.client.get("/points", headers={"Accept": "*/*"})
+        self.assertEqual(res.mimetype, "application/json")
+
+    def test_invalid_binary_body(self):
+        res = self.client.post(
+            "/items", data=b"\xc1", content_type="application/msgpack"
+        )
+        self.assertEqual(res.status_code, 422)
+        res = self.client.post(
+            "/items",
+            data=cbor2.dumps({"name": "pen"}),
+            content_type="application/cbor",
+        )
+        self.assertEqual(res.status_code, 422)
+        self.assertEqual(res.get_json()["errors"][0]["loc"], ["price"])
+
+    def test_openapi_lists_binary_media_types(self):
+        paths = self.client.get("/openapi.json").get_json()["paths"]
+        content = paths["/items"]["post"]["requestBody"]["content"]
+        self.assertCountEqual(
+            content, ["application/json", "application/msgpack", "application/cbor"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
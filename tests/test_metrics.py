@@ -0,0 +1,298 @@
+import concurrent.futures as cf
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from pydantic import BaseModel
+
+from flask_nova import Depend, FlaskNova
+from flask_nova.metrics import (
+    CONTENT_TYPE,
+    IN_FLIGHT,
+    REQUESTS,
+    MmapFile,
+    render,
+)
+
+
+class Item(BaseModel):
+    name: str
+
+
+def get_user():
+    return "nova"
+
+
+def sample(text, name, **labels):
+    """value of the sample `name{labels}` in an exposition, `None` when absent"""
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        series, value = line.rsplit(" ", 1)
+        metric, _, label_text = series.partition("{")
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', label_text))
+        if metric == name and found == labels:
+            return float(value)
+    return None
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = app = FlaskNova(__name__)
+        app.config["METRICS"] = True
+
+        @app.post("/items/<int:item_id>")
+        def create_item(item_id: int, item: Item, user=Depend(get_user)) -> Item:
+            return Item(name=f"{item.name}-{item_id}-{user}")
+
+        @app.get("/in-flight")
+        def in_flight() -> dict:
+            return {"text": app.metrics.render()}
+
+        self.client = app.test_client()
+
+    def scrape(self):
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, CONTENT_TYPE)
+        return response.get_data(as_text=True)
+
+    def test_requests_by_route_template(self):
+        for item_id in (1, 2, 3):
+            self.client.post(f"/items/{item_id}", json={"name": "a"})
+        self.client.post("/items/4", json={"name": 1})
+        self.client.get("/missing")
+        text = self.scrape()
+
+        route = "/items/<int:item_id>"
+        self.assertEqual(
+            sample(
+                text, "nova_requests_total", route=route, method="POST", status="200"
+            ),
+            3,
+        )
+        self.assertEqual(
+            sample(
+                text, "nova_requests_total", route=route, method="POST", status="422"
+            ),
+            1,
+        )
+        self.assertEqual(
+            sample(
+                text,
+                "nova_requests_total",
+                route="<unmatched>",
+                method="GET",
+                status="404",
+            ),
+            1,
+        )
+        self.assertIn("# TYPE nova_request_duration_seconds histogram", text)
+        self.assertEqual(
+            sample(
+                text, "nova_request_duration_seconds_count", route=route, method="POST"
+            ),
+            4,
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        self.client.post("/items/1", json={"name": "a"})
+        text = self.scrape()
+        labels = {"route": "/items/<int:item_id>", "method": "POST"}
+        counts = [
+            float(value)
+            for value in re.findall(
+                r'nova_request_size_bytes_bucket\{route="/items/<int:item_id>",'
+                r'method="POST",le="[^"]+"\} (\S+)',
+                text,
+            )
+        ]
+        self.assertEqual(len(counts), 7)
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(counts[0], 1)  # `{"name":"a"}` is under 100 bytes
+        self.assertEqual(sample(text, "nova_request_size_bytes_sum", **labels), 12)
+        self.assertEqual(sample(text, "nova_response_size_bytes_count", **labels), 1)
+
+    def test_stage_durations(self):
+        self.client.post("/items/1", json={"name": "a"})
+        text = self.scrape()
+        for stage in ("bind", "dependencies", "handler", "serialize"):
+            self.assertEqual(
+                sample(
+                    text,
+                    "nova_stage_duration_seconds_count",
+                    route="/items/<int:item_id>",
+                    method="POST",
+                    stage=stage,
+                ),
+                1,
+                stage,
+            )
+
+    def test_in_flight(self):
+        text = self.client.get("/in-flight").get_json()["text"]
+        self.assertEqual(sample(text, "nova_requests_in_flight"), 1)
+        self.assertEqual(sample(self.scrape(), "nova_requests_in_flight"), 1)
+        self.assertEqual(
+            sample(self.app.metrics.render(), "nova_requests_in_flight"), 0
+        )
+
+    def test_threads_record_into_their_own_shard(self):
+        with cf.ThreadPoolExecutor(8) as pool:
+            list(
+                pool.map(
+                    lambda i: self.client.post(f"/items/{i}", json={"name": "a"}),
+                    range(64),
+                )
+            )
+        self.assertGreater(len(self.app.metrics._shards._shards), 1)
+        self.assertEqual(
+            sample(
+                self.app.metrics.render(),
+                "nova_requests_total",
+                route="/items/<int:item_id>",
+                method="POST",
+                status="200",
+            ),
+            64,
+        )
+
+    def test_disabled_by_default(self):
+        self.app.config["METRICS"] = False
+        self.client.post("/items/1", json={"name": "a"})
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+        self.assertEqual(self.app.metrics._shards.collect(), {})
+
+    def test_not_documented(self):
+        self.app.get("/metrics-report")(lambda: {})
+        self.client.get("/metrics")
+        paths = self.app.openapi["paths"]
+        self.assertNotIn("/metrics", paths)
+        self.assertIn("/metrics-report", paths)
+
+    def test_metrics_path(self):
+        self.app.config["METRICS_PATH"] = "/internal/metrics"
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+        response = self.client.get("/internal/metrics")
+        self.assertEqual(response.content_type, CONTENT_TYPE)
+
+    def test_app_route_takes_precedence(self):
+        self.app.get("/metrics")(lambda: {"own": True})
+        self.assertEqual(self.client.get("/metrics").get_json(), {"own": True})
+
+    def test_app_route_kept_while_disabled(self):
+        app = FlaskNova(__name__)
+        app.get("/metrics")(lambda: {"own": True})
+        self.assertEqual(app.test_client().get("/metrics").get_json(), {"own": True})
+        self.assertNotIn("nova_metrics", app.blueprints)
+
+    def test_shards_of_exited_threads_are_retired(self):
+        for i in range(20):
+            thread = threading.Thread(
+                target=self.client.post,
+                args=(f"/items/{i}",),
+                kwargs={"json": {"name": "a"}},
+            )
+            thread.start()
+            thread.join()
+        text = self.app.metrics.render()
+        self.assertLessEqual(len(self.app.metrics._shards._shards), 1)
+        self.assertEqual(
+            sample(
+                text,
+                "nova_requests_total",
+                route="/items/<int:item_id>",
+                method="POST",
+                status="200",
+            ),
+            20,
+        )
+        self.assertEqual(sample(text, "nova_requests_in_flight"), 0)
+
+    def test_label_values_are_escaped(self):
+        text = render({(REQUESTS.name, ('/a"b\\', "GET", "200")): [1.0]})
+        self.assertIn('route="/a\\"b\\\\"', text)
+        self.assertIn("nova_requests_in_flight 0", text)
+
+
+class MultiprocessTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.app = app = FlaskNova(__name__)
+        app.config.update(METRICS=True, METRICS_DIR=self.tmp.name)
+
+        @app.get("/ping")
+        def ping() -> dict:
+            return {}
+
+        self.client = app.test_client()
+        self.addCleanup(app.metrics.shutdown)
+
+    def worker_file(self, pid, series):
+        file = MmapFile(os.path.join(self.tmp.name, f"metrics-{pid}.db"))
+        self.addCleanup(file.close)
+        file.write(series)
+        return file
+
+    def dead_pid(self):
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        return process.pid
+
+    def test_file_round_trip(self):
+        file = self.worker_file(1, {(REQUESTS.name, ("/a", "GET", "200")): [2.0]})
+        # known series are updated in place, new ones appended
+        file.write(
+            {
+                (REQUESTS.name, ("/a", "GET", "200")): [5.0],
+                (IN_FLIGHT.name, ()): [1.0],
+            }
+        )
+        self.assertEqual(
+            dict(MmapFile.read(file.path)),
+            {
+                (REQUESTS.name, ("/a", "GET", "200")): [5.0],
+                (IN_FLIGHT.name, ()): [1.0],
+            },
+        )
+
+    def test_file_grows(self):
+        series = {
+            (REQUESTS.name, (f"/{'x' * 100}/{i}", "GET", "200")): [float(i)]
+            for i in range(1000)
+        }
+        file = self.worker_file(1, series)
+        self.assertEqual(dict(MmapFile.read(file.path)), series)
+
+    def test_workers_are_summed(self):
+        self.client.get("/ping")
+        key = (REQUESTS.name, ("/ping", "GET", "200"))
+        self.worker_file(self.dead_pid(), {key: [2.0], (IN_FLIGHT.name, ()): [3.0]})
+        self.worker_file(os.getppid(), {key: [4.0], (IN_FLIGHT.name, ()): [1.0]})
+
+        text = self.client.get("/metrics").get_data(as_text=True)
+        # the counters of an exited worker are kept, its in-flight gauge is not
+        self.assertEqual(
+            sample(
+                text, "nova_requests_total", route="/ping", method="GET", status="200"
+            ),
+            7,
+        )
+        self.assertEqual(sample(text, "nova_requests_in_flight"), 2)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.tmp.name, f"metrics-{os.getpid()}.db"))
+        )
+
+    def test_flusher_writes_in_the_background(self):
+        self.app.config["METRICS_FLUSH_INTERVAL"] = 0.01
+        self.client.get("/ping")
+        self.assertIsNotNone(self.app.metrics._flusher)
+        self.app.metrics.shutdown()
+        path = os.path.join(self.tmp.name, f"metrics-{os.getpid()}.db")
+        series = dict(MmapFile.read(path))
+        self.assertEqual(series[(REQUESTS.name, ("/ping", "GET", "200"))], [1.0])
@@ -123,7 +123,7 @@ class TestFormDependency(unittest.TestCase):
 
         self.assertEqual(response.status_code, status.UNPROCESSABLE_ENTITY)
         response_data = json.loads(response.data)
-        self.assertTrue(any("age" in err["loc"] for err in response_data['detail']))
+        self.assertTrue(any("age" in err["loc"] for err in response_data['errors']))
 
     def test_missing_required_form_field(self):
         """Test a form submission with a missing required field."""
@@ -135,7 +135,7 @@ class TestFormDependency(unittest.TestCase):
 
         self.assertEqual(response.status_code, status.UNPROCESSABLE_ENTITY)
         response_data = json.loads(response.data)
-        self.assertTrue(any("name" in err["loc"] for err in response_data['detail']))
+        self.assertTrue(any("name" in err["loc"] for err in response_data['errors']))
 
     def test_wrong_content_type_for_form(self):
         """Test sending JSON data to an endpoint expecting form data."""
@@ -0,0 +1,258 @@
+import gzip
+import typing as t
+import unittest
+from unittest import mock
+
+from pydantic import BaseModel
+
+from flask_nova import FlaskNova, NovaBlueprint
+from flask_nova.helpers import __openapi__, _split_defs
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+class Node(BaseModel):
+    name: str
+    children: list["Node"] = []
+
+
+T = t.TypeVar("T")
+
+
+class LazyOpenAPITestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__, version="1.0")
+
+        @self.app.get("/items", tags=["items"])
+        def list_items() -> list[Item]:
+            return []
+
+        @self.app.post("/items", tags=["items", "admin"])
+        def create_item(item: Item) -> Item:
+            return item
+
+    def test_registration_does_not_build_the_document(self):
+        with mock.patch("flask_nova.helpers.__openapi__") as build:
+
+            @self.app.get("/other")
+            def other():
+                return {}
+
+            build.assert_not_called()
+
+    def test_document_is_memoized(self):
+        document = self.app.openapi
+        with mock.patch("flask_nova.helpers.__openapi__") as build:
+            self.assertIs(self.app.openapi, document)
+            build.assert_not_called()
+        self.assertEqual(document["info"], {"version": "1.0"})
+        self.assertEqual(document["tags"], ["items", "admin"])
+
+    def test_methods_of_one_path_are_merged(self):
+        operations = self.app.openapi["paths"]["/items"]
+        self.assertEqual(sorted(operations), ["get", "post"])
+
+    def test_new_routes_and_blueprints_are_merged_on_next_access(self):
+        self.app.openapi
+        bp = NovaBlueprint("users", __name__, url_prefix="/users")
+
+        @bp.get("/<int:user_id>", tags=["users"])
+        def read_user(user_id: int):
+            return {}
+
+        self.app.register_blueprint(bp)
+        with mock.patch("flask_nova.helpers.__openapi__", wraps=__openapi__) as build:
+            document = self.app.openapi
+            self.assertEqual(build.call_count, 1)  # only the new route
+        self.assertIn("/users/{user_id}", document["paths"])
+        self.assertIn("/items", document["paths"])
+        self.assertIn("users", document["tags"])
+
+    def test_served_document(self):
+        client = self.app.test_client()
+        self.assertEqual(client.get("/openapi.json").get_json(), self.app.openapi)
+
+
+class EncodedOpenAPITestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.post("/items")
+        def create_item(item: Item) -> Item:
+            return item
+
+        self.client = self.app.test_client()
+
+    def test_encoded_once_per_version(self):
+        with mock.patch.object(
+            self.app.json, "encode", wraps=self.app.json.encode
+        ) as encode:
+            first = self.client.get("/openapi.json")
+            second = self.client.get("/openapi.json")
+            self.assertEqual(encode.call_count, 1)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first.headers["ETag"], second.headers["ETag"])
+        self.assertIn("max-age=86400", first.headers["Cache-Control"])
+        self.assertIn("public", first.headers["Cache-Control"])
+
+    def test_precompressed_variants(self):
+        self.app.config["COMPRESS"] = True
+        plain = self.client.get("/openapi.json")
+        res = self.client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(res.data), plain.data)
+        self.assertNotEqual(res.headers["ETag"], plain.headers["ETag"])
+        self.assertIn("Accept-Encoding", res.vary)
+
+    def test_uncompressed_without_compress(self):
+        with mock.patch("flask_nova.docs.available_encodings") as encodings:
+            res = self.client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        encodings.assert_not_called()
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertNotIn("Accept-Encoding", res.vary)
+
+    def test_not_modified(self):
+        etag = self.client.get("/openapi.json").headers["ETag"]
+        res = self.client.get("/openapi.json", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.data, b"")
+
+    def test_reencoded_when_the_document_changes(self):
+        self.app.openapi  # built before the route below is registered
+
+        @self.app.get("/health")
+        def health():
+            return {}
+
+        etag = self.client.get("/openapi.json").headers["ETag"]
+        self.app.openapi = {**self.app.openapi, "info": {"title": "v2"}}
+        res = self.client.get("/openapi.json", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()["info"], {"title": "v2"})
+        self.assertIn("/health", res.get_json()["paths"])
+
+
+class SchemaRegistryTestCase(unittest.TestCase):
+    def test_models_are_shared_components(self):
+        class Address(BaseModel):
+            city: str
+
+        class User(BaseModel):
+            name: str
+            address: Address
+
+        app = FlaskNova(__name__)
+
+        @app.get("/users/me")
+        def read_user() -> User: ...
+
+        @app.post("/users")
+        def create_user(user: User) -> User: ...
+
+        @app.get("/users")
+        def list_users() -> list[User]: ...
+
+        with mock.patch("flask_nova.helpers._split_defs", wraps=_split_defs) as gen:
+            document = app.openapi
+        # `User` is documented through `list[User]`, generated once for all four
+        self.assertEqual(gen.call_count, 1)
+
+        schemas = document["components"]["schemas"]
+        self.assertEqual(sorted(schemas), ["Address", "User"])
+        self.assertNotIn("$defs", schemas["User"])
+        self.assertEqual(
+            schemas["User"]["properties"]["address"],
+            {"$ref": "#/components/schemas/Address"},
+        )
+        users = document["paths"]["/users"]
+        self.assertEqual(
+            users["get"]["responses"]["200"]["content"]["application/json"]["schema"],
+            {"type": "array", "items": {"$ref": "#/components/schemas/User"}},
+        )
+
+    def test_self_referencing_model(self):
+        app = FlaskNova(__name__)
+
+        @app.get("/tree")
+        def tree() -> Node: ...
+
+        node = app.openapi["components"]["schemas"]["Node"]
+        self.assertEqual(node["type"], "object")
+        self.assertEqual(
+            node["properties"]["children"]["items"],
+            {"$ref": "#/components/schemas/Node"},
+        )
+
+    def test_generic_model_components(self):
+        class User(BaseModel):
+            name: str
+
+        class Page(BaseModel, t.Generic[T]):
+            items: list[T]
+
+        app = FlaskNova(__name__)
+
+        @app.get("/users")
+        def users() -> Page[User]: ...
+
+        @app.get("/pages")
+        def pages() -> list[Page[User]]: ...
+
+        document = app.openapi
+        ref = {"$ref": "#/components/schemas/Page_User_"}
+        self.assertEqual(
+            sorted(document["components"]["schemas"]), ["Page_User_", "User"]
+        )
+        content = document["paths"]["/users"]["get"]["responses"]["200"]["content"]
+        self.assertEqual(content["application/json"]["schema"], ref)
+        content = document["paths"]["/pages"]["get"]["responses"]["200"]["content"]
+        self.assertEqual(content["application/json"]["schema"]["items"], ref)
+
+    def test_models_with_the_same_name_warn(self):
+        def make_model():
+            class Address(BaseModel):
+                street: str
+
+            return Address
+
+        class Address(BaseModel):
+            city: str
+
+        app = FlaskNova(__name__)
+        app.get("/a", response_model=Address, endpoint="a")(lambda: None)
+        app.get("/b", response_model=make_model(), endpoint="b")(lambda: None)
+
+        with self.assertWarnsRegex(RuntimeWarning, "'Address'"):
+            schemas = app.openapi["components"]["schemas"]
+        self.assertIn("city", schemas["Address"]["properties"])
+
+    def test_document_does_not_share_cached_schemas(self):
+        app = FlaskNova(__name__)
+
+        @app.get("/items/<int:item_id>")
+        def read_item(item_id: int) -> Item: ...
+
+        document = app.openapi
+        document["components"]["schemas"]["Item"]["properties"].clear()
+        document["paths"]["/items/{item_id}"]["get"]["parameters"][0]["schema"][
+            "type"
+        ] = "string"
+
+        other = FlaskNova(__name__)
+        other.get("/items/<int:item_id>")(read_item)
+        self.assertIn(
+            "name", other.openapi["components"]["schemas"]["Item"]["properties"]
+        )
+        self.assertEqual(
+            other.openapi["paths"]["/items/{item_id}"]["get"]["parameters"][0][
+                "schema"
+            ]["type"],
+            "integer",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from enum import Enum
+from typing import Annotated, Literal
+
+from pydantic import Field
+
+from flask_nova import FlaskNova, Header
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class RouteParamsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.get("/items/<item_id>")
+        def items(
+            item_id: int,
+            limit: Annotated[int, Field(ge=1, le=100)] = 10,
+            tags: list[str] = [],
+            order: Literal["asc", "desc"] = "asc",
+            color: Color | None = None,
+            x_token: str = Header(),
+            agent: Annotated[str | None, Header(alias="User-Agent")] = None,
+        ):
+            return {
+                "item_id": item_id,
+                "limit": limit,
+                "tags": tags,
+                "order": order,
+                "color": color and color.value,
+                "x_token": x_token,
+                "agent": agent,
+            }
+
+        self.client = self.app.test_client()
+
+    def test_values_are_typed(self):
+        response = self.client.get(
+            "/items/3?limit=5&tags=a&tags=b&color=red",
+            headers={"X-Token": "secret", "User-Agent": "nova"},
+        )
+        self.assertEqual(
+            response.get_json(),
+            {
+                "item_id": 3,
+                "limit": 5,
+                "tags": ["a", "b"],
+                "order": "asc",
+                "color": "red",
+                "x_token": "secret",
+                "agent": "nova",
+            },
+        )
+
+    def test_every_error_is_reported_with_its_source(self):
+        response = self.client.get("/items/x?limit=0&order=up")
+        self.assertEqual(response.status_code, 422)
+        problem = response.get_json()
+        self.assertEqual(problem["title"], "Form Validation Error")
+        self.assertTrue(problem["detail"].startswith("Binding failed: path.item_id: "))
+        locations = [error["loc"] for error in problem["errors"]]
+        self.assertEqual(
+            locations,
+            [
+                ["path", "item_id"],
+                ["query", "limit"],
+                ["query", "order"],
+                ["header", "x-token"],
+            ],
+        )
+
+    def test_openapi_parameters(self):
+        paths = self.client.get("/openapi.json").get_json()["paths"]
+        parameters = {
+            p["name"]: p for p in paths["/items/{item_id}"]["get"]["parameters"]
+        }
+        self.assertEqual(parameters["limit"]["schema"]["maximum"], 100)
+        self.assertFalse(parameters["limit"]["required"])
+        self.assertEqual(parameters["tags"]["schema"]["type"], "array")
+        self.assertEqual(parameters["x-token"]["in"], "header")
+        self.assertTrue(parameters["x-token"]["required"])
+        self.assertTrue(parameters["item_id"]["required"])
+
+    def test_unannotated_parameters(self):
+        @self.app.get("/users/<int:user_id>")
+        def user(user_id, q):
+            return {"user_id": user_id, "q": q}
+
+        self.assertEqual(
+            self.client.get("/users/3").get_json(), {"user_id": 3, "q": None}
+        )
+        self.assertEqual(
+            self.client.get("/users/3?q=a").get_json(), {"user_id": 3, "q": "a"}
+        )
+        operation = self.app.openapi["paths"]["/users/{user_id}"]["get"]
+        parameters = {p["name"]: p for p in operation["parameters"]}
+        self.assertEqual(parameters["user_id"]["in"], "path")
+        self.assertFalse(parameters["q"]["required"])
+
+
+if __name__ == "__main__":
+    unittest.main()
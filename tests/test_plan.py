@@ -0,0 +1,127 @@
+import unittest
+from dataclasses import dataclass
+
+from pydantic import BaseModel, TypeAdapter
+
+from flask_nova import FlaskNova
+from flask_nova.plan import RoutePlan
+
+
+class Item(BaseModel):
+    name: str
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Tag:
+    label: str
+    weight: int
+    public: bool = True
+
+    def to_dict(self):
+        return {"label": self.label, "weight": self.weight, "public": self.public}
+
+
+class SlottedTag:
+    __slots__ = ("label", "weight")
+    label: str
+    weight: int
+
+    def to_dict(self):
+        return {"label": self.label, "weight": self.weight}
+
+
+class RoutePlanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.get("/items/<int:item_id>")
+        def read_item(item_id: int):
+            return {"item_id": item_id}
+
+        @self.app.post("/items/<int:item_id>")
+        def update_item(item_id: int, item: Item):
+            return {"item_id": item_id, "name": item.name}
+
+        @self.app.post("/points")
+        def create_point(point: Point):
+            return {"x": point.x, "y": point.y}
+
+        @self.app.post("/tags")
+        def create_tag(tag: Tag):
+            return {**tag.to_dict(), "type": type(tag).__name__}
+
+        @self.app.post("/slotted-tags")
+        def create_slotted_tag(tag: SlottedTag):
+            return tag.to_dict()
+
+        self.client = self.app.test_client()
+
+    def test_plans_keyed_by_rule_and_method(self):
+        plans = self.app._route_plans
+        get_plan = plans[("/items/<int:item_id>", "GET")]
+        post_plan = plans[("/items/<int:item_id>", "POST")]
+
+        self.assertIsInstance(get_plan, RoutePlan)
+        self.assertIs(plans[("/items/<int:item_id>", "HEAD")], get_plan)
+        self.assertEqual(get_plan.params.paths, ("item_id",))
+        self.assertEqual([name for name, _ in post_plan.binders], ["item"])
+
+    def test_same_rule_dispatches_per_method(self):
+        response = self.client.get("/items/3")
+        self.assertEqual(response.get_json(), {"item_id": 3})
+
+        response = self.client.post("/items/3", json={"name": "nova"})
+        self.assertEqual(response.get_json(), {"item_id": 3, "name": "nova"})
+
+    def test_body_validators_built_on_first_use(self):
+        request_fields = self.app._compiled_validators["/points"]["request"]
+        self.assertNotIn("validator", request_fields["point"])
+
+        self.client.post("/points", json={"x": 1, "y": 2})
+        self.assertIsInstance(request_fields["point"]["validator"], TypeAdapter)
+
+    def test_warmup_compiles_every_route(self):
+        self.app.warmup()
+        request_fields = self.app._compiled_validators["/points"]["request"]
+        self.assertIsInstance(request_fields["point"]["validator"], TypeAdapter)
+        plan = self.app._route_plans[("/points", "POST")]
+        self.assertTrue(plan._compiled)
+
+    def test_dataclass_body_is_validated(self):
+        response = self.client.post("/points", json={"x": "1", "y": 2})
+        self.assertEqual(response.get_json(), {"x": 1, "y": 2})
+
+        response = self.client.post("/points", json={"x": "one", "y": 2})
+        self.assertEqual(response.status_code, 422)
+
+    def test_malformed_body_is_a_bad_request(self):
+        response = self.client.post(
+            "/items/3", data="{bad", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.get_json()["detail"].startswith("Invalid JSON body"))
+        response = self.client.post("/items/3", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_custom_class_fields_are_coerced(self):
+        response = self.client.post("/tags", json={"label": "a", "weight": "2"})
+        self.assertEqual(
+            response.get_json(),
+            {"label": "a", "weight": 2, "public": True, "type": "Tag"},
+        )
+        response = self.client.post("/slotted-tags", json={"label": "b", "weight": 3})
+        self.assertEqual(response.get_json(), {"label": "b", "weight": 3})
+
+    def test_custom_class_missing_field_is_unprocessable(self):
+        response = self.client.post("/tags", json={"label": "a"})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.get_json()["errors"][0]["loc"], ["weight"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import os
+import pstats
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+from pydantic import BaseModel
+
+from flask_nova import FlaskNova
+from flask_nova.cli import cli
+from flask_nova.profiling import Profiler, profile_token, verify_token
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+class Item(BaseModel):
+    name: str
+
+
+def build_name(item: Item, item_id: int) -> str:
+    return f"{item.name}-{item_id}"
+
+
+class TokenTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        self.assertTrue(verify_token("secret", profile_token("secret", "/a"), "/a"))
+        self.assertTrue(verify_token(b"secret", profile_token("secret", "/a"), "/a"))
+
+    def test_rejected(self):
+        token = profile_token("secret", "/a")
+        expired = profile_token("secret", "/a", ttl=-10)
+        expires, signature = token.split(".")
+        for invalid in (
+            "",
+            "garbage",
+            expired,
+            profile_token("other", "/a"),
+            profile_token("secret", "/b"),
+            f"{int(expires) + 1000}.{signature}",
+            f"-1.{signature}",
+        ):
+            self.assertFalse(verify_token("secret", invalid, "/a"), invalid)
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.app = app = FlaskNova(__name__)
+        app.config["PROFILE_DIR"] = self.tmp.name
+
+        @app.post("/items/<int:item_id>")
+        def create_item(item_id: int, item: Item) -> Item:
+            return Item(name=build_name(item, item_id))
+
+        @app.get("/ping")
+        def ping() -> dict:
+            return {}
+
+        self.client = app.test_client()
+
+    def profiles(self):
+        return sorted(os.listdir(self.tmp.name))
+
+    def post(self, **headers):
+        response = self.client.post("/items/3", json={"name": "a"}, headers=headers)
+        self.assertEqual(response.get_json(), {"name": "a-3"})
+
+    def test_off_by_default(self):
+        self.app.config["PROFILE_DIR"] = None
+        with mock.patch.object(Profiler, "record") as record:
+            self.post()
+        record.assert_not_called()
+
+    def test_signed_header(self):
+        self.app.config["PROFILE_SECRET"] = "secret"
+        self.post()
+        self.post(**{"X-Nova-Profile": profile_token("other", "/items/3")})
+        self.post(**{"X-Nova-Profile": profile_token("secret", "/items/4")})
+        self.assertEqual(self.profiles(), [])
+
+        self.post(
+            **{
+                "X-Nova-Profile": profile_token("secret", "/items/3"),
+                "traceparent": TRACEPARENT,
+            }
+        )
+        [name] = self.profiles()
+        self.assertTrue(name.endswith(f"-POST-items_int_item_id-{TRACE_ID}.prof"), name)
+
+        stats = pstats.Stats(os.path.join(self.tmp.name, name))
+        profiled = {function for _, _, function in stats.stats}
+        self.assertIn("build_name", profiled)
+        # the hooks and the response are profiled too, not only the handler
+        self.assertIn("make_response", profiled)
+        self.assertIn("process_response", profiled)
+
+    def test_sampling_rule(self):
+        self.app.config["PROFILE_SAMPLE"] = {"/items/<int:item_id>": 1.0}
+        self.post()
+        self.client.get("/ping")
+        self.assertEqual(len(self.profiles()), 1)
+
+        self.app.config["PROFILE_SAMPLE"] = {"*": 1.0, "/items/<int:item_id>": 0}
+        self.post()
+        self.client.get("/ping")
+        self.assertEqual(len(self.profiles()), 2)
+        self.assertTrue(any("-GET-ping-" in name for name in self.profiles()))
+
+    def test_failed_requests_are_profiled(self):
+        self.app.config["PROFILE_SAMPLE"] = {"*": 1.0}
+        response = self.client.post("/items/3", json={"name": 1})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(len(self.profiles()), 1)
+
+    def test_one_request_at_a_time(self):
+        self.app.config["PROFILE_SAMPLE"] = {"*": 1.0}
+        self.app.profiler._lock.acquire()
+        try:
+            self.post()
+        finally:
+            self.app.profiler._lock.release()
+        self.assertEqual(self.profiles(), [])
+
+    @unittest.skipIf(sys.version_info < (3, 12), "sys.monitoring is 3.12+")
+    def test_busy_profiler_tool(self):
+        self.app.config["PROFILE_SAMPLE"] = {"*": 1.0}
+        monitoring = sys.monitoring
+        monitoring.use_tool_id(monitoring.PROFILER_ID, "other")
+        try:
+            self.post()
+        finally:
+            monitoring.free_tool_id(monitoring.PROFILER_ID)
+        self.assertEqual(self.profiles(), [])
+
+    def test_unwritable_directory_is_logged(self):
+        path = os.path.join(self.tmp.name, "file")
+        open(path, "w").close()
+        self.app.config.update(PROFILE_DIR=path, PROFILE_SAMPLE={"*": 1.0})
+        with self.assertLogs("flask_nova.profiling", "WARNING"):
+            self.post()
+
+
+class ProfileTokenCommandTestCase(unittest.TestCase):
+    def test_prints_a_signed_token(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "profapp.py"), "w") as file:
+                file.write(
+                    textwrap.dedent(
+                        """
+                        from flask_nova import FlaskNova
+
+                        app = FlaskNova(__name__)
+                        app.config["PROFILE_SECRET"] = "secret"
+                        """
+                    )
+                )
+            sys.path.insert(0, tmp)
+            try:
+                result = CliRunner().invoke(
+                    cli,
+                    [
+                        "profile-token",
+                        "--app",
+                        "profapp:app",
+                        "--path",
+                        "/items/3",
+                        "--ttl",
+                        "60",
+                    ],
+                )
+            finally:
+                sys.path.remove(tmp)
+                sys.modules.pop("profapp", None)
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        token = result.output.strip()
+        self.assertTrue(verify_token("secret", token, "/items/3"))
+        self.assertLessEqual(int(token.split(".")[0]), time.time() + 61)
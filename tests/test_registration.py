@@ -0,0 +1,137 @@
+import unittest
+from unittest import mock
+
+from pydantic import BaseModel
+
+from flask_nova import FlaskNova, NovaBlueprint, core
+
+
+class Item(BaseModel):
+    name: str
+
+
+def make_blueprint():
+    bp = NovaBlueprint("items", __name__)
+
+    @bp.post("/items/<int:item_id>")
+    def create_item(item_id: int, item: Item, q: str = "") -> Item:
+        return Item(name=f"{item.name}-{item_id}{q}")
+
+    return bp
+
+
+class RegisterRoutesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+    def test_routes_registered_when_block_exits(self):
+        with self.app.register_routes():
+
+            @self.app.get("/ping")
+            def ping() -> dict:
+                return {"ok": True}
+
+            self.assertNotIn(("/ping", "GET"), self.app._route_plans)
+
+        self.assertIn(("/ping", "GET"), self.app._route_plans)
+        response = self.app.test_client().get("/ping")
+        self.assertEqual(response.get_json(), {"ok": True})
+
+    def test_failing_view_registers_nothing(self):
+        with self.assertRaises(NameError):
+            with self.app.register_routes():
+
+                @self.app.get("/ok")
+                def ok() -> dict:
+                    return {}
+
+                @self.app.get("/broken")
+                def broken() -> "Missing":  # noqa: F821
+                    return {}
+
+        rules = {rule.rule for rule in self.app.url_map.iter_rules()}
+        self.assertNotIn("/ok", rules)
+        self.assertNotIn("/broken", rules)
+
+    def test_failing_blueprint_is_not_recorded(self):
+        bp = NovaBlueprint("broken", __name__)
+        bp.before_request(lambda: None)
+
+        @bp.get("/broken")
+        def broken() -> "Missing":  # noqa: F821
+            return {}
+
+        with self.assertRaises(NameError):
+            self.app.register_blueprint(bp)
+
+        self.assertNotIn("broken", self.app.blueprints)
+        self.assertNotIn("broken", self.app.before_request_funcs)
+        rules = {rule.rule for rule in self.app.url_map.iter_rules()}
+        self.assertNotIn("/broken", rules)
+
+    def test_error_in_block_registers_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with self.app.register_routes():
+                self.app.get("/ping")(lambda: {})
+                raise RuntimeError
+
+        self.assertNotIn(("/ping", "GET"), self.app._route_plans)
+
+    def test_nested_blocks_register_once(self):
+        with self.app.register_routes():
+            with self.app.register_routes():
+                self.app.get("/ping")(lambda: {})
+            self.assertNotIn(("/ping", "GET"), self.app._route_plans)
+        self.assertIn(("/ping", "GET"), self.app._route_plans)
+
+    def test_parallel_build(self):
+        with self.app.register_routes(parallel=True):
+            for i in range(8):
+                self.app.register_blueprint(
+                    make_blueprint(), url_prefix=f"/v{i}", name=f"items{i}"
+                )
+
+        client = self.app.test_client()
+        for i in range(8):
+            response = client.post(f"/v{i}/items/3?q=!", json={"name": "a"})
+            self.assertEqual(response.get_json(), {"name": "a-3!"})
+        self.assertEqual(len(self.app.openapi["paths"]), 8)
+
+
+class IntrospectionCacheTestCase(unittest.TestCase):
+    def test_blueprint_mounted_twice_is_introspected_once(self):
+        app = FlaskNova(__name__)
+        bp = make_blueprint()
+        with mock.patch.object(
+            core.ip, "signature", wraps=core.ip.signature
+        ) as signature:
+            app.register_blueprint(bp, url_prefix="/v1")
+            app.register_blueprint(bp, url_prefix="/v2", name="items_v2")
+
+        self.assertEqual(signature.call_count, 1)
+        client = app.test_client()
+        for prefix in ("/v1", "/v2"):
+            response = client.post(f"{prefix}/items/1", json={"name": "a"})
+            self.assertEqual(response.get_json(), {"name": "a-1"})
+
+    def test_routes_keep_their_own_metadata(self):
+        app = FlaskNova(__name__)
+        bp = make_blueprint()
+        app.register_blueprint(bp, url_prefix="/v1")
+        app.register_blueprint(bp, url_prefix="/v2", name="items_v2")
+
+        v1 = app._compiled_validators["/v1/items/<int:item_id>"]
+        v2 = app._compiled_validators["/v2/items/<int:item_id>"]
+        self.assertIsNot(v1, v2)
+        self.assertIs(v1["request"], v2["request"])
+
+    def test_response_model_is_part_of_the_key(self):
+        app = FlaskNova(__name__)
+
+        def view() -> dict:
+            return {"name": "a"}
+
+        app.get("/plain")(view)
+        app.get("/model", response_model=Item)(view)
+        self.assertIsNone(app._compiled_validators["/plain"]["response"])
+        self.assertIs(app._compiled_validators["/model"]["response"]["object"], Item)
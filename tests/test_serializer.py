@@ -0,0 +1,151 @@
+import json
+import unittest
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+from flask_nova import FlaskNova, status
+
+
+class UserDB(BaseModel):
+    name: str
+    password: str
+
+
+class UserOut(BaseModel):
+    name: str
+
+
+@dataclass
+class PointOut:
+    x: int
+
+
+class Profile:
+    name: str
+    age: int
+
+    def __init__(self, name: str, age: int, secret: str = "") -> None:
+        self.name = name
+        self.age = age
+        self.secret = secret
+
+    def to_dict(self):
+        return {"name": self.name, "age": self.age}
+
+
+class SerializerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.get("/user", response_model=UserOut)
+        def user():
+            return UserDB(name="nova", password="secret")
+
+        @self.app.get("/user-created")
+        def user_created() -> tuple[UserOut, int]:
+            return UserOut(name="nova"), status.CREATED
+
+        @self.app.get("/user-dict", response_model=UserOut)
+        def user_dict():
+            return {"name": "nova", "password": "secret"}
+
+        @self.app.get("/point", response_model=PointOut)
+        def point():
+            return {"x": "3", "y": 4}
+
+        @self.app.get("/profile")
+        def profile() -> Profile:
+            return Profile("nova", 3, secret="hidden")
+
+        @self.app.get("/broken", response_model=Profile)
+        def broken():
+            return {"name": "nova"}
+
+        @self.app.get("/export")
+        def export() -> Iterator[UserOut]:
+            for i in range(3):
+                yield UserDB(name=f"user-{i}", password="secret")
+
+        @self.app.get("/users", response_model=list[UserOut])
+        def users():
+            return [UserDB(name="a", password="x"), {"name": "b", "password": "y"}]
+
+        @self.app.get("/users-by-name")
+        def users_by_name() -> dict[str, UserOut]:
+            return {"a": UserDB(name="a", password="x")}
+
+        @self.app.get("/maybe-user")
+        def maybe_user() -> UserOut | None:
+            return None
+
+        self.client = self.app.test_client()
+
+    def test_instance_is_reshaped(self):
+        response = self.client.get("/user")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"name": "nova"})
+
+    def test_status_tuple(self):
+        response = self.client.get("/user-created")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json(), {"name": "nova"})
+
+    def test_dict_is_reshaped(self):
+        self.assertEqual(self.client.get("/user-dict").get_json(), {"name": "nova"})
+        self.assertEqual(self.client.get("/point").get_json(), {"x": 3})
+
+    def test_custom_class_fields(self):
+        response = self.client.get("/profile")
+        self.assertEqual(response.get_json(), {"name": "nova", "age": 3})
+
+    def test_custom_class_missing_field(self):
+        self.app.testing = True
+        with self.assertRaisesRegex(ValueError, "Profile expect age field"):
+            self.client.get("/broken")
+
+    def test_stream_json_array(self):
+        response = self.client.get("/export")
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(
+            response.get_json(),
+            [{"name": "user-0"}, {"name": "user-1"}, {"name": "user-2"}],
+        )
+
+    def test_stream_ndjson(self):
+        response = self.client.get(
+            "/export", headers={"Accept": "application/x-ndjson"}
+        )
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines][2], {"name": "user-2"})
+        self.assertIn("Accept", response.vary)
+
+    def test_list_response_model(self):
+        response = self.client.get("/users")
+        self.assertEqual(response.get_json(), [{"name": "a"}, {"name": "b"}])
+
+    def test_dict_and_optional_return_types(self):
+        response = self.client.get("/users-by-name")
+        self.assertEqual(response.get_json(), {"a": {"name": "a"}})
+        self.assertIsNone(self.client.get("/maybe-user").get_json())
+
+    def test_collection_openapi_shapes(self):
+        paths = self.client.get("/openapi.json").get_json()["paths"]
+
+        def schema(path):
+            content = paths[path]["get"]["responses"]["200"]["content"]
+            return content["application/json"]["schema"]
+
+        self.assertEqual(schema("/users")["type"], "array")
+        self.assertEqual(
+            schema("/users")["items"], {"$ref": "#/components/schemas/UserOut"}
+        )
+        self.assertEqual(schema("/users-by-name")["type"], "object")
+        self.assertIn("additionalProperties", schema("/users-by-name"))
+
+
+if __name__ == "__main__":
+    unittest.main()
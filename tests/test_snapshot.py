@@ -0,0 +1,159 @@
+import importlib
+import pathlib
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+from flask_nova import core
+from flask_nova.cli import cli
+from flask_nova.snapshot import Snapshot
+
+APP_SOURCE = textwrap.dedent(
+    """
+    from flask_nova import FlaskNova, Depend
+    from pydantic import BaseModel
+
+    app = FlaskNova(__name__, snapshot="nova.snapshot")
+
+
+    class Item(BaseModel):
+        name: str
+        price: float
+
+
+    def get_tax() -> float:
+        return 0.5
+
+
+    @app.post("/items/<int:item_id>", tags=["items"])
+    def create_item(item_id: int, item: Item, tax=Depend(get_tax)) -> Item:
+        return Item(name=f"{item.name}-{item_id}", price=item.price + tax)
+
+
+    @app.get("/items")
+    def list_items(limit: int = 10) -> dict:
+        return {"limit": limit}
+
+
+    @app.post("/items")
+    def add_item(item: Item) -> Item:
+        return item
+
+
+    def make_local():
+        class Local(BaseModel):
+            x: int
+
+        def local(body: Local) -> Local:
+            return body
+
+        return local
+
+
+    app.post("/local")(make_local())
+    """
+)
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self.tmp.name)
+        self.source = self.root / "snapapp.py"
+        self.source.write_text(APP_SOURCE)
+        sys.path.insert(0, self.tmp.name)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(sys.path.remove, self.tmp.name)
+        self.addCleanup(sys.modules.pop, "snapapp", None)
+
+    def load(self):
+        sys.modules.pop("snapapp", None)
+        importlib.invalidate_caches()
+        return importlib.import_module("snapapp").app
+
+    def build(self):
+        result = CliRunner().invoke(cli, ["build", "--app", "snapapp:app"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        return result
+
+    def test_build_writes_snapshot(self):
+        result = self.build()
+        self.assertTrue((self.root / "nova.snapshot").exists())
+        self.assertIn("8/9 routes", result.output)
+
+    def test_fresh_snapshot_skips_introspection(self):
+        self.build()
+        expected = self.load().openapi
+        introspect = core.FlaskNova._request_signature
+        with mock.patch.object(
+            core.FlaskNova, "_request_signature", autospec=True, side_effect=introspect
+        ) as request_signature:
+            app = self.load()
+
+        self.assertIsNotNone(app._snapshot)
+        # only the local view, which could not be pickled, is introspected
+        self.assertEqual(request_signature.call_count, 1)
+        self.assertEqual(app.openapi, expected)
+
+        client = app.test_client()
+        response = client.post("/items/3", json={"name": "a", "price": 1})
+        self.assertEqual(response.get_json(), {"name": "a-3", "price": 1.5})
+        response = client.post("/local", json={"x": "2"})
+        self.assertEqual(response.get_json(), {"x": 2})
+
+        response = client.get("/openapi.json")
+        self.assertEqual(response.data, app._snapshot.openapi)
+
+    def test_methods_on_one_rule_keep_their_schemas(self):
+        self.build()
+        app = self.load()
+        self.assertIsNotNone(app._snapshot)
+
+        client = app.test_client()
+        response = client.get("/items?limit=3")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.get_json(), {"limit": 3})
+        response = client.post("/items", json={"name": "a", "price": 1})
+        self.assertEqual(response.get_json(), {"name": "a", "price": 1.0})
+        self.assertEqual(client.post("/items", json={}).status_code, 422)
+
+    def test_changed_source_falls_back(self):
+        self.build()
+        self.source.write_text(APP_SOURCE + "\n# changed\n")
+        app = self.load()
+
+        self.assertIsNone(app._snapshot)
+        response = app.test_client().post("/items/1", json={"name": "a", "price": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/items/{item_id}", app.openapi["paths"])
+
+    def test_routes_added_after_build_are_documented(self):
+        self.build()
+        self.source.write_text(APP_SOURCE)
+        app = self.load()
+        self.assertIsNotNone(app._snapshot)
+        app.get("/extra")(lambda: {})
+
+        self.assertIn("/extra", app.openapi["paths"])
+        self.assertIn("/items/{item_id}", app.openapi["paths"])
+        response = app.test_client().get("/openapi.json")
+        self.assertNotEqual(response.data, app._snapshot.openapi)
+
+    def test_unreadable_or_foreign_snapshot_is_ignored(self):
+        path = self.root / "nova.snapshot"
+        path.write_bytes(b"garbage")
+        with self.assertLogs("flask_nova.snapshot", "WARNING"):
+            self.assertIsNone(Snapshot.load(path))
+
+        self.build()
+        with mock.patch.object(Snapshot, "_environment", return_value=(0, (3, 0), "0")):
+            self.assertIsNone(Snapshot.load(path))
+
+    def test_missing_snapshot(self):
+        app = self.load()
+        self.assertIsNone(app._snapshot)
+        self.assertIn("/items/{item_id}", app.openapi["paths"])
@@ -0,0 +1,78 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+from flask_nova import FlaskNova
+from flask_nova._task import gil_enabled
+
+
+class Cat(BaseModel):
+    name: str
+
+
+class Dog(BaseModel):
+    name: str
+    good: bool
+
+
+class Note:
+    text: str
+
+    def to_dict(self):
+        return {"text": self.text}
+
+
+class ThreadSafetyTestCase(unittest.TestCase):
+    """concurrent requests must never see another request's route state"""
+
+    def setUp(self):
+        self.app = FlaskNova(__name__)
+
+        @self.app.get("/cat/<name>", response_model=Cat)
+        def cat(name: str):
+            return {"name": name, "good": False}
+
+        @self.app.get("/dog/<name>", response_model=Dog)
+        def dog(name: str):
+            return {"name": name, "good": True}
+
+        @self.app.post("/note")
+        def note(data: Note) -> Note:
+            return data
+
+        self.client = self.app.test_client()
+
+    def _call(self, i: int) -> tuple[int, dict]:
+        match i % 3:
+            case 0:
+                return i, self.client.get(f"/cat/c{i}").get_json()
+            case 1:
+                return i, self.client.get(f"/dog/d{i}").get_json()
+            case _:
+                return i, self.client.post("/note", json={"text": f"n{i}"}).get_json()
+
+    def test_concurrent_requests_keep_their_own_route(self):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(self._call, range(600)))
+
+        for i, body in results:
+            match i % 3:
+                case 0:
+                    self.assertEqual(body, {"name": f"c{i}"})
+                case 1:
+                    self.assertEqual(body, {"name": f"d{i}", "good": True})
+                case _:
+                    self.assertEqual(body, {"text": f"n{i}"})
+
+    def test_custom_class_is_not_mutated(self):
+        self.client.post("/note", json={"text": "hello"})
+        self.assertFalse(hasattr(Note, "text"))
+
+    @unittest.skipIf(gil_enabled, "needs a free-threaded build (python3.13t)")
+    def test_free_threaded_build(self):
+        self.test_concurrent_requests_keep_their_own_route()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+import json
+import os
+import tempfile
+import unittest
+
+from flask import g, request
+from pydantic import BaseModel
+
+from flask_nova import Depend, FlaskNova, HTTPException
+from flask_nova.tracing import (
+    FileSink,
+    SpanSink,
+    TraceContext,
+    parse_traceparent,
+    parse_tracestate,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+class Item(BaseModel):
+    name: str
+
+
+def get_user():
+    return "nova"
+
+
+class ListSink(SpanSink):
+    def __init__(self):
+        self.payloads = []
+
+    def export(self, payload):
+        self.payloads.append(payload)
+
+    @property
+    def spans(self):
+        return [
+            span
+            for payload in self.payloads
+            for resource in payload["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+
+class TraceContextTestCase(unittest.TestCase):
+    def test_parse_traceparent(self):
+        self.assertEqual(parse_traceparent(TRACEPARENT), (TRACE_ID, PARENT_ID, 1))
+        # later versions may append fields
+        self.assertEqual(
+            parse_traceparent(f"01-{TRACE_ID}-{PARENT_ID}-00-extra"),
+            (TRACE_ID, PARENT_ID, 0),
+        )
+        for invalid in (
+            None,
+            "",
+            "garbage",
+            TRACEPARENT.upper(),
+            f"ff-{TRACE_ID}-{PARENT_ID}-01",
+            f"00-{TRACE_ID}-{PARENT_ID}-01-extra",
+            f"00-{'0' * 32}-{PARENT_ID}-01",
+            f"00-{TRACE_ID}-{'0' * 16}-01",
+        ):
+            self.assertIsNone(parse_traceparent(invalid), invalid)
+
+    def test_parse_tracestate(self):
+        self.assertEqual(parse_tracestate(["a=1, b=2", "c=3"]), "a=1,b=2,c=3")
+        self.assertIsNone(parse_tracestate([]))
+        self.assertIsNone(parse_tracestate([",".join(f"k{i}=v" for i in range(33))]))
+
+    def test_ids_are_generated_on_first_read(self):
+        context = TraceContext()
+        self.assertIsNone(context._trace_id)
+        self.assertIsNone(context._span_id)
+        self.assertRegex(context.traceparent, r"^00-[0-9a-f]{32}-[0-9a-f]{16}-01$")
+        self.assertEqual(context.trace_id, context.trace_id)
+
+    def test_incoming_context(self):
+        context = TraceContext(TRACEPARENT, ["vendor=x"])
+        self.assertEqual(context.trace_id, TRACE_ID)
+        self.assertEqual(context.parent_id, PARENT_ID)
+        self.assertNotEqual(context.span_id, PARENT_ID)
+        self.assertEqual(
+            context.headers(),
+            {
+                "traceparent": f"00-{TRACE_ID}-{context.span_id}-01",
+                "tracestate": "vendor=x",
+            },
+        )
+
+    def test_tracestate_needs_a_valid_traceparent(self):
+        self.assertIsNone(TraceContext("garbage", ["vendor=x"]).tracestate)
+
+    def test_head_sampling(self):
+        self.assertFalse(TraceContext(sample_rate=0).sampled)
+        self.assertTrue(TraceContext(TRACEPARENT, sample_rate=0).sampled)
+        self.assertFalse(TraceContext(f"00-{TRACE_ID}-{PARENT_ID}-00").sampled)
+
+
+class TracingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = app = FlaskNova(__name__)
+        self.sink = ListSink()
+
+        @app.post("/items/<int:item_id>")
+        def create_item(item_id: int, item: Item, user=Depend(get_user)) -> Item:
+            return Item(name=f"{item.name}-{item_id}-{user}")
+
+        @app.get("/lazy")
+        def lazy() -> dict:
+            return {"parsed": "trace" in request.__dict__}
+
+        @app.get("/trace-id")
+        def trace_id() -> dict:
+            return {"trace_id": g.trace_id}
+
+        @app.get("/fail")
+        def fail() -> dict:
+            raise HTTPException(status_code=409, detail="conflict", title="Conflict")
+
+        self.client = app.test_client()
+
+    def export(self):
+        self.client.post(
+            "/items/3", json={"name": "a"}, headers={"traceparent": TRACEPARENT}
+        )
+        self.app.tracer.exporter.shutdown()
+        return self.sink.spans
+
+    def test_trace_is_not_parsed_unless_read(self):
+        self.assertEqual(self.client.get("/lazy").get_json(), {"parsed": False})
+
+    def test_g_trace_id(self):
+        response = self.client.get("/trace-id", headers={"traceparent": TRACEPARENT})
+        self.assertEqual(response.get_json(), {"trace_id": TRACE_ID})
+        response = self.client.get("/trace-id")
+        self.assertRegex(response.get_json()["trace_id"], r"^[0-9a-f]{32}$")
+
+    def test_error_response_carries_the_trace(self):
+        response = self.client.get(
+            "/fail", headers={"traceparent": TRACEPARENT, "tracestate": "vendor=x"}
+        )
+        self.assertEqual(response.get_json()["trace_id"], TRACE_ID)
+        version, trace_id, span_id, flags = response.headers["traceparent"].split("-")
+        self.assertEqual((version, trace_id, flags), ("00", TRACE_ID, "01"))
+        self.assertNotEqual(span_id, PARENT_ID)
+        self.assertEqual(response.headers["tracestate"], "vendor=x")
+
+    def test_no_spans_without_sink(self):
+        self.client.post("/items/3", json={"name": "a"})
+        self.assertIsNone(self.app.tracer.exporter)
+
+    def test_stage_spans(self):
+        self.app.config["TRACING_SINK"] = self.sink
+        spans = self.export()
+
+        by_name = {span["name"]: span for span in spans}
+        self.assertEqual(
+            set(by_name),
+            {
+                "POST /items/<int:item_id>",
+                "bind",
+                "dependencies",
+                "handler",
+                "serialize",
+            },
+        )
+        root = by_name["POST /items/<int:item_id>"]
+        self.assertEqual(root["parentSpanId"], PARENT_ID)
+        self.assertEqual(root["kind"], 2)
+        self.assertIn(
+            {"key": "http.response.status_code", "value": {"intValue": "200"}},
+            root["attributes"],
+        )
+        for span in spans:
+            self.assertEqual(span["traceId"], TRACE_ID)
+            if span is not root:
+                self.assertEqual(span["parentSpanId"], root["spanId"])
+                self.assertLessEqual(
+                    int(root["startTimeUnixNano"]), int(span["startTimeUnixNano"])
+                )
+
+    def test_failed_stage_is_an_error(self):
+        self.app.config["TRACING_SINK"] = self.sink
+        self.client.post("/items/3", json={"name": 1})
+        self.app.tracer.exporter.shutdown()
+        bind = next(span for span in self.sink.spans if span["name"] == "bind")
+        self.assertEqual(bind["status"]["code"], 2)
+
+    def test_unsampled_requests_are_not_recorded(self):
+        self.app.config["TRACING_SINK"] = self.sink
+        self.app.config["TRACING_SAMPLE_RATE"] = 0
+        self.client.post("/items/3", json={"name": "a"})
+        self.client.post(
+            "/items/3",
+            json={"name": "a"},
+            headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"},
+        )
+        self.app.tracer.exporter.shutdown()
+        self.assertEqual(self.sink.spans, [])
+
+        # a sampled parent is followed whatever the rate
+        self.assertEqual(len(self.export()), 5)
+
+    def test_batches(self):
+        self.app.config.update(TRACING_SINK=self.sink, TRACING_BATCH_SIZE=2)
+        self.export()
+        self.assertEqual(
+            [
+                len(p["resourceSpans"][0]["scopeSpans"][0]["spans"])
+                for p in self.sink.payloads
+            ],
+            [2, 2, 1],
+        )
+
+    def test_file_sink(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spans.jsonl")
+            self.app.config.update(
+                TRACING_SINK=FileSink(path), TRACING_SERVICE_NAME="api"
+            )
+            self.export()
+            with open(path) as file:
+                lines = [json.loads(line) for line in file]
+
+        self.assertEqual(len(lines), 1)
+        resource = lines[0]["resourceSpans"][0]
+        self.assertEqual(
+            resource["resource"]["attributes"],
+            [{"key": "service.name", "value": {"stringValue": "api"}}],
+        )
+        self.assertEqual(len(resource["scopeSpans"][0]["spans"]), 5)
+
+    def test_sinks_must_export(self):
+        class Silent(SpanSink):
+            pass
+
+        with self.assertRaises(TypeError):
+            Silent()
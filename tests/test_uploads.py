@@ -0,0 +1,101 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from flask import request
+
+from flask_nova import File, FileStorage, FlaskNova
+
+
+class UploadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dest = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dest.cleanup)
+        self.app = FlaskNova(__name__)
+
+        @self.app.post("/avatar")
+        def avatar(
+            upload: FileStorage = File(
+                "avatar",
+                max_size=1024,
+                spool_threshold=64,
+                allowed_types=["image/*"],
+                dest_dir=self.dest.name,
+                checksum="sha256",
+            ),
+        ):
+            stream = upload.stream
+            return {
+                "size": stream.size,
+                "checksum": stream.checksum,
+                "on_disk": bool(stream.path)
+                and os.path.dirname(stream.path) == self.dest.name,
+                "data": len(upload.read()),
+            }
+
+        @self.app.post("/docs")
+        def docs(files: list = File("docs", multiple=True, max_size=16)):
+            return {"names": [f.filename for f in files]}
+
+        self.client = self.app.test_client()
+
+    def post(self, path, field, *parts):
+        data = {field: [(BytesIO(body), name, ctype) for body, name, ctype in parts]}
+        return self.client.post(path, data=data, content_type="multipart/form-data")
+
+    def test_large_file_is_spooled_with_checksum(self):
+        body = b"x" * 900
+        response = self.post("/avatar", "avatar", (body, "a.png", "image/png"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.get_json(),
+            {
+                "size": 900,
+                "checksum": hashlib.sha256(body).hexdigest(),
+                "on_disk": True,
+                "data": 900,
+            },
+        )
+
+    def test_oversized_part_is_rejected(self):
+        response = self.post("/avatar", "avatar", (b"x" * 2048, "a.png", "image/png"))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.mimetype, "application/problem+json")
+
+    def test_type_is_checked(self):
+        response = self.post("/avatar", "avatar", (b"x", "a.txt", "text/plain"))
+        self.assertEqual(response.status_code, 415)
+
+    def test_limit_applies_per_file(self):
+        response = self.post(
+            "/docs", "docs", (b"a" * 10, "a.txt", "text/plain"), (b"b", "b.txt", None)
+        )
+        self.assertEqual(response.get_json(), {"names": ["a.txt", "b.txt"]})
+
+        response = self.post("/docs", "docs", (b"a" * 17, "a.txt", "text/plain"))
+        self.assertEqual(response.status_code, 413)
+
+    def test_limits_apply_to_form_read_in_a_hook(self):
+        seen = []
+
+        @self.app.before_request
+        def read_form():
+            seen.append(list(request.files))
+
+        response = self.post("/avatar", "avatar", (b"x" * 2048, "a.png", "image/png"))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(seen, [])
+
+        response = self.post("/avatar", "avatar", (b"x" * 100, "a.png", "image/png"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(seen, [["avatar"]])
+
+    def test_unknown_checksum_fails_at_registration(self):
+        with self.assertRaises(ValueError):
+            File("f", checksum="nope")
+
+
+if __name__ == "__main__":
+    unittest.main()